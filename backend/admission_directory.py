@@ -0,0 +1,152 @@
+"""
+활성 입원 식별자 디렉터리 (token ↔ admission_id ↔ room, 프로세스 내).
+
+대시보드 토큰 라우트·WS 인증·사진 업로드(token → id)와 쓰기 후 브로드캐스트(id → token, room)가
+매 요청 DB 를 조회하던 것을 사전 조회로 바꿉니다.
+- 기동 시 load() 로 활성 입원 전체를 적재하고, 입원/전동/퇴원 경로가 put/move/remove 로 갱신합니다.
+- 다른 인스턴스·직접 DB 수정에 대비해 ADMISSION_DIRECTORY_TTL 이 지나면 다음 조회 때 전체를 다시 적재합니다.
+  적재 조회 도중 도착한 put/move/remove 는 기록했다가 적재 결과 위에 다시 적용합니다 (이전 스냅샷이 퇴원·전동을 덮지 않도록).
+- 디렉터리에 없는 항목은 query_registry 조회로 폴백합니다 (퇴원 환자 브로드캐스트 등).
+"""
+import asyncio
+import os
+import time
+
+from logger import logger
+from query_registry import ACTIVE_STATUSES, run_query
+from utils import execute_with_retry_async
+
+
+class AdmissionDirectory:
+    def __init__(self, ttl: float = 30.0):
+        self.ttl = ttl
+        self._by_id: dict[str, dict] = {}
+        self._by_token: dict[str, str] = {}
+        self._loaded_at: float | None = None
+        self._refresh: asyncio.Task | None = None
+        self._replay: list[tuple] | None = None  # 적재 중 도착한 쓰기 경로 변경
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    async def load(self, db) -> None:
+        """활성 입원 전체를 다시 적재 (동시 호출은 하나의 조회로 합침)."""
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.ensure_future(self._load(db))
+        await asyncio.shield(self._refresh)
+
+    async def _load(self, db) -> None:
+        self._replay = []
+        try:
+            res = await execute_with_retry_async(
+                db.table("admissions").select("id,access_token,room_number").in_("status", ACTIVE_STATUSES)
+            )
+            self._by_id = {}
+            self._by_token = {}
+            for row in res.data or []:
+                self._set(row["id"], row["access_token"], row["room_number"])
+            self._loaded_at = time.monotonic()
+            self.refreshes += 1
+            replay, self._replay = self._replay, None
+            for name, args in replay:  # 조회 도중 반영된 변경은 적재 결과보다 새로움
+                getattr(self, name)(*args)
+        finally:
+            self._replay = None
+
+    async def _ensure_fresh(self, db) -> None:
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        try:
+            await self.load(db)
+        except Exception as e:
+            # 갱신 실패 시 기존 항목으로 계속 응답 (없는 항목은 폴백 조회가 오류를 그대로 전달)
+            logger.warning(f"Admission directory refresh failed: {e}")
+
+    async def by_token(self, db, token: str) -> dict | None:
+        """활성 입원 {id, access_token, room_number} (없으면 None)."""
+        await self._ensure_fresh(db)
+        admission_id = self._by_token.get(token)
+        if admission_id is not None:
+            self.hits += 1
+            return dict(self._by_id[admission_id])
+        self.misses += 1
+        rows = await run_query(db, "active_admission_by_token", token=token)
+        if not rows:
+            return None
+        self.put(rows[0]["id"], token, rows[0]["room_number"])
+        return {"id": rows[0]["id"], "access_token": token, "room_number": rows[0]["room_number"]}
+
+    async def by_id(self, db, admission_id: str) -> dict | None:
+        """입원 {id, access_token, room_number}. 비활성 입원도 폴백 조회로 반환 (디렉터리에는 넣지 않음)."""
+        await self._ensure_fresh(db)
+        entry = self._by_id.get(str(admission_id))
+        if entry is not None:
+            self.hits += 1
+            return dict(entry)
+        self.misses += 1
+        rows = await run_query(db, "admission_broadcast_target", admission_id=admission_id)
+        if not rows:
+            return None
+        return {"id": str(admission_id), **rows[0]}
+
+    def peek(self, admission_id: str) -> dict | None:
+        """디렉터리에 적재된 항목만 반환 (DB 조회 없음, 동기 호출용)."""
+        entry = self._by_id.get(str(admission_id))
+        return dict(entry) if entry is not None else None
+
+    # --- 쓰기 경로에서 호출 ---
+
+    def _record(self, name: str, *args) -> None:
+        if self._replay is not None:
+            self._replay.append((name, args))
+
+    def put(self, admission_id: str, access_token: str, room_number: str) -> None:
+        self._record("put", admission_id, access_token, room_number)
+        self._set(admission_id, access_token, room_number)
+
+    def move(self, admission_id: str, room_number: str) -> None:
+        self._record("move", admission_id, room_number)
+        entry = self._by_id.get(str(admission_id))
+        if entry is not None:
+            entry["room_number"] = room_number
+
+    def remove(self, admission_id: str) -> None:
+        self._record("remove", admission_id)
+        self._pop(admission_id)
+
+    def clear(self) -> None:
+        """전원 퇴원 후: 빈 디렉터리를 최신 상태로 간주."""
+        self._record("clear")
+        self._by_id.clear()
+        self._by_token.clear()
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """다음 조회 때 전체를 다시 적재."""
+        self._record("invalidate")
+        self._by_id.clear()
+        self._by_token.clear()
+        self._loaded_at = None
+
+    def _pop(self, admission_id) -> None:
+        entry = self._by_id.pop(str(admission_id), None)
+        if entry is not None:
+            self._by_token.pop(entry["access_token"], None)
+
+    def _set(self, admission_id, access_token, room_number) -> None:
+        key = str(admission_id)
+        self._pop(key)
+        self._by_id[key] = {"id": key, "access_token": str(access_token), "room_number": room_number}
+        self._by_token[str(access_token)] = key
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._by_id),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at is not None else None,
+        }
+
+
+admission_directory = AdmissionDirectory(ttl=float(os.getenv("ADMISSION_DIRECTORY_TTL", "30")))
@@ -0,0 +1,261 @@
+"""
+Write-behind 감사 로그 큐.
+
+create_audit_log 는 요청 경로에서 log_audit_activity RPC 를 호출마다 1회씩 기다렸습니다.
+큐가 실행 중이면 항목을 메모리에 적재만 하고, 백그라운드 태스크가 주기(flush_interval)
+또는 건수(batch_size) 단위로 log_audit_activity_batch RPC 1회로 일괄 기록합니다.
+
+- 메모리 상한(max_size) 초과분과 DB 기록 실패분은 디스크(spill 파일, JSONL)로 내보내고
+  다음 성공 flush 이후 재전송합니다. 감사 로그는 보안 필수 항목이므로 버리지 않습니다.
+- lifespan 종료 시 stop() 이 남은 항목을 모두 flush 합니다.
+- 배치 RPC 는 service_role 키가 필요합니다. 마이그레이션(20261017_audit_log_batch.sql)이 없거나(PGRST202)
+  다른 키로 실행 중이면(42501) 건별 RPC 로 폴백합니다. 건별 기록 중 일부만 실패하면 실패한 항목만 spill 합니다.
+- 기록 시각(created_at)은 적재 시각입니다. spill 후 재전송해도 원래 시각이 유지됩니다.
+  건별 RPC 폴백은 시각을 받지 않으므로 DB 서버 시각으로 기록됩니다.
+- 재전송 중 종료/읽기 실패로 남은 .replay 파일은 덮어쓰지 않고 다음 재전송 때 spill 파일과 합쳐 보냅니다.
+"""
+import asyncio
+import json
+import os
+import shutil
+from collections import deque
+from datetime import datetime, timezone
+
+from logger import logger
+from utils import execute_instrumented_async
+
+# 배치 RPC 를 쓸 수 없어 건별 RPC 로 폴백하는 오류 코드 (함수 없음 / 실행 권한 없음)
+_BATCH_RPC_UNAVAILABLE = {"PGRST202", "42501"}
+
+
+class PartialWriteError(Exception):
+    """건별 기록 중 일부만 실패. failed 는 다시 보내야 하는 항목."""
+
+    def __init__(self, failed: list[dict], cause: Exception):
+        super().__init__(f"{len(failed)} audit entries failed: {cause}")
+        self.failed = failed
+
+
+class AuditQueue:
+    def __init__(
+        self,
+        max_size: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        spill_path: str = "logs/audit_spill.jsonl",
+    ):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self._buffer: deque[dict] = deque()
+        self._db = None
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        self._batch_rpc_missing = False
+        self._stopping = False
+        self._replaying = False
+        self.flushed = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.flush_failures = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def enqueue(self, actor_type: str, action: str, target_id: str, ip_address: str = "0.0.0.0") -> None:
+        self._buffer.append({
+            "actor_type": actor_type,
+            "action": action,
+            "target_id": str(target_id),
+            "ip_address": ip_address,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        })
+        if len(self._buffer) > self.max_size:
+            # 상한 초과: 오래된 항목부터 디스크로 내보내 메모리 사용량 고정
+            overflow = [self._buffer.popleft() for _ in range(len(self._buffer) - self.max_size)]
+            self._spill(overflow)
+        if len(self._buffer) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self, db) -> None:
+        if self.running:
+            return
+        self._db = db
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+        self._task.add_done_callback(lambda t: t.exception() if not t.cancelled() else None)
+
+    async def stop(self) -> None:
+        """백그라운드 태스크를 멈추고 남은 항목을 모두 flush (실패분은 spill)."""
+        if self._task is not None:
+            # 진행 중인 flush 가 끝난 뒤 루프가 종료되도록 (cancel 시 배치 유실 방지)
+            self._stopping = True
+            self._wakeup.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        while self._buffer:
+            if not await self.flush():
+                break
+        if self._buffer:
+            self._spill(list(self._buffer))
+            self._buffer.clear()
+
+    async def _run(self) -> None:
+        await self._replay_spill()
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping:
+                return
+            while self._buffer:
+                if not await self.flush():
+                    break
+                if len(self._buffer) < self.batch_size:
+                    break
+
+    async def flush(self) -> bool:
+        """최대 batch_size 건을 DB 로 기록. 실패 시 해당 배치를 spill 하고 False 반환."""
+        if not self._buffer or self._db is None:
+            return True
+        async with self._flush_lock:
+            batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            if not batch:
+                return True
+            try:
+                await self._write(batch)
+            except Exception as e:
+                failed = e.failed if isinstance(e, PartialWriteError) else batch
+                self.flush_failures += 1
+                self.flushed += len(batch) - len(failed)
+                logger.warning(f"Audit batch flush failed ({len(failed)} entries spilled to disk): {e}")
+                self._spill(failed)
+                return False
+            self.flushed += len(batch)
+        if self.spilled > self.replayed:
+            await self._replay_spill()
+        return True
+
+    async def _write(self, batch: list[dict]) -> None:
+        if not self._batch_rpc_missing:
+            try:
+                await execute_instrumented_async(self._db.rpc("log_audit_activity_batch", {"p_entries": batch}))
+                return
+            except Exception as e:
+                if getattr(e, "code", None) not in _BATCH_RPC_UNAVAILABLE:
+                    raise
+                self._batch_rpc_missing = True
+                if e.code == "42501":
+                    logger.error(
+                        "log_audit_activity_batch denied (42501): SUPABASE_KEY must be the service_role key. "
+                        "Falling back to one audit RPC per entry."
+                    )
+                else:
+                    logger.warning(f"log_audit_activity_batch RPC unavailable ({e.code}); falling back to per-entry audit RPC.")
+        results = await asyncio.gather(*(
+            execute_instrumented_async(self._db.rpc("log_audit_activity", {
+                "p_actor_type": e["actor_type"],
+                "p_action": e["action"],
+                "p_target_id": e["target_id"],
+                "p_ip_address": e["ip_address"],
+            }))
+            for e in batch
+        ), return_exceptions=True)
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            raise PartialWriteError([e for e, r in zip(batch, results) if isinstance(r, Exception)], errors[0])
+
+    def _spill(self, entries: list[dict]) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.spill_path) or ".", exist_ok=True)
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.spilled += len(entries)
+        except OSError as e:
+            logger.critical(f"Audit spill failed, {len(entries)} audit entries lost: {e}")
+
+    async def _replay_spill(self) -> None:
+        """spill 파일을 읽어 DB 로 재전송. 실패하면 남은 항목을 다시 spill 파일로 되돌립니다."""
+        if self._db is None or self._replaying:
+            return
+        if not os.path.exists(self.spill_path) and not os.path.exists(self._replay_path):
+            return
+        self._replaying = True
+        try:
+            await self._replay_spill_file()
+        finally:
+            self._replaying = False
+
+    @property
+    def _replay_path(self) -> str:
+        return self.spill_path + ".replay"
+
+    async def _replay_spill_file(self) -> None:
+        replay_path = self._replay_path
+        try:
+            if not os.path.exists(replay_path):
+                os.replace(self.spill_path, replay_path)
+            elif os.path.exists(self.spill_path):
+                # 이전 재전송이 중단되어 남은 .replay 파일: 덮어쓰지 않고 spill 내용을 이어 붙임
+                # (앞 줄이 잘려 있어도 섞이지 않도록 줄바꿈부터; 빈 줄은 읽을 때 무시)
+                with open(self.spill_path, encoding="utf-8") as src, open(replay_path, "a", encoding="utf-8") as dst:
+                    dst.write("\n")
+                    shutil.copyfileobj(src, dst)
+                os.remove(self.spill_path)
+            entries, rejected = [], []
+            with open(replay_path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        rejected.append(line if line.endswith("\n") else line + "\n")
+            if rejected:
+                # 기록 중 종료로 잘린 줄 등: 재전송을 막지 않도록 별도 파일로 보존
+                with open(self.spill_path + ".rejected", "a", encoding="utf-8") as f:
+                    f.writelines(rejected)
+                logger.critical(f"Audit spill replay skipped {len(rejected)} unreadable lines (kept in {self.spill_path}.rejected)")
+        except OSError as e:
+            logger.error(f"Audit spill replay read failed: {e}")
+            return
+        for i in range(0, len(entries), self.batch_size):
+            batch = entries[i:i + self.batch_size]
+            try:
+                await self._write(batch)
+            except Exception as e:
+                failed = e.failed if isinstance(e, PartialWriteError) else batch
+                self.replayed += len(batch) - len(failed)
+                logger.warning(f"Audit spill replay deferred ({len(failed) + len(entries) - i - len(batch)} entries): {e}")
+                self._spill(failed + entries[i + len(batch):])
+                break
+            self.replayed += len(batch)
+        os.remove(replay_path)
+        if self.replayed:
+            logger.info(f"Audit spill replayed: total {self.replayed} entries")
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": len(self._buffer),
+            "flushed": self.flushed,
+            "spilled": self.spilled,
+            "replayed": self.replayed,
+            "flush_failures": self.flush_failures,
+        }
+
+
+audit_queue = AuditQueue(
+    max_size=int(os.getenv("AUDIT_QUEUE_MAX_SIZE", "10000")),
+    batch_size=int(os.getenv("AUDIT_BATCH_SIZE", "100")),
+    flush_interval=float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0")),
+    spill_path=os.getenv("AUDIT_SPILL_PATH", "logs/audit_spill.jsonl"),
+)
@@ -0,0 +1,137 @@
+"""
+대시보드 변경 저널 (증분 동기화용 커서).
+
+대시보드 데이터를 바꾸는 쓰기 경로는 record_upsert / record_delete / record_reset 으로 변경을 남기고,
+보호자 앱은 GET /dashboard/{token}?since=<cursor> 로 그 이후 변경분만 받습니다.
+기록 시 dashboard_cache 의 해당 입원 스냅샷도 함께 무효화합니다.
+
+version() 은 입원/병동 단위 ETag 를 만들 때 사용합니다.
+subscribe() 로 등록한 리스너는 기록마다 호출됩니다 (dashboard_patches 의 WebSocket PATCH 전송).
+
+커서는 "<epoch>-<seq>" 형식입니다. epoch 는 프로세스(저널)마다 다르므로 재시작·다른 인스턴스의 커서,
+보관 범위를 벗어난 오래된 커서는 만료(None)로 판정되어 전체 데이터를 다시 내려보냅니다.
+"""
+import os
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Callable, NamedTuple
+
+from dashboard_cache import dashboard_cache
+from station_board import station_board
+
+UPSERT = "upsert"
+DELETE = "delete"
+RESET = "reset"  # 섹션 단위로 표현할 수 없는 변경(전동·퇴원·시드): 클라이언트 전체 재조회
+
+
+class Change(NamedTuple):
+    seq: int
+    section: str | None
+    op: str
+    row: Any  # UPSERT: 행(dict), DELETE: 행 id
+
+
+# (admission_id, change, prev): prev 는 기록 직전 그 입원의 version seq. 전체 만료는 (None, None, 0)
+Listener = Callable[[str | None, Change | None, int], None]
+
+
+class ChangeJournal:
+    def __init__(self, per_admission: int = 256, max_admissions: int = 1024):
+        self.per_admission = per_admission
+        self.max_admissions = max_admissions
+        self.epoch = uuid.uuid4().hex[:8]
+        self._seq = 0
+        self._by_admission: OrderedDict[str, deque[Change]] = OrderedDict()
+        self._trimmed_at: dict[str, int] = {}  # admission_id -> 보관 한도로 버린 마지막 seq
+        self._forgotten_at = 0                 # 입원 단위 기록을 통째로 버린 마지막 seq
+        self._listeners: list[Listener] = []
+
+    def subscribe(self, listener: Listener) -> None:
+        self._listeners.append(listener)
+
+    def cursor(self) -> str:
+        return f"{self.epoch}-{self._seq}"
+
+    def record_upsert(self, admission_id: str, section: str, row: dict) -> None:
+        self._append(admission_id, section, UPSERT, row)
+
+    def record_delete(self, admission_id: str, section: str, row_id: Any) -> None:
+        self._append(admission_id, section, DELETE, row_id)
+
+    def record_reset(self, admission_id: str | None = None) -> None:
+        """admission_id 의 커서를 모두 만료 (None 이면 epoch 를 바꿔 전체 만료)."""
+        if admission_id is None:
+            self.epoch = uuid.uuid4().hex[:8]
+            self._by_admission.clear()
+            self._trimmed_at.clear()
+            dashboard_cache.invalidate()
+            station_board.invalidate()
+            self._notify(None, None, 0)
+            return
+        self._append(admission_id, None, RESET, None)
+
+    def version(self, admission_id: str | None = None) -> str:
+        """입원(또는 None: 전체 병동)의 데이터 버전. 해당 범위에 변경이 기록될 때마다 바뀝니다 (ETag 용)."""
+        if admission_id is None:
+            return self.cursor()
+        return f"{self.epoch}-{self._last_seq(str(admission_id))}"
+
+    def _last_seq(self, key: str) -> int:
+        entries = self._by_admission.get(key)
+        return max(entries[-1].seq if entries else 0, self._forgotten_at)
+
+    def changes_since(self, cursor: str, admission_id: str) -> list[Change] | None:
+        """cursor 이후 admission_id 의 변경 목록. 커서가 유효하지 않거나 만료·RESET 이후면 None."""
+        epoch, _, seq_text = (cursor or "").partition("-")
+        try:
+            since = int(seq_text)
+        except ValueError:
+            return None
+        key = str(admission_id)
+        if epoch != self.epoch or since > self._seq:
+            return None
+        if since < max(self._trimmed_at.get(key, 0), self._forgotten_at):
+            return None
+        changes = [c for c in self._by_admission.get(key, ()) if c.seq > since]
+        if any(c.op == RESET for c in changes):
+            return None
+        return changes
+
+    def _append(self, admission_id: str, section: str | None, op: str, row: Any) -> None:
+        key = str(admission_id)
+        prev = self._last_seq(key)
+        self._seq += 1
+        entries = self._by_admission.get(key)
+        if entries is None:
+            entries = self._by_admission[key] = deque()
+            while len(self._by_admission) > self.max_admissions:
+                forgotten, _ = self._by_admission.popitem(last=False)
+                self._trimmed_at.pop(forgotten, None)
+                self._forgotten_at = self._seq
+        self._by_admission.move_to_end(key)
+        if len(entries) >= self.per_admission:
+            self._trimmed_at[key] = entries.popleft().seq
+        change = Change(self._seq, section, op, row)
+        entries.append(change)
+        dashboard_cache.invalidate(key)
+        if op == UPSERT:
+            station_board.apply_change(key, section, row)
+        self._notify(key, change, prev)
+
+    def _notify(self, admission_id: str | None, change: Change | None, prev: int) -> None:
+        for listener in self._listeners:
+            listener(admission_id, change, prev)
+
+    def stats(self) -> dict:
+        return {
+            "epoch": self.epoch,
+            "seq": self._seq,
+            "admissions": len(self._by_admission),
+            "entries": sum(len(e) for e in self._by_admission.values()),
+        }
+
+
+change_journal = ChangeJournal(
+    per_admission=int(os.getenv("DASHBOARD_JOURNAL_PER_ADMISSION", "256")),
+    max_admissions=int(os.getenv("DASHBOARD_JOURNAL_MAX_ADMISSIONS", "1024")),
+)
@@ -0,0 +1,163 @@
+"""
+DB 접근 계층 공용 Circuit Breaker 및 재시도 예산(Retry Budget).
+
+Supabase 장애(DNS/11001 등) 시 요청마다 독립적으로 5회 재시도하면 부하가 배가되고
+모든 요청이 수 초씩 지연됩니다. 이를 막기 위해 모든 호출자가 하나의 상태를 공유합니다.
+
+- CircuitBreaker: CLOSED -> (연속 실패 N회) -> OPEN -> (reset_timeout 경과) -> HALF_OPEN
+  OPEN 상태에서는 DB 호출 없이 즉시 CircuitOpenError 로 실패합니다.
+  HALF_OPEN 에서는 제한된 수의 probe 호출만 통과시키고, probe 가 성공해야 CLOSED 로 복귀합니다.
+  OPEN 이전에 시작된 호출의 늦은 성공은 상태를 바꾸지 않습니다.
+  결과를 기록하지 못하고 끝난 probe(요청 deadline 초과·취소)는 release() 로 슬롯을 반환합니다.
+- RetryBudget: 토큰 버킷. 재시도 1회마다 토큰 1개를 소모하며 초당 refill 만큼 회복합니다.
+  토큰이 없으면 재시도 없이 원래 오류를 그대로 반환합니다.
+"""
+import os
+import time
+from typing import Callable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Circuit 이 열려 있어 DB 호출을 시도하지 않고 즉시 실패한 경우."""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(f"Database circuit open; retry after {retry_after:.1f}s")
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_inflight = 0
+        self._probe_generation = 0  # HALF_OPEN 진입마다 증가 (이전 구간 probe 의 늦은 release 무시)
+        self.opened_count = 0
+        self.rejected_count = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._half_open_inflight = 0
+            self._probe_generation += 1
+        return self._state
+
+    def retry_after(self) -> float:
+        return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._half_open_inflight < self.half_open_max_calls:
+            self._half_open_inflight += 1
+            return True
+        self.rejected_count += 1
+        return False
+
+    def check(self) -> int | None:
+        """
+        allow() 가 거부하면 CircuitOpenError 를 발생시킵니다.
+        HALF_OPEN probe 로 통과하면 release() 에 넘길 probe 번호를, 아니면 None 을 반환합니다.
+        """
+        half_open = self.state == HALF_OPEN
+        if not self.allow():
+            raise CircuitOpenError(self.retry_after() or self.reset_timeout)
+        return self._probe_generation if half_open else None
+
+    def release(self, probe: int | None) -> None:
+        """probe 슬롯 반환. 결과가 이미 기록되었거나(상태 전이) 다른 HALF_OPEN 구간의 probe 면 무시."""
+        if probe == self._probe_generation and self._state == HALF_OPEN and self._half_open_inflight > 0:
+            self._half_open_inflight -= 1
+
+    def record_success(self, probe: int | None = None) -> None:
+        """
+        성공 기록. probe 는 check() 가 돌려준 값.
+        OPEN 에서는 무시하고, HALF_OPEN 은 현재 구간의 probe 가 성공했을 때만 CLOSED 로 전이합니다.
+        """
+        state = self.state
+        if state == CLOSED:
+            self._consecutive_failures = 0
+        elif state == HALF_OPEN and probe is not None and probe == self._probe_generation:
+            self._consecutive_failures = 0
+            self._state = CLOSED
+            self._half_open_inflight = 0
+
+    def record_failure(self) -> None:
+        self._consecutive_failures += 1
+        if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            if self._state != OPEN:
+                self.opened_count += 1
+            self._state = OPEN
+            self._opened_at = self._clock()
+            self._half_open_inflight = 0
+
+    def snapshot(self) -> dict:
+        state = self.state
+        return {
+            "state": state,
+            "consecutive_failures": self._consecutive_failures,
+            "opened_count": self.opened_count,
+            "rejected_count": self.rejected_count,
+            "retry_after": round(self.retry_after(), 2) if state == OPEN else 0.0,
+        }
+
+
+class RetryBudget:
+    def __init__(self, capacity: float = 20.0, refill_per_sec: float = 2.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self._clock = clock
+        self._tokens = capacity
+        self._updated_at = clock()
+        self.granted = 0
+        self.denied = 0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.refill_per_sec)
+        self._updated_at = now
+
+    def try_acquire(self) -> bool:
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            self.granted += 1
+            return True
+        self.denied += 1
+        return False
+
+    def snapshot(self) -> dict:
+        self._refill()
+        return {
+            "tokens": round(self._tokens, 2),
+            "capacity": self.capacity,
+            "granted": self.granted,
+            "denied": self.denied,
+        }
+
+
+db_breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("DB_BREAKER_FAILURE_THRESHOLD", "5")),
+    reset_timeout=float(os.getenv("DB_BREAKER_RESET_TIMEOUT", "10")),
+)
+retry_budget = RetryBudget(
+    capacity=float(os.getenv("DB_RETRY_BUDGET_CAPACITY", "20")),
+    refill_per_sec=float(os.getenv("DB_RETRY_BUDGET_REFILL_PER_SEC", "2")),
+)
@@ -0,0 +1,117 @@
+"""
+보호자 대시보드 스냅샷 캐시 (프로세스 내, admission_id 키, LRU).
+
+fetch_dashboard_data 결과를 그대로 보관해 반복 조회 시 DB 왕복 없이 응답합니다.
+대시보드 데이터를 바꾸는 쓰기 경로(체온·수액·식사·검사·서류·전동·퇴원)는 change_journal 에 변경을 기록하며,
+기록 시 해당 입원의 스냅샷이 invalidate(admission_id) 로 제거됩니다.
+다른 인스턴스/직접 DB 수정은 알 수 없으므로 DASHBOARD_CACHE_TTL 이 지나면 다시 조회합니다.
+
+조회 도중 해당 입원이 무효화되면(generation 이후 무효화 기록) 그 결과는 저장하지 않아, 쓰기 이전 데이터가 캐시에 남지 않습니다.
+반환되는 스냅샷은 캐시와 공유되므로 호출자는 수정하지 않아야 합니다.
+"""
+import os
+import time
+from collections import OrderedDict
+
+import metrics
+
+ACTIVE_STATUSES = ("IN_PROGRESS", "OBSERVATION")
+
+
+class DashboardSnapshotCache:
+    def __init__(self, max_entries: int = 512, ttl: float = 60.0, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._by_token: dict[str, str] = {}
+        self._seq = 0                               # 무효화마다 증가
+        self._invalidated_at: dict[str, int] = {}   # admission_id -> 마지막 무효화 seq
+        self._cleared_at = 0                        # 마지막 전체 무효화 seq
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def generation(self) -> int:
+        """조회 시작 전에 받아 두었다가 put 에 전달합니다 (토큰 조회처럼 admission_id 를 나중에 알아도 사용 가능)."""
+        return self._seq
+
+    def get(self, admission_id: str) -> dict | None:
+        if not self.enabled:
+            return None
+        key = str(admission_id)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            metrics.dashboard_cache.inc(result="miss")
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        metrics.dashboard_cache.inc(result="hit")
+        return entry[1]
+
+    def get_by_token(self, token: str) -> dict | None:
+        """토큰으로 조회 (활성 입원 스냅샷만). 토큰 인덱스에 없으면 None (miss 로 집계하지 않음)."""
+        admission_id = self._by_token.get(token)
+        if admission_id is None:
+            return None
+        snapshot = self.get(admission_id)
+        if snapshot is None or snapshot["admission"].get("status") not in ACTIVE_STATUSES:
+            return None
+        return snapshot
+
+    def put(self, admission_id: str, snapshot: dict, generation: int) -> None:
+        key = str(admission_id)
+        if not self.enabled or max(self._cleared_at, self._invalidated_at.get(key, 0)) > generation:
+            return
+        self._drop(key)
+        self._entries[key] = (time.monotonic() + self.ttl, snapshot)
+        token = snapshot["admission"].get("access_token")
+        if token:
+            self._by_token[str(token)] = key
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def invalidate(self, admission_id: str | None = None) -> None:
+        """admission_id 의 스냅샷 제거 (None 이면 전체: 일괄 퇴원·개발용 시드 등)."""
+        self.invalidations += 1
+        self._seq += 1
+        if admission_id is None or len(self._invalidated_at) >= 4 * self.max_entries:
+            # 전체 무효화 (기록이 너무 많아져도 전체 무효화로 정리)
+            self._cleared_at = self._seq
+            self._invalidated_at.clear()
+            self._entries.clear()
+            self._by_token.clear()
+            return
+        key = str(admission_id)
+        self._invalidated_at[key] = self._seq
+        self._drop(key)
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            token = entry[1]["admission"].get("access_token")
+            if token and self._by_token.get(str(token)) == key:
+                del self._by_token[str(token)]
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+dashboard_cache = DashboardSnapshotCache(
+    max_entries=int(os.getenv("DASHBOARD_CACHE_MAX_ENTRIES", "512")),
+    ttl=float(os.getenv("DASHBOARD_CACHE_TTL", "60")),
+    enabled=os.getenv("DASHBOARD_CACHE", "true").lower() == "true",
+)
@@ -0,0 +1,159 @@
+"""
+행 단위 패치 브로드캐스트 (WebSocket "PATCH").
+
+change_journal 에 기록된 변경을 같은 이벤트 루프 틱 안에서 모아 채널별 메시지 하나로 보냅니다.
+클라이언트는 HTTP 재조회 없이 행을 반영하고, 버전이 이어지지 않을 때만 전체를 다시 받습니다.
+- 보호자 토큰 채널: {epoch, admission_id, prev, version, rows: [{section, op, row | id}], reset}
+  version/prev 는 그 입원의 저널 seq (대시보드 응답 cursor "<epoch>-<seq>" 와 같은 축).
+  보유한 cursor 의 seq 가 prev 보다 작으면 중간 패치를 놓친 것이므로 재조회.
+- 스테이션 채널(병동 묶음 STATION:<ward,...> + 전체 STATION, wards.py): {channel, epoch, prev, version, rows: [{op, id, ...바뀐 필드}], reset}
+  version 은 채널별 스테이션 패치 일련번호 (그 채널의 목록 행이 바뀔 때만 증가). 스테이션 연결은 채널 하나만 구독하므로
+  연결이 받는 버전이 끊김 없이 이어집니다. 필드 값은 station_board 반영 결과.
+  전동은 새 병동을 담당하는 채널에 행 전체, 담당하지 않는 채널에는 삭제로 전달합니다 (한 연결이 둘 다 받지 않음).
+reset=True 는 행으로 표현할 수 없는 변경(신규 입원, 전체 만료, 보드 미적재 등)이므로 전체 재조회합니다.
+"""
+import asyncio
+from typing import Any
+
+import fastjson
+import wards
+from admission_directory import admission_directory
+from change_journal import DELETE, RESET, UPSERT, Change, change_journal
+from logger import logger
+from query_registry import SECTION_COLUMNS
+from station_board import station_board, summary_row
+from websocket_manager import manager
+
+# 저널 섹션 -> 스테이션 목록 행에서 바뀌는 필드 (없는 섹션은 목록에 영향 없음)
+STATION_FIELDS = {
+    "vitals": ("latest_temp", "last_vital_at", "had_fever_in_6h"),
+    "iv_records": ("latest_iv",),
+    "meals": ("latest_meal",),
+}
+
+
+def _project(section: str, row: dict) -> dict:
+    # 델타 응답과 같은 컬럼만 전송
+    return {c: row.get(c) for c in SECTION_COLUMNS[section].split(",")}
+
+
+class PatchPublisher:
+    def __init__(self):
+        self._pending: list[tuple[str, str | None, Change | None, int]] = []
+        self._lock = asyncio.Lock()  # 틱마다 만든 flush 가 생성 순서대로 전송
+        self._station_epoch: str | None = None
+        self._station_versions: dict[str, int] = {}
+        self.batches = 0
+        self.messages = 0
+
+    def collect(self, admission_id: str | None, change: Change | None, prev: int) -> None:
+        """change_journal 리스너. 첫 기록 때 flush 를 예약하고 같은 틱의 기록은 함께 전송."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # 이벤트 루프 밖(스크립트·동기 테스트): 받을 연결도 없음
+            return
+        if not self._pending:
+            task = loop.create_task(self.flush())
+            task.add_done_callback(lambda t: t.exception() if not t.cancelled() else None)
+        self._pending.append((change_journal.epoch, admission_id, change, prev))
+
+    async def flush(self) -> None:
+        async with self._lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                await asyncio.gather(*(manager.broadcast(fastjson.dumps(message), channel)
+                                       for channel, message in self.messages_for(batch)))
+            except Exception as e:
+                logger.warning(f"[patches] broadcast failed: {e}")
+
+    def messages_for(self, batch: list[tuple[str, str | None, Change | None, int]]) -> list[tuple[str, dict]]:
+        """(채널, 메시지) 목록. 전체 만료가 섞여 있으면 그 이전 기록은 버리고 모든 채널에 reset 을 먼저 보냄."""
+        out: list[tuple[str, dict]] = []
+        for i in range(len(batch) - 1, -1, -1):
+            if batch[i][1] is None:
+                epoch = batch[i][0]
+                out.extend((channel, {"type": "PATCH", "data": {"epoch": epoch, "reset": True}})
+                           for channel in list(manager.active_connections))
+                self._station_epoch, self._station_versions = epoch, {}
+                batch = batch[i + 1:]
+                break
+
+        groups: dict[str, dict[str, Any]] = {}
+        for epoch, admission_id, change, prev in batch:
+            group = groups.get(admission_id)
+            if group is None:
+                group = groups[admission_id] = {"epoch": epoch, "prev": prev, "rows": [], "sections": set(), "reset": False}
+            group["version"] = change.seq
+            if change.op == RESET:
+                group["reset"] = True
+            elif change.op == UPSERT:
+                group["rows"].append({"section": change.section, "op": UPSERT, "row": _project(change.section, change.row)})
+                group["sections"].add(change.section)
+            elif change.op == DELETE:
+                group["rows"].append({"section": change.section, "op": DELETE, "id": change.row})
+
+        for admission_id, group in groups.items():
+            entry = admission_directory.peek(admission_id)
+            if entry is None:  # 토큰을 모르면 생략: 보호자는 다음 패치에서 누락을 감지해 재조회
+                continue
+            out.append((entry["access_token"], {"type": "PATCH", "data": {
+                "epoch": group["epoch"], "admission_id": admission_id, "prev": group["prev"],
+                "version": group["version"], "rows": [] if group["reset"] else group["rows"], "reset": group["reset"],
+            }}))
+
+        out.extend(self._station_messages(groups))
+        self.batches += 1
+        self.messages += len(out)
+        return out
+
+    def _station_messages(self, groups: dict[str, dict[str, Any]]) -> list[tuple[str, dict]]:
+        channels = [wards.STATION_ALL, *(c for c in manager.active_connections if wards.is_ward_channel(c))]
+        rows: dict[str, list[dict]] = {}  # 채널 -> 행
+        reset = False
+        for admission_id, group in groups.items():
+            whole = group["reset"] or "admission" in group["sections"]
+            fields = [f for section in group["sections"] for f in STATION_FIELDS.get(section, ())]
+            if not whole and not fields:
+                continue
+            if not station_board.loaded:  # 목록 행을 만들 수 없음 (미적재·비활성·신규 입원 직후)
+                reset = True
+                break
+            row = station_board.row(admission_id)
+            if row is None:
+                if group["reset"]:  # 퇴원 등으로 목록에서 빠짐: 병동을 알 수 없으므로 모든 스테이션 채널
+                    for channel in channels:
+                        rows.setdefault(channel, []).append({"op": DELETE, "id": admission_id})
+                continue
+            summary = summary_row(row)
+            upsert = {"op": UPSERT, "id": admission_id, **(summary if whole else {f: summary[f] for f in fields})}
+            ward = wards.ward_for_room(row.get("room_number"))
+            for channel in channels:
+                if wards.covers(channel, ward):
+                    rows.setdefault(channel, []).append(upsert)
+                elif whole:  # 담당 밖 병동으로 전동했을 수 있음 (없던 행이면 클라이언트에서 무시)
+                    rows.setdefault(channel, []).append({"op": DELETE, "id": admission_id})
+        if reset:
+            rows = {channel: [] for channel in channels}
+        if not rows:
+            return []
+
+        epoch = next(iter(groups.values()))["epoch"]
+        if epoch != self._station_epoch:
+            self._station_epoch, self._station_versions = epoch, {}
+        out = []
+        for channel, channel_rows in rows.items():
+            version = self._station_versions[channel] = self._station_versions.get(channel, 0) + 1
+            out.append((channel, {"type": "PATCH", "data": {
+                "channel": channel, "epoch": epoch, "prev": version - 1, "version": version,
+                "rows": channel_rows, "reset": reset,
+            }}))
+        return out
+
+    def stats(self) -> dict:
+        return {"batches": self.batches, "messages": self.messages, "station_channels": dict(self._station_versions)}
+
+
+patch_publisher = PatchPublisher()
+change_journal.subscribe(patch_publisher.collect)
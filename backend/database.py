@@ -1,7 +1,11 @@
+import base64
+import json
 import os
-from supabase import create_async_client, AsyncClient
+from supabase import create_async_client, AsyncClient, AsyncClientOptions
 from dotenv import load_dotenv
 
+from logger import logger
+
 # Load .env from backend directory when run as module (e.g. uvicorn main:app)
 _load_env = os.environ.get("SUPABASE_URL") and os.environ.get("SUPABASE_KEY")
 if not _load_env:
@@ -13,18 +17,51 @@ else:
 url: str | None = os.environ.get("SUPABASE_URL")
 key: str | None = os.environ.get("SUPABASE_KEY")
 
-if not url or not key:
+# 오프라인 벤치마크/부하 테스트용 인메모리 백엔드 (fake_supabase.py 참조)
+USE_FAKE_SUPABASE = os.environ.get("USE_FAKE_SUPABASE", "false").lower() == "true"
+
+if not USE_FAKE_SUPABASE and (not url or not key):
     raise ValueError(
         "SUPABASE_URL and SUPABASE_KEY must be set. "
-        "Copy backend/.env.example to backend/.env and set your Supabase project URL and anon key "
+        "Copy backend/.env.example to backend/.env and set your Supabase project URL and service_role key "
         "(Supabase Dashboard → Project Settings → API)."
     )
 
+
+def key_role(api_key: str | None) -> str | None:
+    """Supabase API 키의 역할. legacy JWT 키는 role 클레임, 신규 키는 접두사로 판별 (알 수 없으면 None)."""
+    if not api_key:
+        return None
+    if api_key.startswith("sb_secret_"):
+        return "service_role"
+    if api_key.startswith("sb_publishable_"):
+        return "anon"
+    try:
+        payload = api_key.split(".")[1]
+        return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))).get("role")
+    except (IndexError, ValueError, AttributeError):
+        return None
+
 # Global client placeholder
 supabase: AsyncClient | None = None
 
 async def init_supabase():
     global supabase
     if not supabase:
-        supabase = await create_async_client(url, key)
+        if USE_FAKE_SUPABASE:
+            from fake_supabase import FakeAsyncClient
+            supabase = FakeAsyncClient.from_env()  # type: ignore[assignment]
+        else:
+            role = key_role(key)
+            if role != "service_role":
+                # 감사 로그 배치 RPC(log_audit_activity_batch)는 service_role 전용 → 건별 RPC 폴백으로 성능 저하
+                logger.error(
+                    f"SUPABASE_KEY is not a service_role key (role={role}). "
+                    "log_audit_activity_batch will be denied (42501) and audit logs fall back to one RPC per entry. "
+                    "Set SUPABASE_KEY to the service_role key (Supabase Dashboard → Project Settings → API)."
+                )
+            from http_pool import build_http_client
+            supabase = await create_async_client(
+                url, key, options=AsyncClientOptions(httpx_client=build_http_client())
+            )
     return supabase
@@ -0,0 +1,90 @@
+"""
+요청 단위 데드라인 (contextvar 로 전파).
+
+미들웨어가 라우트 분류(보호자 조회 / 스테이션 조회 / 쓰기)별 예산으로 데드라인을 설정하면
+execute_with_retry_async 의 각 시도·백오프 sleep 이 남은 예산 안에서만 실행됩니다.
+예산이 소진되면 DeadlineExceeded 로 작업을 포기하고 504 를 반환합니다
+(클라이언트가 이미 포기한 요청에 재시도를 계속하지 않도록).
+"""
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+GUARDIAN_READ = "guardian_read"
+STATION_READ = "station_read"
+WRITE = "write"
+
+ROUTE_BUDGETS: dict[str, float] = {
+    GUARDIAN_READ: float(os.getenv("DEADLINE_GUARDIAN_READ", "4")),
+    STATION_READ: float(os.getenv("DEADLINE_STATION_READ", "6")),
+    WRITE: float(os.getenv("DEADLINE_WRITE", "10")),
+}
+
+# (절대 만료 시각(monotonic), 라우트 분류)
+_deadline: ContextVar[tuple[float, str] | None] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """요청 예산이 소진되어 DB 작업을 포기한 경우."""
+
+    def __init__(self, route_class: str, where: str):
+        self.route_class = route_class
+        self.where = where
+        super().__init__(f"Request deadline exceeded ({route_class}) during {where}")
+
+
+def classify(method: str, path: str) -> str | None:
+    """데드라인을 적용할 라우트 분류. API 가 아니거나(/health, /ws, /static) dev 라우트면 None."""
+    if not path.startswith("/api/v1/") or path.startswith("/api/v1/dev/"):
+        return None
+    if method in ("GET", "HEAD"):
+        return GUARDIAN_READ if path.startswith("/api/v1/dashboard/") else STATION_READ
+    if method == "OPTIONS":
+        return None
+    return WRITE
+
+
+def remaining() -> float | None:
+    """남은 예산(초). 데드라인이 없으면 None."""
+    current = _deadline.get()
+    if current is None:
+        return None
+    return current[0] - time.monotonic()
+
+
+def route_class() -> str | None:
+    current = _deadline.get()
+    return current[1] if current else None
+
+
+def check(where: str) -> None:
+    """예산이 이미 소진되었으면 DeadlineExceeded."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(route_class() or "unknown", where)
+
+
+def clear() -> None:
+    """현재 컨텍스트의 데드라인 제거. 여러 요청이 공유하는 작업의 컨텍스트(copy_context)에서 사용."""
+    _deadline.set(None)
+
+
+def describe() -> str:
+    """로그용 남은 예산 표기."""
+    left = remaining()
+    return "no deadline" if left is None else f"budget_left={max(0.0, left):.2f}s"
+
+
+@contextmanager
+def deadline_scope(seconds: float, route_class_: str = "custom"):
+    """현재 컨텍스트에 데드라인 설정. 바깥 데드라인이 더 짧으면 그쪽을 유지합니다."""
+    expires = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None and outer[0] < expires:
+        expires, route_class_ = outer
+    token = _deadline.set((expires, route_class_))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
@@ -0,0 +1,102 @@
+"""
+차트용 시계열 다운샘플링 (LTTB: Largest-Triangle-Three-Buckets).
+
+버킷마다 직전 선택점·다음 버킷 평균과 이루는 삼각형 면적이 가장 큰 점을 골라 모양(피크·골)을 보존합니다.
+numpy 가 있으면 다음 버킷 평균(누적합)과 버킷 안의 면적 계산을 배열 연산으로 하고, 없으면 같은 결과를 내는
+순수 Python 경로를 사용합니다. 버킷 순회는 직전 버킷의 선택점에 의존하므로 두 경로 모두 버킷 수만큼의 Python 루프입니다.
+"""
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # 선택 의존성 (pyproject: dependency-groups)
+    np = None
+
+
+def _bucket_edges(n: int, buckets: int) -> list[int]:
+    # 첫/마지막 점을 제외한 n-2 개를 buckets 개 구간으로 분할. 구간 i = [edges[i], edges[i+1])
+    every = (n - 2) / buckets
+    return [int(i * every) + 1 for i in range(buckets)] + [n - 1]
+
+
+def _lttb_numpy(x: Sequence[float], y: Sequence[float], threshold: int) -> list[int]:
+    xs = np.asarray(x, dtype=np.float64)
+    ys = np.asarray(y, dtype=np.float64)
+    n, buckets = len(xs), threshold - 2
+    edges = np.asarray(_bucket_edges(n, buckets), dtype=np.int64)
+
+    # 다음 버킷 평균 (마지막 버킷의 '다음'은 마지막 점). 누적합으로 한 번에 계산
+    cx = np.concatenate(([0.0], np.cumsum(xs)))
+    cy = np.concatenate(([0.0], np.cumsum(ys)))
+    counts = edges[2:] - edges[1:-1]
+    next_x = np.append((cx[edges[2:]] - cx[edges[1:-1]]) / counts, xs[-1])
+    next_y = np.append((cy[edges[2:]] - cy[edges[1:-1]]) / counts, ys[-1])
+
+    # 선택점 a 가 이전 버킷 결과에 의존하므로 버킷 단위 순회 (버킷 안의 후보 면적만 배열 연산)
+    out, a = [0], 0
+    for i in range(buckets):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((xs[a] - next_x[i]) * (ys[lo:hi] - ys[a]) - (xs[a] - xs[lo:hi]) * (next_y[i] - ys[a]))
+        a = int(lo + np.argmax(area))
+        out.append(a)
+    out.append(n - 1)
+    return out
+
+
+def _lttb_python(x: Sequence[float], y: Sequence[float], threshold: int) -> list[int]:
+    n, buckets = len(x), threshold - 2
+    edges = _bucket_edges(n, buckets)
+
+    out, a = [0], 0
+    for i in range(buckets):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 1 < buckets:
+            nlo, nhi = edges[i + 1], edges[i + 2]
+            next_x = sum(x[nlo:nhi]) / (nhi - nlo)
+            next_y = sum(y[nlo:nhi]) / (nhi - nlo)
+        else:
+            next_x, next_y = x[-1], y[-1]
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((x[a] - next_x) * (y[j] - y[a]) - (x[a] - x[j]) * (next_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        a = best
+        out.append(a)
+    out.append(n - 1)
+    return out
+
+
+def lttb_indices(x: Sequence[float], y: Sequence[float], threshold: int) -> list[int]:
+    """x 오름차순 시계열에서 남길 점의 인덱스(오름차순, 첫/마지막 점 포함). threshold 이하 길이면 전부."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    if np is not None:
+        return _lttb_numpy(x, y, threshold)
+    return _lttb_python(x, y, threshold)
+
+
+def peak_indices(y: Sequence[float], floor: float) -> list[int]:
+    """floor 이상이면서 양옆 이상인 국소 최댓값(고원 포함) 인덱스."""
+    n = len(y)
+    if np is not None and n:
+        ys = np.asarray(y, dtype=np.float64)
+        padded = np.concatenate(([-np.inf], ys, [-np.inf]))
+        mask = (ys >= floor) & (ys >= padded[:-2]) & (ys >= padded[2:])
+        return np.flatnonzero(mask).tolist()
+    return [
+        i for i in range(n)
+        if y[i] >= floor and (i == 0 or y[i] >= y[i - 1]) and (i == n - 1 or y[i] >= y[i + 1])
+    ]
+
+
+def downsample_indices(x: Sequence[float], y: Sequence[float], width: int, keep: Sequence[int] = ()) -> list[int]:
+    """
+    width 개 안팎으로 줄인 인덱스. keep 의 점은 항상 포함하고,
+    남은 자리(width - len(keep))를 LTTB 로 채웁니다.
+    """
+    if len(x) <= width:
+        return list(range(len(x)))
+    forced = set(keep)
+    return sorted(forced.union(lttb_indices(x, y, max(width - len(forced), 3))))
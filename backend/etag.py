@@ -0,0 +1,37 @@
+"""
+조건부 GET (ETag / If-None-Match) 도우미.
+
+ETag 는 응답 본문이 아니라 change_journal 의 버전(+시간 구간)으로 만들므로, 일치하면
+상세 테이블 조회와 직렬화 없이 304 를 반환할 수 있습니다.
+시간 구간(bucket)은 이 프로세스가 모르는 변경(다른 인스턴스·직접 DB 수정)과 시간에 따라 바뀌는 값
+(스테이션 목록의 6시간 발열 여부 등)이 최대 구간 길이만큼만 늦게 반영되도록 합니다.
+"""
+import hashlib
+import time
+
+from fastapi import Request, Response
+
+# 브라우저만 저장(공용 프록시 저장 금지)하고 매번 재검증하도록
+REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: object, bucket_seconds: float | None = None) -> str:
+    if bucket_seconds:
+        parts = (*parts, int(time.time() // bucket_seconds))
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def matches(request: Request, etag: str) -> bool:
+    """If-None-Match 가 etag 와 일치하는지 (RFC 9110 약한 비교: W/ 접두어 무시)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in header.split(","))
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": REVALIDATE})
@@ -0,0 +1,778 @@
+"""
+In-memory PostgREST-compatible stand-in for the Supabase AsyncClient.
+
+서비스 계층이 사용하는 `table(...).select/eq/in_/order/limit/insert/upsert/update/delete`
+체인과 `.rpc(...)` 호출을 네트워크 없이 재현합니다. 호출마다 지연(latency)과
+오류(fault)를 주입할 수 있어 로컬 벤치마크·부하 테스트에 사용합니다.
+
+활성화: backend/.env 에 `USE_FAKE_SUPABASE=true` (database.init_supabase 참조)
+- FAKE_DB_LATENCY_MS : 호출당 기본 지연 (ms, 기본 0)
+- FAKE_DB_JITTER_MS  : 지연 편차 (ms, 0~값 사이 균등 분포)
+- FAKE_DB_ERROR_RATE : 호출당 오류 주입 확률 (0.0~1.0)
+
+[한계] 지원하는 문법은 이 저장소가 실제로 사용하는 부분집합입니다.
+임베디드 리소스(`admissions!inner(room_number)`)는 `<리소스 단수형>_id` 외래키 규칙으로만 조인합니다.
+"""
+import asyncio
+import copy
+import os
+import random
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from postgrest.exceptions import APIError
+
+ACTIVE_STATUSES = ("IN_PROGRESS", "OBSERVATION")
+
+# 테이블별 기본키 / upsert 기본 충돌 키
+_PRIMARY_KEYS: dict[str, str] = {
+    "common_meal_plans": "date",
+}
+
+# 테이블별 서버 측 기본값 (DB DEFAULT 재현)
+_SERIAL_TABLES = {
+    "vital_signs", "iv_records", "meal_requests", "exam_schedules",
+    "document_requests", "audit_logs",
+}
+_UUID_TABLES = {"admissions", "patient_meal_overrides"}
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _table_defaults(table: str) -> dict[str, Callable[[], Any]]:
+    defaults: dict[str, Callable[[], Any]] = {}
+    if table == "admissions":
+        defaults = {
+            "access_token": lambda: str(uuid.uuid4()),
+            "status": lambda: "IN_PROGRESS",
+            "check_in_at": _now_iso,
+            "discharged_at": lambda: None,
+            "attending_physician": lambda: None,
+        }
+    elif table == "vital_signs":
+        defaults = {"recorded_at": _now_iso, "has_medication": lambda: False, "medication_type": lambda: None}
+    elif table == "iv_records":
+        defaults = {"created_at": _now_iso, "photo_url": lambda: None}
+    elif table == "meal_requests":
+        defaults = {
+            "created_at": _now_iso,
+            "status": lambda: "PENDING",
+            "room_note": lambda: None,
+            "requested_pediatric_meal_type": lambda: None,
+            "requested_guardian_meal_type": lambda: None,
+        }
+    elif table == "exam_schedules":
+        defaults = {"note": lambda: ""}
+    elif table == "document_requests":
+        defaults = {"created_at": _now_iso, "status": lambda: "PENDING"}
+    elif table == "audit_logs":
+        defaults = {"created_at": _now_iso, "ip_address": lambda: "0.0.0.0", "details": lambda: None}
+    return defaults
+
+
+class FakeResponse:
+    """postgrest APIResponse 의 `data` / `count` 인터페이스만 흉내냅니다."""
+
+    def __init__(self, data: Any, count: int | None = None):
+        self.data = data
+        self.count = count
+
+    def __repr__(self) -> str:
+        return f"FakeResponse(data={self.data!r}, count={self.count!r})"
+
+
+class FakeRequest:
+    """postgrest RequestConfig 와 동일한 속성 이름을 노출 (single-flight 키 계산 등에서 사용)."""
+
+    def __init__(self, http_method: str, path: str):
+        self.http_method = http_method
+        self.path = path
+        self.params: list[tuple[str, str]] = []
+        self.headers: dict[str, str] = {}
+
+    def add_param(self, key: str, value: Any) -> None:
+        self.params.append((key, str(value)))
+
+
+# --- select 파서 ---------------------------------------------------------------
+
+_EMBED_RE = re.compile(r"^(?P<name>\w+)(?P<inner>!inner)?\((?P<cols>.*)\)$", re.S)
+
+
+def _split_top_level(columns: str) -> list[str]:
+    parts, depth, quoted, buf = [], 0, False, []
+    for ch in columns:
+        if ch == '"':
+            quoted = not quoted
+        elif quoted:
+            pass
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0 and not quoted:
+            parts.append("".join(buf).strip())
+            buf = []
+            continue
+        buf.append(ch)
+    if "".join(buf).strip():
+        parts.append("".join(buf).strip())
+    return parts
+
+
+def _parse_select(columns: str) -> tuple[list[str], list[tuple[str, bool, list[str]]]]:
+    """'id, admissions!inner(room_number)' -> (['id'], [('admissions', True, ['room_number'])])"""
+    plain: list[str] = []
+    embeds: list[tuple[str, bool, list[str]]] = []
+    for part in _split_top_level(columns or "*"):
+        m = _EMBED_RE.match(part)
+        if m:
+            sub_plain, _ = _parse_select(m.group("cols"))
+            embeds.append((m.group("name"), bool(m.group("inner")), sub_plain))
+        else:
+            plain.append(part)
+    return plain, embeds
+
+
+def _project(row: dict, columns: list[str]) -> dict:
+    if not columns or "*" in columns:
+        return dict(row)
+    return {c: row.get(c) for c in columns}
+
+
+# --- or_ 논리 필터 파서 ---------------------------------------------------------
+
+_LOGIC_RE = re.compile(r"^(?P<op>and|or)\((?P<body>.*)\)$", re.S)
+
+
+def _logic_predicate(expr: str) -> Callable[[dict], bool]:
+    """PostgREST 논리 트리 'a.lt."x",and(a.eq."x",id.lt.3)' 의 한 항 -> 행 predicate"""
+    m = _LOGIC_RE.match(expr.strip())
+    if m:
+        preds = [_logic_predicate(p) for p in _split_top_level(m.group("body"))]
+        if m.group("op") == "and":
+            return lambda r: all(p(r) for p in preds)
+        return lambda r: any(p(r) for p in preds)
+    column, op, value = expr.strip().split(".", 2)
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1]
+    if op == "is":
+        return lambda r: r.get(column) is None if value == "null" else _as_text(r.get(column)) == value
+    compare = {
+        "eq": lambda c: c == 0, "neq": lambda c: c != 0, "gt": lambda c: c > 0,
+        "gte": lambda c: c >= 0, "lt": lambda c: c < 0, "lte": lambda c: c <= 0,
+    }[op]
+    return lambda r: r.get(column) is not None and compare(_compare(r[column], value))
+
+
+# --- 값 비교 -------------------------------------------------------------------
+
+def _as_text(v: Any) -> str:
+    if isinstance(v, bool):
+        return "true" if v else "false"
+    if hasattr(v, "value") and not isinstance(v, (int, float, str)):
+        v = v.value  # Enum
+    return str(v)
+
+
+def _compare(a: Any, b: Any) -> int:
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)) and not isinstance(a, bool):
+        return (a > b) - (a < b)
+    sa, sb = _as_text(a), _as_text(b)
+    try:
+        fa, fb = float(sa), float(sb)
+        return (fa > fb) - (fa < fb)
+    except ValueError:
+        return (sa > sb) - (sa < sb)
+
+
+def _sort_rows(rows: list[dict], orders: list[tuple[str, bool]]) -> list[dict]:
+    # PostgreSQL 기본값: ASC NULLS LAST, DESC NULLS FIRST
+    for column, desc in reversed(orders):
+        present = [r for r in rows if r.get(column) is not None]
+        missing = [r for r in rows if r.get(column) is None]
+        present.sort(key=lambda r: _SortKey(r.get(column)), reverse=desc)
+        rows = (missing + present) if desc else (present + missing)
+    return rows
+
+
+class _SortKey:
+    __slots__ = ("v",)
+
+    def __init__(self, v: Any):
+        self.v = v
+
+    def __lt__(self, other: "_SortKey") -> bool:
+        return _compare(self.v, other.v) < 0
+
+
+def _parse_iso(value: Any) -> datetime | None:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _api_error(message: str, code: str, details: str | None = None, hint: str | None = None) -> APIError:
+    return APIError({"message": message, "code": code, "details": details, "hint": hint})
+
+
+# --- Query Builder -------------------------------------------------------------
+
+class FakeQueryBuilder:
+    """AsyncRequestBuilder / AsyncFilterRequestBuilder 체인을 재현합니다."""
+
+    def __init__(self, client: "FakeAsyncClient", table: str):
+        self._client = client
+        self._table = table
+        self._op = "select"
+        self._columns = "*"
+        self._count: str | None = None
+        self._payload: Any = None
+        self._on_conflict: str | None = None
+        self._filters: list[Callable[[dict], bool]] = []
+        self._orders: list[tuple[str, bool]] = []
+        self._limit: int | None = None
+        self._offset = 0
+        self._single = False
+        self._maybe_single = False
+        self.request = FakeRequest("GET", f"/rest/v1/{table}")
+
+    # CRUD
+    def select(self, *columns: str, count: str | None = None) -> "FakeQueryBuilder":
+        self._op = "select"
+        self._columns = ",".join(columns) if columns else "*"
+        self._count = count
+        self.request.add_param("select", self._columns)
+        return self
+
+    def insert(self, json: Any, *, count: str | None = None, returning: str = "representation",
+               upsert: bool = False, default_to_null: bool = True) -> "FakeQueryBuilder":
+        self._op = "upsert" if upsert else "insert"
+        self._payload = json
+        self.request.http_method = "POST"
+        return self
+
+    def upsert(self, json: Any, *, count: str | None = None, returning: str = "representation",
+               ignore_duplicates: bool = False, on_conflict: str = "",
+               default_to_null: bool = True) -> "FakeQueryBuilder":
+        self._op = "upsert"
+        self._payload = json
+        self._on_conflict = on_conflict or None
+        self.request.http_method = "POST"
+        return self
+
+    def update(self, json: dict, *, count: str | None = None,
+               returning: str = "representation") -> "FakeQueryBuilder":
+        self._op = "update"
+        self._payload = json
+        self.request.http_method = "PATCH"
+        return self
+
+    def delete(self, *, count: str | None = None, returning: str = "representation") -> "FakeQueryBuilder":
+        self._op = "delete"
+        self.request.http_method = "DELETE"
+        return self
+
+    # Filters
+    def _add(self, column: str, op: str, value: Any, pred: Callable[[dict], bool]) -> "FakeQueryBuilder":
+        if isinstance(value, (list, tuple)):
+            text = "(" + ",".join(_as_text(v) for v in value) + ")"
+        else:
+            text = _as_text(value)
+        self.request.add_param(column, f"{op}.{text}")
+        self._filters.append(pred)
+        return self
+
+    def eq(self, column: str, value: Any) -> "FakeQueryBuilder":
+        return self._add(column, "eq", value, lambda r: r.get(column) is not None and _as_text(r.get(column)) == _as_text(value))
+
+    def neq(self, column: str, value: Any) -> "FakeQueryBuilder":
+        return self._add(column, "neq", value, lambda r: r.get(column) is not None and _as_text(r.get(column)) != _as_text(value))
+
+    def gt(self, column: str, value: Any) -> "FakeQueryBuilder":
+        return self._add(column, "gt", value, lambda r: r.get(column) is not None and _compare(r[column], value) > 0)
+
+    def gte(self, column: str, value: Any) -> "FakeQueryBuilder":
+        return self._add(column, "gte", value, lambda r: r.get(column) is not None and _compare(r[column], value) >= 0)
+
+    def lt(self, column: str, value: Any) -> "FakeQueryBuilder":
+        return self._add(column, "lt", value, lambda r: r.get(column) is not None and _compare(r[column], value) < 0)
+
+    def lte(self, column: str, value: Any) -> "FakeQueryBuilder":
+        return self._add(column, "lte", value, lambda r: r.get(column) is not None and _compare(r[column], value) <= 0)
+
+    def in_(self, column: str, values: Any) -> "FakeQueryBuilder":
+        wanted = {_as_text(v) for v in values}
+        return self._add(column, "in", tuple(values), lambda r: r.get(column) is not None and _as_text(r.get(column)) in wanted)
+
+    def is_(self, column: str, value: Any) -> "FakeQueryBuilder":
+        if value is None or _as_text(value) == "null":
+            return self._add(column, "is", "null", lambda r: r.get(column) is None)
+        return self._add(column, "is", value, lambda r: _as_text(r.get(column)) == _as_text(value))
+
+    def or_(self, filters: str, reference_table: str | None = None) -> "FakeQueryBuilder":
+        preds = [_logic_predicate(p) for p in _split_top_level(filters)]
+        self.request.add_param("or", f"({filters})")
+        self._filters.append(lambda r: any(p(r) for p in preds))
+        return self
+
+    # Modifiers
+    def order(self, column: str, *, desc: bool = False, nullsfirst: bool | None = None,
+              foreign_table: str | None = None) -> "FakeQueryBuilder":
+        self._orders.append((column, desc))
+        self.request.add_param("order", f"{column}.{'desc' if desc else 'asc'}")
+        return self
+
+    def limit(self, size: int, *, foreign_table: str | None = None) -> "FakeQueryBuilder":
+        self._limit = size
+        self.request.add_param("limit", size)
+        return self
+
+    def range(self, start: int, end: int, foreign_table: str | None = None) -> "FakeQueryBuilder":
+        self._offset = start
+        self._limit = end - start + 1
+        self.request.add_param("offset", start)
+        self.request.add_param("limit", self._limit)
+        return self
+
+    def single(self) -> "FakeQueryBuilder":
+        self._single = True
+        self.request.headers["Accept"] = "application/vnd.pgrst.object+json"
+        return self
+
+    def maybe_single(self) -> "FakeQueryBuilder":
+        self._maybe_single = True
+        self.request.headers["Accept"] = "application/vnd.pgrst.object+json"
+        return self
+
+    async def execute(self) -> FakeResponse:
+        await self._client._before_call(self._table)
+        return self._client._run_query(self)
+
+
+class FakeRPCBuilder:
+    def __init__(self, client: "FakeAsyncClient", fn: str, params: dict):
+        self._client = client
+        self._fn = fn
+        self._params = params
+        self.request = FakeRequest("POST", f"/rest/v1/rpc/{fn}")
+
+    async def execute(self) -> FakeResponse:
+        await self._client._before_call(f"rpc/{self._fn}")
+        return self._client._run_rpc(self._fn, self._params)
+
+
+# --- Client ----------------------------------------------------------------------
+
+class FakeAsyncClient:
+    """
+    Supabase AsyncClient 대체용 인메모리 백엔드.
+
+    latency_ms / jitter_ms : 호출당 지연 주입 (target 별 override 는 set_latency)
+    error_rate             : 호출당 오류 주입 확률 (target 별 override 는 inject_error)
+    """
+
+    # main.lifespan 정리 코드가 참조하는 속성 (실제 클라이언트와 호환)
+    auth = None
+    postgrest = None
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 seed: int | None = None):
+        self.tables: dict[str, list[dict]] = {}
+        self._serial: dict[str, int] = {}
+        self._rng = random.Random(seed)
+        self._latency: dict[str | None, tuple[float, float]] = {None: (latency_ms, jitter_ms)}
+        self._faults: dict[str | None, tuple[float, Callable[[], Exception]]] = {}
+        if error_rate:
+            self._faults[None] = (error_rate, self._default_fault)
+        self.call_counts: dict[str, int] = {}
+
+    @classmethod
+    def from_env(cls) -> "FakeAsyncClient":
+        return cls(
+            latency_ms=float(os.getenv("FAKE_DB_LATENCY_MS", "0")),
+            jitter_ms=float(os.getenv("FAKE_DB_JITTER_MS", "0")),
+            error_rate=float(os.getenv("FAKE_DB_ERROR_RATE", "0")),
+        )
+
+    # 설정 API
+    def set_latency(self, ms: float, jitter_ms: float = 0.0, target: str | None = None) -> None:
+        """target: 테이블명 또는 'rpc/<함수명>'. None 이면 전체 기본값."""
+        self._latency[target] = (ms, jitter_ms)
+
+    def inject_error(self, rate: float, target: str | None = None,
+                     factory: Callable[[], Exception] | None = None) -> None:
+        if rate <= 0:
+            self._faults.pop(target, None)
+            return
+        self._faults[target] = (rate, factory or self._default_fault)
+
+    @staticmethod
+    def _default_fault() -> Exception:
+        return _api_error("Injected fault: service unavailable", "503")
+
+    def seed(self, table: str, rows: list[dict]) -> list[dict]:
+        return [self._insert_row(table, dict(r)) for r in rows]
+
+    def rows(self, table: str) -> list[dict]:
+        return self.tables.setdefault(table, [])
+
+    async def aclose(self) -> None:
+        return None
+
+    # Supabase API
+    def table(self, table_name: str) -> FakeQueryBuilder:
+        return FakeQueryBuilder(self, table_name)
+
+    def from_(self, table_name: str) -> FakeQueryBuilder:
+        return self.table(table_name)
+
+    def rpc(self, fn: str, params: dict | None = None, count: str | None = None,
+            head: bool = False, get: bool = False) -> FakeRPCBuilder:
+        return FakeRPCBuilder(self, fn, params or {})
+
+    # 내부 동작
+    async def _before_call(self, target: str) -> None:
+        self.call_counts[target] = self.call_counts.get(target, 0) + 1
+        ms, jitter = self._latency.get(target, self._latency[None])
+        delay = ms + (self._rng.uniform(0, jitter) if jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000.0)
+        else:
+            await asyncio.sleep(0)
+        fault = self._faults.get(target, self._faults.get(None))
+        if fault and self._rng.random() < fault[0]:
+            raise fault[1]()
+
+    def _next_serial(self, table: str) -> int:
+        self._serial[table] = self._serial.get(table, 0) + 1
+        return self._serial[table]
+
+    def _insert_row(self, table: str, row: dict) -> dict:
+        rows = self.rows(table)
+        for key, factory in _table_defaults(table).items():
+            if key not in row:
+                row[key] = factory()
+        pk = _PRIMARY_KEYS.get(table, "id")
+        if pk not in row or row[pk] is None:
+            if table in _SERIAL_TABLES:
+                row[pk] = self._next_serial(table)
+            elif table in _UUID_TABLES:
+                row[pk] = str(uuid.uuid4())
+        elif isinstance(row[pk], int):
+            self._serial[table] = max(self._serial.get(table, 0), row[pk])
+        if table == "admissions":
+            self._check_active_room(row)
+        rows.append(row)
+        return row
+
+    def _check_active_room(self, row: dict, exclude_id: Any = None) -> None:
+        if row.get("status") not in ACTIVE_STATUSES:
+            return
+        for other in self.rows("admissions"):
+            if other is row or other.get("id") == exclude_id:
+                continue
+            if other.get("room_number") == row.get("room_number") and other.get("status") in ACTIVE_STATUSES:
+                raise _api_error(
+                    'duplicate key value violates unique constraint "idx_unique_active_room"', "23505",
+                    details=f"Key (room_number)=({row.get('room_number')}) already exists.",
+                )
+
+    def _source_rows(self, table: str) -> list[dict]:
+        if table.startswith("view_"):
+            view = getattr(self, f"_{table}", None)
+            if view is None:
+                raise _api_error(f"Could not find the table 'public.{table}' in the schema cache", "PGRST205")
+            return view()
+        return self.rows(table)
+
+    def _embed(self, row: dict, name: str, columns: list[str]) -> dict | None:
+        fk = f"{name[:-1] if name.endswith('s') else name}_id"
+        target_id = row.get(fk)
+        if target_id is None:
+            return None
+        for candidate in self.rows(name):
+            if _as_text(candidate.get("id")) == _as_text(target_id):
+                return _project(candidate, columns)
+        return None
+
+    def _run_query(self, qb: FakeQueryBuilder) -> FakeResponse:
+        table = qb._table
+        if qb._op in ("insert", "upsert"):
+            payload = qb._payload if isinstance(qb._payload, list) else [qb._payload]
+            written = [self._upsert_row(table, dict(p), qb._on_conflict) if qb._op == "upsert"
+                       else self._insert_row(table, dict(p)) for p in payload]
+            return FakeResponse(copy.deepcopy(written))
+
+        matched = [r for r in self._source_rows(table) if all(f(r) for f in qb._filters)]
+
+        if qb._op == "update":
+            for r in matched:
+                r.update(qb._payload)
+            return FakeResponse(copy.deepcopy(matched))
+        if qb._op == "delete":
+            store = self.rows(table)
+            ids = {id(r) for r in matched}
+            self.tables[table] = [r for r in store if id(r) not in ids]
+            return FakeResponse(copy.deepcopy(matched))
+
+        # 정렬은 프로젝션 이전 원본 컬럼 기준 (PostgREST 와 동일)
+        if qb._orders:
+            matched = _sort_rows(matched, qb._orders)
+
+        plain, embeds = _parse_select(qb._columns)
+        result = []
+        for r in matched:
+            out = _project(r, plain)
+            skip = False
+            for name, inner, cols in embeds:
+                out[name] = self._embed(r, name, cols)
+                if inner and out[name] is None:
+                    skip = True
+            if not skip:
+                result.append(out)
+
+        total = len(result)
+        if qb._offset:
+            result = result[qb._offset:]
+        if qb._limit is not None:
+            result = result[: qb._limit]
+        result = copy.deepcopy(result)
+
+        if qb._single or qb._maybe_single:
+            if len(result) == 1:
+                return FakeResponse(result[0], total if qb._count else None)
+            if qb._maybe_single and not result:
+                return FakeResponse(None)
+            raise _api_error(
+                "JSON object requested, multiple (or no) rows returned", "PGRST116",
+                details=f"The result contains {len(result)} rows",
+            )
+        return FakeResponse(result, total if qb._count else None)
+
+    def _upsert_row(self, table: str, row: dict, on_conflict: str | None) -> dict:
+        if on_conflict:
+            keys = tuple(k.strip() for k in on_conflict.split(","))
+        else:
+            keys = (_PRIMARY_KEYS.get(table, "id"),)
+        if all(k in row for k in keys):
+            for existing in self.rows(table):
+                if all(_as_text(existing.get(k)) == _as_text(row[k]) for k in keys):
+                    existing.update(row)
+                    return existing
+        return self._insert_row(table, row)
+
+    # --- Views -------------------------------------------------------------------
+
+    @staticmethod
+    def _latest_by_admission(rows: list[dict], column: str) -> dict[Any, dict]:
+        # 뷰와 같은 top-1: ORDER BY column DESC, id DESC (같은 시각이면 id 가 큰 행)
+        latest: dict[Any, dict] = {}
+        for r in rows:
+            key = r.get("admission_id")
+            cur = latest.get(key)
+            order = 1 if cur is None else _compare(r.get(column) or "", cur.get(column) or "")
+            if order > 0 or (order == 0 and _compare(r.get("id") or 0, cur.get("id") or 0) > 0):
+                latest[key] = r
+        return latest
+
+    def _view_station_dashboard(self) -> list[dict]:
+        vitals = self._latest_by_admission(self.rows("vital_signs"), "recorded_at")
+        ivs = self._latest_by_admission(self.rows("iv_records"), "created_at")
+        meals = self._latest_by_admission(self.rows("meal_requests"), "created_at")
+        fever_cutoff = datetime.now(timezone.utc) - timedelta(hours=6)
+
+        out = []
+        for a in self.rows("admissions"):
+            if a.get("status") not in ACTIVE_STATUSES:
+                continue
+            v = vitals.get(a["id"]) or {}
+            i = ivs.get(a["id"]) or {}
+            m = meals.get(a["id"]) or {}
+            recorded = _parse_iso(v.get("recorded_at"))
+            out.append({
+                "id": a["id"],
+                "room_number": a.get("room_number"),
+                "display_name": a.get("patient_name_masked"),
+                "access_token": a.get("access_token"),
+                "dob": a.get("dob"),
+                "gender": a.get("gender"),
+                "check_in_at": a.get("check_in_at"),
+                "attending_physician": a.get("attending_physician"),
+                "latest_temp": v.get("temperature"),
+                "last_vital_at": v.get("recorded_at"),
+                "had_fever_in_6h": bool(
+                    v.get("temperature") is not None and v["temperature"] >= 38.0
+                    and recorded is not None and recorded >= fever_cutoff
+                ),
+                "iv_rate": i.get("infusion_rate"),
+                "iv_photo": i.get("photo_url"),
+                "meal_type": m.get("request_type"),
+                "pediatric_meal_type": m.get("pediatric_meal_type"),
+                "guardian_meal_type": m.get("guardian_meal_type"),
+                "meal_requested_at": m.get("created_at"),
+            })
+        return _sort_rows(out, [("check_in_at", True)])
+
+    def _view_station_board(self) -> list[dict]:
+        # station_board 테이블은 트리거로 뷰와 같은 행을 유지하므로 같은 계산으로 재현
+        return self._view_station_dashboard()
+
+    # --- RPC -------------------------------------------------------------------
+
+    def _run_rpc(self, fn: str, params: dict) -> FakeResponse:
+        handler = getattr(self, f"_rpc_{fn}", None)
+        if handler is None:
+            raise _api_error(
+                f"Could not find the function public.{fn} in the schema cache", "PGRST202",
+                hint="Perhaps you meant to call a different function",
+            )
+        return FakeResponse(copy.deepcopy(handler(**params)))
+
+    def _audit(self, actor_type: str, action: str, target_id: Any, ip_address: str | None,
+               details: dict | None = None) -> None:
+        self._insert_row("audit_logs", {
+            "actor_type": actor_type, "action": action, "target_id": _as_text(target_id),
+            "ip_address": ip_address or "0.0.0.0", "details": details,
+        })
+
+    def _find_admission(self, admission_id: Any) -> dict | None:
+        for a in self.rows("admissions"):
+            if _as_text(a.get("id")) == _as_text(admission_id):
+                return a
+        return None
+
+    def _rpc_create_admission_transaction(self, p_patient_name_masked, p_room_number, p_dob=None,
+                                          p_gender=None, p_check_in_at=None, p_actor_type="NURSE",
+                                          p_ip_address=None, p_attending_physician=None) -> dict:
+        for a in self.rows("admissions"):
+            if a.get("room_number") == p_room_number and a.get("status") in ACTIVE_STATUSES:
+                raise _api_error(f"Room {p_room_number} is occupied", "P0001")
+        row = self._insert_row("admissions", {
+            "patient_name_masked": p_patient_name_masked,
+            "room_number": p_room_number,
+            "status": "IN_PROGRESS",
+            "dob": p_dob,
+            "gender": _as_text(p_gender) if p_gender is not None else None,
+            "check_in_at": p_check_in_at or _now_iso(),
+            "attending_physician": p_attending_physician,
+        })
+        self._audit(p_actor_type, "CREATE", row["id"], p_ip_address)
+        return {k: row.get(k) for k in (
+            "id", "access_token", "patient_name_masked", "room_number", "dob", "gender",
+            "status", "check_in_at", "attending_physician",
+        )}
+
+    def _rpc_transfer_patient_transaction(self, p_admission_id, p_target_room, p_actor_type="NURSE",
+                                          p_ip_address=None) -> dict:
+        for a in self.rows("admissions"):
+            if a.get("room_number") == p_target_room and a.get("status") in ACTIVE_STATUSES:
+                raise _api_error(f"Room {p_target_room} is occupied", "P0001")
+        adm = self._find_admission(p_admission_id)
+        if adm is None:
+            raise _api_error("Admission not found", "P0001")
+        if adm.get("status") not in ACTIVE_STATUSES:
+            raise _api_error("Patient is not active", "P0001")
+        old_room = adm.get("room_number")
+        adm["room_number"] = p_target_room
+        adm["updated_at"] = _now_iso()
+        self._audit(p_actor_type, "TRANSFER", p_admission_id, p_ip_address,
+                    {"from": old_room, "to": p_target_room})
+        return {"admission_id": p_admission_id, "old_room": old_room, "new_room": p_target_room,
+                "token": adm.get("access_token")}
+
+    def _rpc_discharge_patient_transaction(self, p_admission_id, p_actor_type="NURSE",
+                                           p_ip_address=None) -> dict:
+        adm = self._find_admission(p_admission_id)
+        if adm is None or adm.get("status") not in ACTIVE_STATUSES:
+            raise _api_error("Active admission not found", "P0001")
+        adm["status"] = "DISCHARGED"
+        adm["discharged_at"] = _now_iso()
+        self._audit(p_actor_type, "DISCHARGE", p_admission_id, p_ip_address)
+        return {"admission_id": p_admission_id, "room": adm.get("room_number"),
+                "token": adm.get("access_token")}
+
+    def _rpc_discharge_all_transaction(self, p_actor_type="NURSE", p_ip_address=None) -> dict:
+        count = 0
+        for adm in self.rows("admissions"):
+            if adm.get("status") in ACTIVE_STATUSES:
+                adm["status"] = "DISCHARGED"
+                adm["discharged_at"] = _now_iso()
+                count += 1
+        self._audit(p_actor_type, "DISCHARGE_ALL", "ALL", p_ip_address, {"count": count})
+        return {"count": count}
+
+    def _rpc_upsert_meal_requests_admin(self, p_meals) -> None:
+        columns = (
+            "admission_id", "meal_date", "meal_time", "pediatric_meal_type",
+            "requested_pediatric_meal_type", "guardian_meal_type",
+            "requested_guardian_meal_type", "status", "request_type",
+        )
+        for m in p_meals:
+            row = {c: m.get(c) for c in columns}
+            row["created_at"] = _now_iso()
+            self._upsert_row("meal_requests", row, "admission_id,meal_date,meal_time")
+        return None
+
+    def _rpc_get_dashboard_bundle(self, p_admission_id=None, p_token=None) -> dict | None:
+        if p_token is not None:
+            adm = next((a for a in self.rows("admissions")
+                        if _as_text(a.get("access_token")) == _as_text(p_token)
+                        and a.get("status") in ACTIVE_STATUSES), None)
+        else:
+            adm = self._find_admission(p_admission_id)
+        if adm is None:
+            return None
+
+        def section(table: str, columns: tuple, order: tuple[str, bool] | None, limit: int | None) -> list[dict]:
+            rows = [r for r in self.rows(table) if _as_text(r.get("admission_id")) == _as_text(adm["id"])]
+            if order:
+                rows = _sort_rows(rows, [order])
+            return [{c: r.get(c) for c in columns} for r in rows[:limit]]
+
+        return {
+            "admission": {c: adm.get(c) for c in (
+                "id", "patient_name_masked", "room_number", "status", "discharged_at", "access_token",
+                "dob", "gender", "check_in_at", "attending_physician",
+            )},
+            "vitals": section("vital_signs", (
+                "id", "admission_id", "temperature", "has_medication", "medication_type", "recorded_at",
+            ), ("recorded_at", True), 100),
+            "iv_records": section("iv_records", (
+                "id", "admission_id", "photo_url", "infusion_rate", "created_at",
+            ), ("created_at", True), 50),
+            "meals": section("meal_requests", (
+                "id", "admission_id", "request_type", "pediatric_meal_type", "guardian_meal_type",
+                "requested_pediatric_meal_type", "requested_guardian_meal_type", "room_note",
+                "meal_date", "meal_time", "status", "created_at",
+            ), ("meal_date", True), 50),
+            "exam_schedules": section("exam_schedules", (
+                "id", "admission_id", "scheduled_at", "name", "note",
+            ), ("scheduled_at", False), None),
+            "document_requests": section("document_requests", (
+                "id", "admission_id", "request_items", "status", "created_at",
+            ), ("created_at", True), 10),
+        }
+
+    def _rpc_log_audit_activity(self, p_actor_type, p_action, p_target_id, p_ip_address="0.0.0.0") -> None:
+        self._audit(p_actor_type, p_action, p_target_id, p_ip_address)
+        return None
+
+    def _rpc_log_audit_activity_batch(self, p_entries: list[dict]) -> int:
+        for e in p_entries:
+            self._insert_row("audit_logs", {
+                "actor_type": e.get("actor_type"), "action": e.get("action"),
+                "target_id": _as_text(e.get("target_id")), "ip_address": e.get("ip_address") or "0.0.0.0",
+                "created_at": e.get("created_at") or _now_iso(),
+            })
+        return len(p_entries)
@@ -0,0 +1,76 @@
+"""
+응답/브로드캐스트 공용 JSON 직렬화.
+
+orjson 이 설치되어 있으면 사용하고(pyproject: fast-json), 없으면 같은 형식(공백 없는 UTF-8)의 표준 json 으로 대체합니다.
+이미 JSON 호환 형태로 만들어진 서비스 결과는 FastJSONResponse 로 바로 반환해 response_model 재검증과
+jsonable_encoder 를 건너뜁니다.
+"""
+import dataclasses
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, AsyncIterator
+from uuid import UUID
+
+from starlette.responses import JSONResponse, StreamingResponse
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성 (pyproject: fast-json)
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    # orjson/json 이 기본 지원하지 않는 값 (asyncpg Decimal, pydantic 모델, set 등)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumpb(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode()
+
+
+def dumps(obj: Any) -> str:
+    """WebSocket send_text 용 문자열. 브로드캐스트는 메시지당 한 번만 호출해 모든 수신자가 공유"""
+    return dumpb(obj).decode()
+
+
+class FastJSONResponse(JSONResponse):
+    """앱 기본 응답 클래스 (main.app default_response_class)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumpb(content)
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def _ndjson_lines(items: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    try:
+        async for item in items:
+            yield dumpb(item) + b"\n"
+    finally:  # 연결 종료 시 원본 제너레이터의 정리(finally) 즉시 실행
+        aclose = getattr(items, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+def ndjson_response(items: AsyncIterator[Any], headers: dict | None = None) -> StreamingResponse:
+    """비동기 이터레이터의 각 항목을 한 줄씩(NDJSON) 생성 즉시 전송."""
+    return StreamingResponse(_ndjson_lines(items), media_type=NDJSON_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,132 @@
+"""
+Hedged reads: 멱등 읽기 쿼리의 꼬리 지연(p99) 완화.
+
+첫 시도가 해당 쿼리의 최근 p95 안에 응답하지 않으면 동일한 요청을 한 번 더 보내고
+먼저 도착한 응답을 사용합니다 (나머지는 취소). 추가 요청은 토큰 예산으로 제한됩니다
+(기본: primary 요청 대비 최대 5%). DB_HEDGING=true 일 때 hedge=True 로 호출한 GET 쿼리에만 적용됩니다.
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+import metrics
+
+HEDGING_ENABLED = os.getenv("DB_HEDGING", "false").lower() == "true"
+
+
+class LatencyTracker:
+    """쿼리 키별 최근 지연 샘플로 p95 를 추정합니다 (표본이 min_samples 미만이면 None)."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: dict[str, deque[float]] = {}
+
+    def observe(self, key: str, seconds: float) -> None:
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def p95(self, key: str) -> float | None:
+        samples = self._samples.get(key)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+
+class HedgeBudget:
+    """primary 요청마다 ratio 만큼 토큰이 쌓이고 hedge 1회에 토큰 1개를 소모합니다."""
+
+    def __init__(self, ratio: float = 0.05, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = 1.0
+
+    def on_request(self) -> None:
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+
+class Hedger:
+    def __init__(self, tracker: LatencyTracker | None = None, budget: HedgeBudget | None = None,
+                 min_delay: float = 0.01):
+        self.tracker = tracker or LatencyTracker()
+        self.budget = budget or HedgeBudget()
+        self.min_delay = min_delay
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.denied = 0
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.requests += 1
+        self.budget.on_request()
+        p95 = self.tracker.p95(key)
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(fn())
+
+        if p95 is None:
+            result = await primary
+            self.tracker.observe(key, time.perf_counter() - started)
+            return result
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=max(self.min_delay, p95))
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        if done:
+            self.tracker.observe(key, time.perf_counter() - started)
+            return primary.result()
+
+        if not self.budget.try_acquire():
+            self.denied += 1
+            metrics.db_hedges.inc(target=key, outcome="denied")
+            result = await primary
+            self.tracker.observe(key, time.perf_counter() - started)
+            return result
+
+        self.hedges += 1
+        metrics.db_hedges.inc(target=key, outcome="sent")
+        hedge = asyncio.ensure_future(fn())
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((t for t in done if not t.cancelled() and t.exception() is None), None)
+                if winner is not None:
+                    self.tracker.observe(key, time.perf_counter() - started)
+                    if winner is hedge:
+                        self.hedge_wins += 1
+                        metrics.db_hedges.inc(target=key, outcome="won")
+                    return winner.result()
+            # 둘 다 실패: primary 의 오류를 그대로 전달 (재시도 루프가 분류)
+            return primary.result()
+        finally:
+            # 패자 요청은 취소, 이미 실패한 요청의 예외는 회수 (미회수 경고 방지)
+            for task in (primary, hedge):
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": HEDGING_ENABLED,
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "denied": self.denied,
+        }
+
+
+hedger = Hedger(budget=HedgeBudget(ratio=float(os.getenv("DB_HEDGE_BUDGET_RATIO", "0.05"))))
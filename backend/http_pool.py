@@ -0,0 +1,210 @@
+"""
+Supabase(postgrest/rpc/storage) 호출이 공유하는 httpx 커넥션 풀.
+
+supabase-py 기본값은 클라이언트마다 기본 풀(keep-alive 20, 타임아웃 고정)을 만들기 때문에
+대시보드 fan-out(요청당 6개 병렬 쿼리)이 몰리면 풀 대기가 지연의 대부분을 차지합니다.
+풀 한도/keep-alive/HTTP2/타임아웃을 환경 변수로 조정하고, 풀 점유율과 대기 시간을 계측합니다.
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+
+import httpx
+
+from logger import logger
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    max_connections: int = 50
+    max_keepalive: int = 20
+    keepalive_expiry: float = 60.0
+    http2: bool = True
+    connect_timeout: float = 5.0
+    read_timeout: float = 15.0
+    pool_timeout: float = 5.0
+    warmup_connections: int = 6
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        return cls(
+            max_connections=int(os.getenv("DB_POOL_MAX_CONNECTIONS", "50")),
+            max_keepalive=int(os.getenv("DB_POOL_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("DB_POOL_KEEPALIVE_EXPIRY", "60")),
+            http2=os.getenv("DB_HTTP2", "true").lower() == "true",
+            connect_timeout=float(os.getenv("DB_CONNECT_TIMEOUT", "5")),
+            read_timeout=float(os.getenv("DB_READ_TIMEOUT", "15")),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "5")),
+            warmup_connections=int(os.getenv("DB_WARMUP_CONNECTIONS", "6")),
+        )
+
+    def warmup_count(self) -> int:
+        """
+        미리 열 커넥션 수. HTTP/2 는 요청을 한 커넥션에 다중화하므로 1,
+        HTTP/1.1 은 warmup_connections (keep-alive 한도를 넘는 커넥션은 바로 닫히므로 max_keepalive 이내).
+        """
+        if self.http2:
+            return 1
+        return max(1, min(self.warmup_connections, self.max_keepalive, self.max_connections))
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """응답 본문을 다 읽고 닫을 때까지를 in-flight 로 집계하기 위한 스트림 래퍼."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+                self._on_close = None
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    내부 transport 를 감싸 in-flight 요청 수와 풀 대기 시간을 기록합니다.
+    대기 시간은 요청 시작부터 httpcore 의 첫 trace 이벤트(커넥션 배정 이후 발생)까지로 측정합니다.
+    """
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, sample_size: int = 512):
+        self._inner = inner
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self._waits: deque[float] = deque(maxlen=sample_size)
+        self._wait_max = 0.0
+
+    def _record_wait(self, seconds: float) -> None:
+        self._waits.append(seconds)
+        self._wait_max = max(self._wait_max, seconds)
+
+    def _done(self) -> None:
+        self.in_flight -= 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        waited = False
+        user_trace = request.extensions.get("trace")
+
+        async def trace(event: str, info: dict) -> None:
+            nonlocal waited
+            if not waited:
+                waited = True
+                self._record_wait(time.perf_counter() - started)
+            if user_trace is not None:
+                await user_trace(event, info)
+
+        request.extensions["trace"] = trace
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            self.errors += 1
+            self._done()
+            raise
+        response.stream = _TrackedStream(response.stream, self._done)
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+    def _connections(self) -> dict:
+        pool = getattr(self._inner, "_pool", None)
+        conns = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for c in conns if c.is_idle())
+        return {"open": len(conns), "idle": idle, "active": len(conns) - idle}
+
+    def stats(self) -> dict:
+        waits = sorted(self._waits)
+        p = lambda q: round(waits[min(len(waits) - 1, int(q * len(waits)))] * 1000, 2) if waits else 0.0  # noqa: E731
+        return {
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "requests": self.requests,
+            "errors": self.errors,
+            "connections": self._connections(),
+            "wait_ms": {"p50": p(0.50), "p95": p(0.95), "max": round(self._wait_max * 1000, 2)},
+        }
+
+
+_config: PoolConfig | None = None
+_transport: InstrumentedTransport | None = None
+_client: httpx.AsyncClient | None = None
+
+
+def build_http_client(config: PoolConfig | None = None) -> httpx.AsyncClient:
+    """supabase AsyncClientOptions(httpx_client=...) 에 넘길 공유 클라이언트를 생성합니다."""
+    global _config, _transport, _client
+    config = config or PoolConfig.from_env()
+    limits = httpx.Limits(
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive,
+        keepalive_expiry=config.keepalive_expiry,
+    )
+    timeout = httpx.Timeout(
+        connect=config.connect_timeout,
+        read=config.read_timeout,
+        write=config.read_timeout,
+        pool=config.pool_timeout,
+    )
+    _config = config
+    _transport = InstrumentedTransport(httpx.AsyncHTTPTransport(http2=config.http2, limits=limits))
+    _client = httpx.AsyncClient(transport=_transport, timeout=timeout, follow_redirects=True)
+    logger.info(
+        f"DB HTTP pool: max={config.max_connections} keepalive={config.max_keepalive} "
+        f"expiry={config.keepalive_expiry}s http2={config.http2}"
+    )
+    return _client
+
+
+async def warm_up(client, connections: int | None = None) -> None:
+    """
+    풀 커넥션을 미리 열어 TCP/TLS 핸드셰이크를 첫 사용자 요청에서 제거합니다.
+    커넥션마다 PK 인덱스만 읽는 경량 쿼리(admissions id 1건)를 동시에 보내며, 개수는 PoolConfig.warmup_count
+    (HTTP/2: 1, HTTP/1.1: DB_WARMUP_CONNECTIONS) 를 따릅니다. 동시에 진행 중인 요청 수만큼 HTTP/1.1 커넥션이 열립니다.
+    """
+    config = _config or PoolConfig.from_env()
+    n = max(1, connections) if connections is not None else config.warmup_count()
+    results = await asyncio.gather(
+        *(client.table("admissions").select("id").limit(1).execute() for _ in range(n)),
+        return_exceptions=True,
+    )
+    failed = [r for r in results if isinstance(r, Exception)]
+    if failed:
+        raise failed[0]
+    opened = _transport.stats()["connections"]["open"] if _transport else 0
+    logger.info(
+        f"Database warm-up completed ({n} requests, http2={config.http2}, {opened} pooled connections open)."
+    )
+
+
+def pool_stats() -> dict | None:
+    if _transport is None or _config is None:
+        return None
+    return {
+        "max_connections": _config.max_connections,
+        "max_keepalive": _config.max_keepalive,
+        "http2": _config.http2,
+        **_transport.stats(),
+    }
+
+
+async def aclose() -> None:
+    global _client, _transport
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _transport = None
@@ -3,7 +3,7 @@ from typing import Annotated
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import os
 import traceback
@@ -15,6 +15,23 @@ from database import init_supabase
 from websocket_manager import manager
 from logger import logger
 from utils import execute_with_retry_async
+from admission_directory import admission_directory
+from single_flight import single_flight
+from circuit_breaker import CircuitOpenError, db_breaker, retry_budget
+import http_pool
+import read_engine
+import metrics
+import wards
+from audit_queue import audit_queue
+import deadline
+from deadline import DeadlineExceeded
+from hedging import hedger
+from dashboard_cache import dashboard_cache
+from change_journal import change_journal
+from station_board import station_board
+from dashboard_patches import patch_publisher
+from services.admission_service import fetch_station_view
+from fastjson import FastJSONResponse
 
 # Import routers
 from routers import admissions, station, iv_records, vitals, exams, dev, meals
@@ -25,15 +42,33 @@ async def lifespan(app: FastAPI):
     if not hasattr(app.state, "supabase") or not app.state.supabase:
         app.state.supabase = await init_supabase()
         logger.info("Supabase AsyncClient initialized and stored in app.state")
+    await read_engine.init_read_engine()
+    # 감사 로그 write-behind 큐 (요청 경로에서 audit RPC 제거)
+    audit_queue.start(app.state.supabase)
+    # 활성 입원 token/id/병실 디렉터리 적재 (실패 시 첫 조회 때 재시도)
+    try:
+        await admission_directory.load(app.state.supabase)
+    except Exception as e:
+        logger.warning(f"Admission directory preload failed (non-fatal): {e}")
+    # 스테이션 보드 선적재 + 주기적 뷰 대조 (실패 시 첫 목록 조회 때 재시도)
+    station_fetch = lambda: fetch_station_view(app.state.supabase)  # noqa: E731
+    try:
+        await station_board.load(station_fetch)
+    except Exception as e:
+        logger.warning(f"Station board preload failed (non-fatal): {e}")
+    station_board.start(station_fetch)
 
-    # DB 웜업: 첫 사용자 요청 전 커넥션/스키마 캐시 활성화 (Cold Start 시 빈 그리드 방지)
+    # DB 웜업: 첫 사용자 요청 전 풀 커넥션/스키마 캐시 활성화 (Cold Start 시 빈 그리드 방지)
     try:
-        await app.state.supabase.table("view_station_dashboard").select("id").limit(1).execute()
-        logger.info("Database warm-up (view_station_dashboard) completed.")
+        await http_pool.warm_up(app.state.supabase)
     except Exception as e:
         logger.warning(f"Database warm-up failed (non-fatal): {e}")
 
     yield
+    # 남은 감사 로그 flush (DB 장애 시 logs/audit_spill.jsonl 로 보존) 후 커넥션 종료
+    await audit_queue.stop()
+    await station_board.stop()
+    await read_engine.close_read_engine()
     # Cleanup: Close connections to prevent resource leaks
     if app.state.supabase:
         try:
@@ -45,12 +80,16 @@ async def lifespan(app: FastAPI):
             
             if hasattr(app.state.supabase.postgrest, "aclose"):
                 await app.state.supabase.postgrest.aclose()
+
+            # postgrest/rpc/storage 가 공유하는 httpx 풀
+            await http_pool.aclose()
                 
             logger.info("Supabase AsyncClient connections closed.")
         except Exception as e:
             logger.warning(f"Error during client cleanup: {e}")
 
-app = FastAPI(lifespan=lifespan)
+# 기본 응답 직렬화를 orjson 기반으로 (fastjson.py)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # --- Global Exception Handlers ---
 
@@ -71,6 +110,24 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         content={"detail": exc.errors()},
     )
 
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    logger.warning(f"DB circuit open ({request.url.path}): fail-fast")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database temporarily unavailable"},
+        headers={"Retry-After": str(max(1, int(exc.retry_after)))},
+    )
+
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    logger.warning(f"Request deadline exceeded ({request.url.path}): {exc}")
+    metrics.request_deadline_exceeded.inc(route_class=exc.route_class)
+    return JSONResponse(
+        status_code=504,
+        content={"detail": "Request deadline exceeded"},
+    )
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     # Allow individual route HTTPExceptions to pass through to their own handler
@@ -106,6 +163,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 라우트 분류별 요청 데드라인 (deadline.py). DB 재시도/백오프가 이 예산을 넘지 않음
+@app.middleware("http")
+async def request_deadline_middleware(request: Request, call_next):
+    route_class = deadline.classify(request.method, request.url.path)
+    if route_class is None:
+        return await call_next(request)
+    with deadline.deadline_scope(deadline.ROUTE_BUDGETS[route_class], route_class):
+        return await call_next(request)
+
 from fastapi import WebSocket, WebSocketDisconnect
 
 
@@ -149,13 +215,7 @@ async def get_valid_ws_token(websocket: WebSocket, token: str) -> str:
         
     try:
         # Enforce status == 'IN_PROGRESS' or 'OBSERVATION'
-        res = await supabase.table("admissions") \
-            .select("id") \
-            .eq("access_token", token) \
-            .in_("status", ["IN_PROGRESS", "OBSERVATION"]) \
-            .execute()
-            
-        if res.data:
+        if await admission_directory.by_token(supabase, token):
             return token
     except Exception as e:
         logger.error(f"WS Token Validation Error: {e}")
@@ -171,8 +231,14 @@ async def websocket_endpoint(
 ):
     await websocket.accept()
 
-    logger.info(f"WebSocket connected for token: {token}")
-    await manager.connect(websocket, token)
+    # 스테이션은 담당 병동 묶음 채널(?wards=3,4 → STATION:3,4) 또는 전체 채널(STATION) 하나를, 보호자는 자기 토큰 채널을 구독
+    if token == os.getenv("STATION_WS_TOKEN", "STATION"):
+        channels = [wards.subscription_channel(websocket.query_params.get("wards"))]
+    else:
+        channels = [token]
+    logger.info(f"WebSocket connected for token: {token} (channels: {channels})")
+    for channel in channels:
+        await manager.connect(websocket, channel)
     try:
         while True:
             try:
@@ -185,7 +251,8 @@ async def websocket_endpoint(
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for token: {token}")
     finally:
-        manager.disconnect(websocket, token)
+        for channel in channels:
+            manager.disconnect(websocket, channel)
 
 
 @app.get("/health")
@@ -193,14 +260,77 @@ async def health_check():
     """Health check endpoint to verify DB connection"""
     if not hasattr(app.state, "supabase") or not app.state.supabase:
         return JSONResponse(status_code=503, content={"status": "unavailable", "detail": "Database not initialized"})
-    
+
     try:
         # Lightweight query to verify connection
         await execute_with_retry_async(app.state.supabase.table("admissions").select("id", count="exact").limit(1))
-        return {"status": "ok"}
+        return {"status": "ok", **_db_layer_status()}
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return JSONResponse(status_code=503, content={"status": "unhealthy", "detail": str(e)})
+        return JSONResponse(status_code=503, content={"status": "unhealthy", "detail": str(e), **_db_layer_status()})
+
+def _db_layer_status() -> dict:
+    return {
+        "circuit_breaker": db_breaker.snapshot(),
+        "retry_budget": retry_budget.snapshot(),
+        "single_flight": single_flight.stats(),
+        "db_pool": http_pool.pool_stats(),
+        "read_engine": read_engine.read_engine_stats(),
+        "audit_queue": audit_queue.stats(),
+        "hedging": hedger.stats(),
+        "dashboard_cache": dashboard_cache.stats(),
+        "change_journal": change_journal.stats(),
+        "admission_directory": admission_directory.stats(),
+        "station_board": station_board.stats(),
+        "patches": patch_publisher.stats(),
+    }
+
+_BREAKER_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus text format: DB 호출 히스토그램 + DB 접근 계층 스냅샷"""
+    status_ = _db_layer_status()
+    breaker = status_["circuit_breaker"]
+    budget = status_["retry_budget"]
+    sf = status_["single_flight"]
+    gauges = [
+        ("db_circuit_state", "Circuit breaker state (0=closed, 1=half_open, 2=open).", _BREAKER_STATE_VALUES[breaker["state"]], {}),
+        ("db_retry_budget_tokens", "Remaining shared retry tokens.", budget["tokens"], {}),
+        ("db_single_flight_inflight", "Distinct coalesced reads currently in flight.", sf["inflight"], {}),
+    ]
+    # 프로세스 시작 이후 누적값
+    counters = [
+        ("db_circuit_opened_total", "Times the circuit has opened.", breaker["opened_count"], {}),
+        ("db_circuit_rejected_total", "Calls rejected while the circuit was open.", breaker["rejected_count"], {}),
+        ("db_retry_budget_denied_total", "Retries denied by the shared budget.", budget["denied"], {}),
+        ("db_single_flight_collapsed_total", "Reads served by an in-flight identical query.", sf["collapsed"], {}),
+    ]
+    hedging = status_["hedging"]
+    counters += [
+        ("db_hedge_requests_total", "Reads executed through the hedger.", hedging["requests"], {}),
+        ("db_hedge_sent_total", "Hedge requests sent after the p95 delay.", hedging["hedges"], {}),
+        ("db_hedge_wins_total", "Hedge requests that answered first.", hedging["hedge_wins"], {}),
+    ]
+    snapshots = status_["dashboard_cache"]
+    gauges.append(("dashboard_cache_entries", "Guardian dashboard snapshots held in memory.", snapshots["entries"], {}))
+    counters.append(("dashboard_cache_evictions_total", "Snapshots evicted by the LRU bound.", snapshots["evictions"], {}))
+    audit = status_["audit_queue"]
+    gauges.append(("audit_queue_depth", "Audit entries waiting for the next batch flush.", audit["queued"], {}))
+    counters += [
+        ("audit_flushed_total", "Audit entries written by batch flush.", audit["flushed"], {}),
+        ("audit_spilled_total", "Audit entries spilled to disk.", audit["spilled"], {}),
+    ]
+    pool = status_["db_pool"]
+    if pool:
+        gauges += [
+            ("db_pool_in_flight", "HTTP requests in flight on the Supabase pool.", pool["in_flight"], {}),
+            ("db_pool_connections", "Pooled HTTP connections by state.", pool["connections"]["active"], {"state": "active"}),
+            ("db_pool_connections", "Pooled HTTP connections by state.", pool["connections"]["idle"], {"state": "idle"}),
+            ("db_pool_wait_ms", "Pool acquisition wait (recent sample).", pool["wait_ms"]["p95"], {"quantile": "0.95"}),
+            ("db_pool_wait_ms", "Pool acquisition wait (recent sample).", pool["wait_ms"]["max"], {"quantile": "1"}),
+        ]
+    return PlainTextResponse(metrics.render_prometheus(gauges, counters), media_type="text/plain; version=0.0.4")
 
 @app.get("/")
 def read_root():
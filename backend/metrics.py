@@ -0,0 +1,204 @@
+"""
+DB 호출 계측 및 Prometheus 텍스트 포맷 출력 (/metrics).
+
+외부 라이브러리 없이 단일 프로세스 메모리에 누적합니다 (uvicorn 워커별 값).
+- db_query_duration_seconds{target,method,outcome}: 재시도를 포함한 논리 호출 1회의 지연
+- db_query_rows{target}: 응답 payload 행 수
+- db_query_retries_total{target}: 재시도 횟수
+- db_query_errors_total{target,error_class}: 실패한 시도(attempt)의 오류 분류
+- db_hedges_total{target,outcome}: hedged read 발송/승리/예산 거부 (hedging.py)
+- query_cache_total{query,result}: 이름 기반 쿼리 TTL 캐시 hit/miss (query_registry.py)
+- request_deadline_exceeded_total{route_class}: 요청 예산 소진으로 포기한 요청 (deadline.py)
+target 은 PostgREST 경로 기준 테이블명 또는 "rpc/<함수명>", asyncpg 읽기 엔진은 "asyncpg/<쿼리명>" 입니다.
+"""
+import bisect
+import threading
+from typing import Iterable
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROW_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+_HTTP_METHODS = {"GET", "HEAD", "POST", "PATCH", "PUT", "DELETE"}
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(labels.get(n, "") for n in self.labelnames), 0.0)
+
+    def collect(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...], labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = labelnames
+        # key -> [bucket counts..., sum, count]
+        self._series: dict[tuple, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            if idx < len(self.buckets):
+                series[idx] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(tuple(labels.get(n, "") for n in self.labelnames))
+        return int(series[-1]) if series else 0
+
+    def collect(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self._series.items()):
+            cumulative = 0.0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                le = f'le="{_format_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_number(cumulative)}")
+            inf = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, inf)} {_format_number(series[-1])}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_number(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_number(series[-1])}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def collect(self) -> list[str]:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return lines
+
+
+registry = Registry()
+
+db_query_duration = registry.register(Histogram(
+    "db_query_duration_seconds", "Latency of a logical DB call including retries.",
+    LATENCY_BUCKETS, ("target", "method", "outcome"),
+))
+db_query_rows = registry.register(Histogram(
+    "db_query_rows", "Rows returned in the DB response payload.", ROW_BUCKETS, ("target",),
+))
+db_query_retries = registry.register(Counter(
+    "db_query_retries_total", "Retries issued by execute_with_retry_async.", ("target",),
+))
+db_query_errors = registry.register(Counter(
+    "db_query_errors_total", "Failed DB attempts by error class.", ("target", "error_class"),
+))
+db_hedges = registry.register(Counter(
+    "db_hedges_total", "Hedged read outcomes (sent, won, denied).", ("target", "outcome"),
+))
+query_cache = registry.register(Counter(
+    "query_cache_total", "Named query TTL cache lookups (query_registry.py).", ("query", "result"),
+))
+dashboard_cache = registry.register(Counter(
+    "dashboard_cache_total", "Guardian dashboard snapshot cache lookups (dashboard_cache.py).", ("result",),
+))
+station_board_drift = registry.register(Counter(
+    "station_board_drift_total", "Station board rows that differed from view_station_dashboard at reconcile.",
+))
+request_deadline_exceeded = registry.register(Counter(
+    "request_deadline_exceeded_total", "Requests abandoned at their deadline.", ("route_class",),
+))
+
+
+def query_labels(query_builder) -> tuple[str, str]:
+    """postgrest 빌더의 request 로부터 (target, method) 라벨을 만듭니다."""
+    req = getattr(query_builder, "request", None)
+    path = str(getattr(req, "path", "") or "")
+    method = getattr(req, "http_method", None)
+    method = method if isinstance(method, str) and method in _HTTP_METHODS else "UNKNOWN"
+    marker = "/rest/v1/"
+    if marker not in path:
+        return "unknown", method
+    target = path.split(marker, 1)[1].split("?", 1)[0].strip("/")
+    return target or "unknown", method
+
+
+def error_class(e: BaseException) -> str:
+    """오류 분류 라벨: 예외 타입명 (+ APIError 코드)."""
+    code = getattr(e, "code", None)
+    if isinstance(code, (str, int)) and code != "":
+        return f"{type(e).__name__}:{code}"
+    return type(e).__name__
+
+
+def payload_rows(res) -> int:
+    data = getattr(res, "data", None)
+    if isinstance(data, list):
+        return len(data)
+    return 0 if data is None else 1
+
+
+def observe_query(target: str, method: str, seconds: float, outcome: str, rows: int | None = None) -> None:
+    db_query_duration.observe(seconds, target=target, method=method, outcome=outcome)
+    if rows is not None:
+        db_query_rows.observe(rows, target=target)
+
+
+def render_prometheus(
+    gauges: list[tuple[str, str, float, dict]] | None = None,
+    counters: list[tuple[str, str, float, dict]] | None = None,
+) -> str:
+    """
+    registry 의 메트릭 + 호출 시점 스냅샷들을 Prometheus 텍스트로 출력합니다.
+    gauges / counters: (name, help, value, labels) 목록. 같은 name 은 연속해서 전달해야 합니다.
+    counters 는 프로세스 시작 이후 누적값 (이름은 _total 로 끝남).
+    """
+    lines = registry.collect()
+    seen: set[str] = set()
+    for kind, samples in (("gauge", gauges), ("counter", counters)):
+        for name, help_text, value, labels in samples or []:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name}{_format_labels(labels.keys(), labels.values())} {_format_number(value)}")
+    return "\n".join(lines) + "\n"
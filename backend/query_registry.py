@@ -0,0 +1,202 @@
+"""
+이름 기반 쿼리 레지스트리.
+
+라우터/서비스에 흩어져 중복되던 조회 쿼리를 이름으로 등록하고, 쿼리마다
+컬럼 projection · 타임아웃 · 재시도 여부 · single-flight/hedge · TTL 캐시 정책을 한 곳에서 관리합니다.
+호출자는 run_query(db, "<name>", **params) 로 실행하며 결과 행 목록(list[dict])을 받습니다.
+
+등록된 쿼리: 보호자 토큰/브로드캐스트 대상 조회, 보호자 대시보드 6개 섹션(dashboard_<섹션>),
+스테이션 목록(station_list / station_board_list).
+
+캐시된 쿼리의 원본 데이터가 바뀌는 쓰기 경로(전동/퇴원 등)는 invalidate(name) 를 호출해야 합니다.
+"""
+import copy
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+import deadline
+import metrics
+import read_engine
+from utils import execute_with_retry_async, execute_instrumented_async
+
+ACTIVE_STATUSES = ["IN_PROGRESS", "OBSERVATION"]
+
+# 대시보드 섹션별 명시 컬럼 (PostgREST select 와 증분 응답 projection 공용, services.dashboard 에서 re-export)
+SECTION_COLUMNS = {
+    "admission": "id,patient_name_masked,room_number,status,discharged_at,access_token,dob,gender,check_in_at,attending_physician",
+    "vitals": "id,admission_id,temperature,has_medication,medication_type,recorded_at",
+    "iv_records": "id,admission_id,photo_url,infusion_rate,created_at",
+    "meals": "id,admission_id,request_type,pediatric_meal_type,guardian_meal_type,requested_pediatric_meal_type,requested_guardian_meal_type,room_note,meal_date,meal_time,status,created_at",
+    "exam_schedules": "id,admission_id,scheduled_at,name,note",
+    "document_requests": "id,admission_id,request_items,status,created_at",
+}
+
+
+@dataclass(frozen=True)
+class QueryPolicy:
+    timeout: float | None = None  # 쿼리 전용 예산(초). 요청 데드라인이 더 짧으면 그쪽 적용
+    retry: bool = True            # False: execute_instrumented_async (1회 실행)
+    coalesce: bool = False
+    hedge: bool = False
+    cache_ttl: float = 0.0        # 0 이면 캐시하지 않음
+
+
+@dataclass(frozen=True)
+class NamedQuery:
+    name: str
+    table: str
+    columns: str
+    build: Callable[..., Any]  # (select 된 query_builder, **params) -> query_builder
+    policy: QueryPolicy = field(default_factory=QueryPolicy)
+    # asyncpg 읽기 엔진 경로 (read_engine.py). None 반환 시 PostgREST 로 실행
+    engine: Callable[..., Awaitable[list[dict] | None]] | None = None
+
+
+QUERIES: dict[str, NamedQuery] = {}
+
+_cache: dict[tuple, tuple[float, list[dict]]] = {}
+_CACHE_MAX_ENTRIES = 4096
+
+
+def register(query: NamedQuery) -> NamedQuery:
+    QUERIES[query.name] = query
+    return query
+
+
+def invalidate(name: str | None = None) -> None:
+    """name 의 캐시 항목을 모두 제거 (None 이면 전체)."""
+    if name is None:
+        _cache.clear()
+        return
+    for key in [k for k in _cache if k[0] == name]:
+        del _cache[key]
+
+
+async def run_query(db, name: str, **params) -> list[dict]:
+    query = QUERIES[name]
+    policy = query.policy
+    key = (name, tuple(sorted(params.items())))
+
+    if policy.cache_ttl:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            metrics.query_cache.inc(query=name, result="hit")
+            return copy.deepcopy(cached[1])
+        metrics.query_cache.inc(query=name, result="miss")
+
+    scope = deadline.deadline_scope(policy.timeout, f"query:{name}") if policy.timeout else nullcontext()
+    with scope:
+        rows = await query.engine(**params) if query.engine is not None else None
+        if rows is None:
+            query_builder = query.build(db.table(query.table).select(query.columns), **params)
+            if policy.retry:
+                res = await execute_with_retry_async(query_builder, coalesce=policy.coalesce, hedge=policy.hedge)
+            else:
+                res = await execute_instrumented_async(query_builder)
+            rows = res.data or []
+
+    if policy.cache_ttl:
+        if len(_cache) >= _CACHE_MAX_ENTRIES:
+            now = time.monotonic()
+            for k in [k for k, (expires, _) in _cache.items() if expires <= now] or [next(iter(_cache))]:
+                del _cache[k]
+        _cache[key] = (time.monotonic() + policy.cache_ttl, copy.deepcopy(rows))
+    return rows
+
+
+# --- Registered queries ---
+
+# 보호자 토큰 → 활성 입원 (대시보드 라우트, WS 인증, 사진 업로드)
+register(NamedQuery(
+    name="active_admission_by_token",
+    table="admissions",
+    columns="id, room_number",
+    build=lambda q, token: q.eq("access_token", token).in_("status", ACTIVE_STATUSES).limit(1),
+    policy=QueryPolicy(timeout=3.0, coalesce=True, hedge=True, cache_ttl=5.0),
+    engine=lambda token: read_engine.fetch_active_admission(token),
+))
+
+# 입원 id → 브로드캐스트 대상(보호자 토큰, 병실). 전동/퇴원 시 invalidate
+register(NamedQuery(
+    name="admission_broadcast_target",
+    table="admissions",
+    columns="access_token, room_number",
+    build=lambda q, admission_id: q.eq("id", admission_id).limit(1),
+    policy=QueryPolicy(timeout=5.0, coalesce=True, cache_ttl=30.0),
+))
+
+# 보호자 대시보드 섹션 (services/dashboard.py). 스냅샷 캐시(dashboard_cache)가 따로 있으므로 TTL 캐시 없음.
+# 같은 입원 동시 조회는 single-flight 로 합치고 느린 시도는 hedge.
+# asyncpg 는 6개를 한 번에 시도하는 read_engine.fetch_dashboard_rows 가 담당하므로 engine 없음
+_DASHBOARD_POLICY = QueryPolicy(coalesce=True, hedge=True)
+
+register(NamedQuery(
+    name="dashboard_admission",
+    table="admissions",
+    columns=SECTION_COLUMNS["admission"],
+    build=lambda q, admission_id: q.eq("id", admission_id),
+    policy=_DASHBOARD_POLICY,
+))
+
+register(NamedQuery(
+    name="dashboard_vitals",
+    table="vital_signs",
+    columns=SECTION_COLUMNS["vitals"],
+    build=lambda q, admission_id: q.eq("admission_id", admission_id).order("recorded_at", desc=True).limit(100),
+    policy=_DASHBOARD_POLICY,
+))
+
+register(NamedQuery(
+    name="dashboard_iv_records",
+    table="iv_records",
+    columns=SECTION_COLUMNS["iv_records"],
+    build=lambda q, admission_id: q.eq("admission_id", admission_id).order("created_at", desc=True).limit(50),
+    policy=_DASHBOARD_POLICY,
+))
+
+register(NamedQuery(
+    name="dashboard_meals",
+    table="meal_requests",
+    columns=SECTION_COLUMNS["meals"],
+    build=lambda q, admission_id: q.eq("admission_id", admission_id).order("meal_date", desc=True).limit(50),
+    policy=_DASHBOARD_POLICY,
+))
+
+register(NamedQuery(
+    name="dashboard_exam_schedules",
+    table="exam_schedules",
+    columns=SECTION_COLUMNS["exam_schedules"],
+    build=lambda q, admission_id: q.eq("admission_id", admission_id).order("scheduled_at"),
+    policy=_DASHBOARD_POLICY,
+))
+
+# PENDING + COMPLETED 모두 포함 (신청된 서류 섹션에 완료 이력 노출용, status 필터 금지)
+register(NamedQuery(
+    name="dashboard_document_requests",
+    table="document_requests",
+    columns=SECTION_COLUMNS["document_requests"],
+    build=lambda q, admission_id: q.eq("admission_id", admission_id).order("created_at", desc=True).limit(10),
+    policy=_DASHBOARD_POLICY,
+))
+
+# 스테이션 목록 (정렬은 뷰의 ORDER BY check_in_at DESC). 메모리 보드(station_board)가 캐시 역할
+register(NamedQuery(
+    name="station_list",
+    table="view_station_dashboard",
+    columns="*",
+    build=lambda q: q,
+    policy=QueryPolicy(coalesce=True, hedge=True),
+    engine=lambda: read_engine.fetch_station_dashboard("view_station_dashboard"),
+))
+
+# 트리거로 증분 갱신되는 station_board 테이블 (STATION_BOARD_TABLE=true, 20261021_station_board_table.sql)
+register(NamedQuery(
+    name="station_board_list",
+    table="view_station_board",
+    columns="*",
+    build=lambda q: q,
+    policy=QueryPolicy(coalesce=True, hedge=True),
+    engine=lambda: read_engine.fetch_station_dashboard("view_station_board"),
+))
@@ -0,0 +1,238 @@
+"""
+핫 읽기 경로용 asyncpg 직접 연결 엔진 (선택 사항).
+
+스테이션 대시보드 뷰, 보호자 대시보드 6개 쿼리, 토큰 조회는 호출마다 PostgREST HTTP + JSON 비용을 냅니다.
+DB_READ_ENGINE=asyncpg 와 DATABASE_URL 이 설정되면 이 쿼리들을 풀링된 asyncpg 커넥션에서
+prepared statement 로 직접 실행합니다. 결과 행은 PostgREST 응답과 같은 JSON 호환 값으로 변환합니다.
+
+- asyncpg 미설치/미설정/연결 실패 시 엔진은 비활성화되며 서비스 함수는 PostgREST 경로를 그대로 사용합니다.
+- 실행 중 오류가 나도 해당 호출은 PostgREST 로 폴백합니다 (fetch_* 가 None 반환).
+- 각 호출은 utils.execute_engine_async 로 요청 deadline · 메트릭(target "asyncpg/<쿼리명>") 을 적용받고,
+  엔진 전용 circuit breaker(engine_breaker)가 열려 있으면 연결을 시도하지 않고 바로 PostgREST 로 넘어갑니다.
+  (직접 연결 장애가 PostgREST 경로의 db_breaker 까지 열지 않도록 분리). 요청 예산 소진은 폴백 없이 전파합니다.
+- 직접 연결은 RLS 를 우회하므로 읽기 전용 역할의 DSN 을 사용하세요.
+- Supabase 트랜잭션 풀러(6543)는 prepared statement 를 지원하지 않으므로 DB_READ_STATEMENT_CACHE_SIZE=0 으로 설정하세요.
+"""
+import asyncio
+import json
+import os
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from deadline import DeadlineExceeded
+from logger import logger
+from utils import execute_engine_async
+
+try:
+    import asyncpg
+except ImportError:  # 선택 의존성 (pyproject: read-engine)
+    asyncpg = None
+
+READ_ENGINE = os.getenv("DB_READ_ENGINE", "postgrest").lower()
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+ACTIVE_STATUSES = ["IN_PROGRESS", "OBSERVATION"]
+
+engine_breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("DB_BREAKER_FAILURE_THRESHOLD", "5")),
+    reset_timeout=float(os.getenv("DB_BREAKER_RESET_TIMEOUT", "10")),
+)
+
+# services/dashboard.fetch_dashboard_data 및 admission_service 의 PostgREST 쿼리와 동일한 컬럼/정렬/limit
+QUERIES: dict[str, str] = {
+    "view_station_dashboard": "SELECT * FROM view_station_dashboard",
+    "view_station_board": "SELECT * FROM view_station_board",
+    "active_admission_by_token": (
+        "SELECT id, room_number FROM admissions WHERE access_token = $1 AND status = ANY($2::text[]) LIMIT 1"
+    ),
+    "admission": (
+        "SELECT id, patient_name_masked, room_number, status, discharged_at, access_token, dob, gender, "
+        "check_in_at, attending_physician FROM admissions WHERE id = $1"
+    ),
+    "vitals": (
+        "SELECT id, admission_id, temperature, has_medication, medication_type, recorded_at FROM vital_signs "
+        "WHERE admission_id = $1 ORDER BY recorded_at DESC LIMIT 100"
+    ),
+    "iv_records": (
+        "SELECT id, admission_id, photo_url, infusion_rate, created_at FROM iv_records "
+        "WHERE admission_id = $1 ORDER BY created_at DESC LIMIT 50"
+    ),
+    "meals": (
+        "SELECT id, admission_id, request_type, pediatric_meal_type, guardian_meal_type, "
+        "requested_pediatric_meal_type, requested_guardian_meal_type, room_note, meal_date, meal_time, status, "
+        "created_at FROM meal_requests WHERE admission_id = $1 ORDER BY meal_date DESC LIMIT 50"
+    ),
+    "exam_schedules": (
+        "SELECT id, admission_id, scheduled_at, name, note FROM exam_schedules "
+        "WHERE admission_id = $1 ORDER BY scheduled_at"
+    ),
+    "document_requests": (
+        "SELECT id, admission_id, request_items, status, created_at FROM document_requests "
+        "WHERE admission_id = $1 ORDER BY created_at DESC LIMIT 10"
+    ),
+}
+
+DASHBOARD_QUERIES = ("admission", "vitals", "iv_records", "meals", "exam_schedules", "document_requests")
+
+
+def to_json_value(value: Any) -> Any:
+    """asyncpg 값을 PostgREST JSON 응답과 같은 표현으로 변환합니다."""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        # numeric 은 값과 무관하게 float (정수 값이라도 int 로 바꾸면 PostgREST 경로와 타입이 갈림)
+        return float(value)
+    if isinstance(value, list):
+        return [to_json_value(v) for v in value]
+    return value
+
+
+def record_to_dict(record) -> dict:
+    return {k: to_json_value(v) for k, v in record.items()}
+
+
+async def _init_connection(conn) -> None:
+    # json/jsonb 를 PostgREST 처럼 파싱된 객체로 반환
+    for typename in ("json", "jsonb"):
+        await conn.set_type_codec(typename, encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+
+class AsyncpgReadEngine:
+    def __init__(self, dsn: str, min_size: int = 2, max_size: int = 10, statement_cache_size: int = 100):
+        self._dsn = dsn
+        self._min_size = min_size
+        self._max_size = max_size
+        self._statement_cache_size = statement_cache_size
+        self._pool = None
+        self.queries = 0
+        self.errors = 0
+
+    async def start(self) -> None:
+        self._pool = await asyncpg.create_pool(
+            self._dsn,
+            min_size=self._min_size,
+            max_size=self._max_size,
+            statement_cache_size=self._statement_cache_size,
+            init=_init_connection,
+        )
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def fetch(self, name: str, *args) -> list[dict]:
+        self.queries += 1
+        try:
+            async with self._pool.acquire() as conn:
+                # conn.fetch 는 statement cache 를 통해 prepared statement 를 재사용
+                records = await conn.fetch(QUERIES[name], *args)
+        except Exception:
+            self.errors += 1
+            raise
+        return [record_to_dict(r) for r in records]
+
+    def stats(self) -> dict:
+        pool = self._pool
+        return {
+            "engine": "asyncpg",
+            "queries": self.queries,
+            "errors": self.errors,
+            "pool_size": pool.get_size() if pool else 0,
+            "pool_idle": pool.get_idle_size() if pool else 0,
+        }
+
+
+_engine: AsyncpgReadEngine | None = None
+
+
+async def init_read_engine() -> None:
+    """lifespan 에서 호출. 설정이 없거나 실패하면 PostgREST 만 사용합니다."""
+    global _engine
+    if READ_ENGINE != "asyncpg" or _engine is not None:
+        return
+    if asyncpg is None:
+        logger.warning("DB_READ_ENGINE=asyncpg but asyncpg is not installed; using PostgREST reads.")
+        return
+    if not DATABASE_URL:
+        logger.warning("DB_READ_ENGINE=asyncpg but DATABASE_URL is not set; using PostgREST reads.")
+        return
+    engine = AsyncpgReadEngine(
+        DATABASE_URL,
+        min_size=int(os.getenv("DB_READ_POOL_MIN", "2")),
+        max_size=int(os.getenv("DB_READ_POOL_MAX", "10")),
+        statement_cache_size=int(os.getenv("DB_READ_STATEMENT_CACHE_SIZE", "100")),
+    )
+    try:
+        await engine.start()
+    except Exception as e:
+        logger.warning(f"asyncpg read engine unavailable, using PostgREST reads: {e}")
+        await engine.close()
+        return
+    _engine = engine
+    logger.info("asyncpg read engine initialized.")
+
+
+async def close_read_engine() -> None:
+    global _engine
+    if _engine is not None:
+        await _engine.close()
+        _engine = None
+
+
+def read_engine_stats() -> dict:
+    if _engine is None:
+        return {"engine": "postgrest"}
+    return {**_engine.stats(), "circuit_breaker": engine_breaker.snapshot()}
+
+
+async def _try(name: str, *args) -> list[dict] | None:
+    try:
+        return await execute_engine_async(f"asyncpg/{name}", lambda: _engine.fetch(name, *args), engine_breaker)
+    except DeadlineExceeded:
+        raise
+    except CircuitOpenError:
+        return None
+    except Exception as e:
+        logger.warning(f"asyncpg read '{name}' failed, falling back to PostgREST: {e}")
+        return None
+
+
+async def fetch_station_dashboard(source: str = "view_station_dashboard") -> list[dict] | None:
+    """스테이션 목록 뷰(view_station_dashboard / view_station_board) 전체 행. 엔진 비활성/실패 시 None."""
+    if _engine is None:
+        return None
+    return await _try(source)
+
+
+async def fetch_active_admission(token: str) -> list[dict] | None:
+    """토큰에 해당하는 활성 입원 [{id, room_number}] (없으면 []). 엔진 비활성/실패 시 None."""
+    if _engine is None:
+        return None
+    try:
+        token_uuid = uuid.UUID(token)
+    except (ValueError, TypeError):
+        return []
+    return await _try("active_admission_by_token", token_uuid, ACTIVE_STATUSES)
+
+
+async def fetch_dashboard_rows(admission_id: str) -> tuple[list[dict], ...] | None:
+    """fetch_dashboard_data 의 6개 쿼리 결과 (DASHBOARD_QUERIES 순서). 엔진 비활성/실패 시 None."""
+    if _engine is None:
+        return None
+    try:
+        adm_uuid = uuid.UUID(str(admission_id))
+    except ValueError:
+        return None
+    results = await asyncio.gather(*(_try(name, adm_uuid) for name in DASHBOARD_QUERIES), return_exceptions=True)
+    for r in results:
+        if isinstance(r, BaseException):
+            raise r
+    if any(r is None for r in results):
+        return None
+    return tuple(results)
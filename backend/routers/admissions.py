@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends, Request, Response
-from typing import List, Annotated
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Annotated, Optional, Union
 from supabase import AsyncClient
 
 from dependencies import get_supabase
-from services import admission_service
-from services.dashboard import fetch_dashboard_data
+from services import admission_service, history_service
+from services.dashboard import dashboard_etag, fetch_dashboard_data, fetch_dashboard_sections, parse_sections
+from change_journal import change_journal
+import etag
+import wards as ward_map
+from fastjson import FastJSONResponse
 from models import AdmissionCreate, TransferRequest
-from schemas import DashboardResponse
+from schemas import DashboardResponse, DashboardSections, TemperatureSeries
 
 router = APIRouter()
 
@@ -42,20 +47,94 @@ async def create_admission(
     return await admission_service.create_admission(db, admission, ip_address)
 
 
+# 스테이션 목록의 시간 의존 값(6시간 내 발열 여부)이 늦어도 1분 안에 반영되도록
+STATION_ETAG_BUCKET_SECONDS = 60
+
+
 @router.get("", response_model=List[dict], summary="활성 환자 목록 조회")
 async def list_admissions(
-    response: Response, db: Annotated[AsyncClient, Depends(get_supabase)]
+    request: Request,
+    db: Annotated[AsyncClient, Depends(get_supabase)],
+    wards: Optional[str] = None,
 ):
-    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-    return await admission_service.list_active_admissions_enriched(db)
+    """?wards=3,4 지정 시 해당 병동 병실만 (WS ?wards= 구독과 같은 목록)"""
+    wanted = {w.strip() for w in (wards or "").split(",") if w.strip()}
+    version = change_journal.version()
+    tag = etag.make_etag("station", version, *sorted(wanted), bucket_seconds=STATION_ETAG_BUCKET_SECONDS)
+    if etag.matches(request, tag):
+        return etag.not_modified(tag)
+
+    data = await admission_service.list_active_admissions_enriched(db)
+    if wanted:
+        data = [row for row in data if ward_map.ward_for_room(row["room_number"]) in wanted]
+    headers = {"Cache-Control": etag.REVALIDATE}
+    if change_journal.version() == version:
+        headers["ETag"] = tag
+    # 서비스가 dict 목록으로 조립한 결과이므로 List[dict] 재검증 없이 직렬화
+    return FastJSONResponse(data, headers=headers)
 
 
 @router.get(
     "/{admission_id}/dashboard",
-    response_model=DashboardResponse,
+    # ?sections= 유무에 따라 본문 형식이 다름 (FastJSONResponse 로 직접 직렬화하므로 문서화 용도)
+    response_model=Union[DashboardResponse, DashboardSections],
     summary="환자 대시보드 데이터 조회",
 )
 async def get_dashboard_data_by_id(
-    admission_id: str, db: Annotated[AsyncClient, Depends(get_supabase)]
+    admission_id: str,
+    request: Request,
+    db: Annotated[AsyncClient, Depends(get_supabase)],
+    sections: Optional[str] = None,
+):
+    """기본은 DashboardResponse, ?sections= 지정 시 해당 섹션만 조회한 DashboardSections (나머지는 null + omitted)"""
+    wanted = parse_sections(sections)
+    version = change_journal.version(admission_id)
+    tag = dashboard_etag(admission_id, wanted)
+    if etag.matches(request, tag):
+        return etag.not_modified(tag)
+
+    if wanted is not None:
+        data = await fetch_dashboard_sections(db, admission_id, wanted)
+    else:
+        data = await fetch_dashboard_data(db, admission_id)
+    unchanged = change_journal.version(admission_id) == version
+    headers = {"ETag": tag, "Cache-Control": etag.REVALIDATE} if unchanged else None
+    # 서비스 결과는 DashboardResponse(DashboardSections) 계약 형태이므로 재검증 없이 직렬화
+    return FastJSONResponse(data, headers=headers)
+
+
+async def _history_response(db: AsyncClient, section: str, admission_id: str, cursor: Optional[str], limit: Optional[int]):
+    page = await history_service.fetch_history_page(db, section, admission_id, cursor, limit)
+    return StreamingResponse(history_service.iter_history_json(page), media_type="application/json")
+
+
+@router.get("/{admission_id}/vitals/history", summary="활력징후 전체 이력 조회 (keyset 페이지)")
+async def get_vitals_history(
+    admission_id: str,
+    db: Annotated[AsyncClient, Depends(get_supabase)],
+    cursor: Optional[str] = None,
+    limit: Annotated[Optional[int], Query(ge=1, le=history_service.HISTORY_MAX_PAGE_SIZE)] = None,
+):
+    """recorded_at, id 내림차순. 응답의 next_cursor 를 ?cursor= 로 넘기면 다음(과거) 페이지"""
+    return await _history_response(db, "vitals", admission_id, cursor, limit)
+
+
+@router.get("/{admission_id}/iv-records/history", summary="수액 기록 전체 이력 조회 (keyset 페이지)")
+async def get_iv_records_history(
+    admission_id: str,
+    db: Annotated[AsyncClient, Depends(get_supabase)],
+    cursor: Optional[str] = None,
+    limit: Annotated[Optional[int], Query(ge=1, le=history_service.HISTORY_MAX_PAGE_SIZE)] = None,
+):
+    """created_at, id 내림차순. 응답의 next_cursor 를 ?cursor= 로 넘기면 다음(과거) 페이지"""
+    return await _history_response(db, "iv_records", admission_id, cursor, limit)
+
+
+@router.get("/{admission_id}/vitals/series", response_model=TemperatureSeries, summary="체온 차트용 다운샘플링 시계열")
+async def get_temperature_series(
+    admission_id: str,
+    db: Annotated[AsyncClient, Depends(get_supabase)],
+    width: Annotated[Optional[int], Query(ge=3, le=history_service.SERIES_MAX_WIDTH)] = None,
 ):
-    return await fetch_dashboard_data(db, admission_id)
+    """차트 가로 픽셀 수(width)에 맞춘 LTTB 다운샘플링. 발열 피크·투약 기록은 항상 포함"""
+    return await history_service.fetch_temperature_series(db, admission_id, width)
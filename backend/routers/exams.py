@@ -10,7 +10,9 @@ from utils import (
     broadcast_to_station_and_patient,
 )
 from models import ExamSchedule, ExamScheduleCreate
+from admission_directory import admission_directory
 from websocket_manager import manager
+from change_journal import change_journal
 
 router = APIRouter()
 
@@ -44,18 +46,14 @@ async def create_exam_schedule(
     data = jsonable_encoder(schedule)
     response = await execute_with_retry_async(db.table("exam_schedules").insert(data))
     new_schedule = response.data[0]
+    change_journal.record_upsert(schedule.admission_id, "exam_schedules", new_schedule)
 
     # Broadcast to guardian dashboard & station
     # 100% Real-time sync: Broadcast to token (guardian) and STATION (nurse)
-    adm_response = await execute_with_retry_async(
-        db.table("admissions")
-        .select("access_token, room_number")
-        .eq("id", schedule.admission_id)
-        .single()
-    )
-    if adm_response.data:
-        token = adm_response.data["access_token"]
-        room = adm_response.data["room_number"]
+    entry = await admission_directory.by_id(db, schedule.admission_id)
+    if entry:
+        token = entry["access_token"]
+        room = entry["room_number"]
 
         message = {"type": "NEW_EXAM_SCHEDULE", "data": {**new_schedule, "room": room}}
         await broadcast_to_station_and_patient(manager, message, token)
@@ -84,20 +82,16 @@ async def delete_exam_schedule(
     await execute_with_retry_async(
         db.table("exam_schedules").delete().eq("id", schedule_id)
     )
+    change_journal.record_delete(admission_id, "exam_schedules", schedule_id)
 
     # 3. Log
     await create_audit_log(db, "NURSE", "DELETE_EXAM", str(schedule_id))
 
     # 4. Broadcast removal to guardian dashboard & station
-    adm_res = await execute_with_retry_async(
-        db.table("admissions")
-        .select("access_token, room_number")
-        .eq("id", admission_id)
-        .single()
-    )
-    if adm_res.data:
-        token = adm_res.data["access_token"]
-        room = adm_res.data["room_number"]
+    entry = await admission_directory.by_id(db, admission_id)
+    if entry:
+        token = entry["access_token"]
+        room = entry["room_number"]
         message = {
             "type": "DELETE_EXAM_SCHEDULE",
             "data": {"id": schedule_id, "admission_id": admission_id, "room": room},
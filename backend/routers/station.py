@@ -1,8 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import Optional, List, Annotated
+from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Optional, List, Annotated, Union
 from supabase import AsyncClient
 from datetime import datetime
-import json
 
 from dependencies import (
     get_supabase,
@@ -10,50 +9,127 @@ from dependencies import (
     verify_admission_token,
 )
 from logger import logger
-from utils import execute_with_retry_async
-from services.dashboard import fetch_dashboard_data
+from utils import execute_with_retry_async, broadcast_to_station_and_patient
+from services.dashboard import (
+    dashboard_etag,
+    fetch_dashboard_data_by_token,
+    fetch_dashboard_delta,
+    fetch_dashboard_sections,
+    parse_sections,
+    resolve_admission_id,
+    stream_dashboard_sections,
+)
 from services.station_service import fetch_pending_requests
+from services.history_service import fetch_temperature_series
 from websocket_manager import manager
+from change_journal import change_journal
+from admission_directory import admission_directory
+import etag
+from fastjson import NDJSON_MEDIA_TYPE, FastJSONResponse, ndjson_response
 from models import MealRequest, DocumentRequest, DocumentRequestCreate
-from schemas import DashboardResponse
+from schemas import DashboardDelta, DashboardResponse, DashboardSections, TemperatureSeries
 
 router = APIRouter()
 
 
 @router.get(
     "/dashboard/{token}",
-    response_model=DashboardResponse,
+    # 쿼리 파라미터에 따라 본문 형식이 다름 (FastJSONResponse 로 직접 직렬화하므로 문서화 용도)
+    response_model=Union[DashboardResponse, DashboardDelta, DashboardSections],
     summary="토큰 기반 환자 대시보드 조회",
 )
 async def get_dashboard_data_by_token(
     token: str,
+    request: Request,
     db: Annotated[AsyncClient, Depends(get_supabase)],
     header_token: Annotated[
         Optional[str], Depends(get_admission_token_optional)
     ] = None,
+    since: Optional[str] = None,
+    sections: Optional[str] = None,
 ):
     """
     Fetch dashboard data using an access_token (Guardian view)
     Supports both path parameter (token) and X-Admission-Token header.
+    기본 응답은 DashboardResponse 입니다.
+    응답의 cursor 를 ?since= 로 넘기면 그 이후 변경분만 DashboardDelta 형식으로 반환합니다.
+    ?sections=iv_records,meals 처럼 지정하면 해당 섹션만 조회한 DashboardSections 를 반환합니다 (since 와 함께 쓰면 since 우선).
     """
     # Use header token if provided and valid, otherwise fallback to path token
     effective_token = header_token if header_token else token
 
-    res = await execute_with_retry_async(
-        db.table("admissions")
-        .select("id")
-        .eq("access_token", effective_token)
-        .in_("status", ["IN_PROGRESS", "OBSERVATION"])  # Enforce active status
-        .limit(1)
-    )
+    if since is not None:
+        return FastJSONResponse(await fetch_dashboard_delta(db, effective_token, since))
+
+    wanted = parse_sections(sections)
+    if wanted is not None:
+        admission_id = await resolve_admission_id(db, effective_token)
+        tag = dashboard_etag(admission_id, wanted)
+        if etag.matches(request, tag):
+            return etag.not_modified(tag)
+        version = change_journal.version(admission_id)
+        partial = await fetch_dashboard_sections(db, admission_id, wanted)
+        unchanged = change_journal.version(admission_id) == version
+        headers = {"ETag": tag, "Cache-Control": etag.REVALIDATE} if unchanged else None
+        return FastJSONResponse({**partial, "cursor": version}, headers=headers)
+
+    # If-None-Match: 버전만 비교해 상세 테이블 조회 없이 304
+    if request.headers.get("if-none-match"):
+        tag = dashboard_etag(await resolve_admission_id(db, effective_token))
+        if etag.matches(request, tag):
+            return etag.not_modified(tag)
+
+    # Enforce active status (active admissions only)
+    cursor = change_journal.cursor()
+    data = await fetch_dashboard_data_by_token(db, effective_token)
+    admission_id = data["admission"]["id"]
+    headers = None
+    if change_journal.changes_since(cursor, admission_id) == []:
+        # 조회 중 변경이 없었을 때만 ETag 부여. cursor 도 입원 단위 버전으로 고정해 같은 데이터 = 같은 본문
+        cursor = change_journal.version(admission_id)
+        headers = {"ETag": dashboard_etag(admission_id), "Cache-Control": etag.REVALIDATE}
+    # 서비스 결과는 DashboardResponse 계약 형태로 조립되어 있으므로 재검증 없이 직렬화
+    return FastJSONResponse({**data, "cursor": cursor}, headers=headers)
 
-    if not res.data:
-        raise HTTPException(
-            status_code=404, detail="Invalid or inactive admission token"
-        )
 
-    admission_id = res.data[0]["id"]
-    return await fetch_dashboard_data(db, admission_id)
+@router.get(
+    "/dashboard/{token}/stream",
+    response_model=None,
+    responses={200: {
+        "description": '한 줄에 JSON 하나: {"section", "data"} | {"section", "error"}, 마지막 줄 {"done", "cursor", "errors"}',
+        "content": {NDJSON_MEDIA_TYPE: {}},
+    }},
+    summary="토큰 기반 환자 대시보드 점진 조회 (NDJSON)",
+)
+async def stream_dashboard_by_token(
+    token: str,
+    db: Annotated[AsyncClient, Depends(get_supabase)],
+    header_token: Annotated[
+        Optional[str], Depends(get_admission_token_optional)
+    ] = None,
+):
+    """
+    섹션 쿼리가 끝나는 대로 한 줄씩 전송 (admission 먼저): {"section", "data"} 또는 {"section", "error"},
+    마지막 줄 {"done", "cursor", "errors"}. 느린 섹션이 있어도 나머지를 먼저 그릴 수 있고,
+    일부 섹션 실패는 error 줄로만 전달됩니다. 토큰 검증은 스트림 시작 전에 수행(무효 시 404).
+    """
+    admission_id = await resolve_admission_id(db, header_token if header_token else token)
+    return ndjson_response(stream_dashboard_sections(db, admission_id))
+
+
+@router.get(
+    "/dashboard/{token}/vitals/series",
+    response_model=TemperatureSeries,
+    summary="토큰 기반 체온 차트 시계열 조회",
+)
+async def get_temperature_series_by_token(
+    token: str,
+    db: Annotated[AsyncClient, Depends(get_supabase)],
+    width: Optional[int] = None,
+):
+    """보호자 체온 차트용. width 는 차트 가로 픽셀 수 (범위 밖이면 보정)"""
+    admission_id = await resolve_admission_id(db, token)
+    return await fetch_temperature_series(db, admission_id, width)
 
 
 @router.get(
@@ -78,19 +154,13 @@ async def request_document(
     token: Annotated[str, Depends(verify_admission_token)],
 ):
     # Verify admission is active AND token matches (Security Boundary)
-    adm_res = await execute_with_retry_async(
-        db.table("admissions")
-        .select("room_number, access_token")
-        .eq("id", request.admission_id)
-        .in_("status", ["IN_PROGRESS", "OBSERVATION"])
-        .single()
-    )
-    if not adm_res.data:
+    adm = await admission_directory.by_token(db, token)
+    if adm is None:
         raise HTTPException(
             status_code=403, detail="Invalid admission ID or patient already discharged"
         )
 
-    if adm_res.data["access_token"] != token:
+    if adm["id"] != request.admission_id:
         raise HTTPException(status_code=403, detail="Admission token mismatch")
 
     # Deduplication Check: Check for existing PENDING requests with same items
@@ -117,11 +187,12 @@ async def request_document(
         db.table("document_requests").insert(data)
     )
     new_request = response.data[0]
+    change_journal.record_upsert(request.admission_id, "document_requests", new_request)
 
     # Broadcast to station and the specific admission (for real-time update in sub-modal/guardian)
     from constants.mappings import DOC_MAP
 
-    room = adm_res.data["room_number"]
+    room = adm["room_number"]
     item_names = [DOC_MAP.get(it, it) for it in request.request_items]
     message = {
         "type": "NEW_DOC_REQUEST",
@@ -134,8 +205,7 @@ async def request_document(
             "content": f"서류 신청 ({', '.join(item_names)})",
         },
     }
-    await manager.broadcast(json.dumps(message), "STATION")
-    await manager.broadcast(json.dumps(message), token)
+    await broadcast_to_station_and_patient(manager, message, token)
     return new_request
 
 
@@ -169,6 +239,7 @@ async def update_document_request_status(
         raise HTTPException(status_code=404, detail="Request not found")
 
     updated_request = response.data
+    change_journal.record_upsert(updated_request["admission_id"], "document_requests", updated_request)
     admission_data = updated_request.get("admissions") or {}
 
     # 3. STATION 및 해당 환자 채널 브로드캐스트 (DB에 기록된 팩트 데이터 전송)
@@ -180,9 +251,7 @@ async def update_document_request_status(
             "room": admission_data.get("room_number"),
         },
     }
-    await manager.broadcast(json.dumps(message), "STATION")
-    if admission_data.get("access_token"):
-        await manager.broadcast(json.dumps(message), admission_data["access_token"])
+    await broadcast_to_station_and_patient(manager, message, admission_data.get("access_token"))
 
     return updated_request
 
@@ -237,6 +306,7 @@ async def update_meal_request_status(
         )
 
     updated_data = response.data
+    change_journal.record_upsert(updated_data["admission_id"], "meals", updated_data)
     admission_data = updated_data.get("admissions") or {}
 
     msg = {
@@ -258,8 +328,6 @@ async def update_meal_request_status(
             "meal_time": updated_data.get("meal_time"),
         },
     }
-    await manager.broadcast(json.dumps(msg), "STATION")
-    if admission_data.get("access_token"):
-        await manager.broadcast(json.dumps(msg), admission_data["access_token"])
+    await broadcast_to_station_and_patient(manager, msg, admission_data.get("access_token"))
 
     return updated_data
@@ -9,7 +9,9 @@ from utils import (
     broadcast_to_station_and_patient,
 )
 from models import VitalSign, VitalSignCreate
+from admission_directory import admission_directory
 from websocket_manager import manager
+from change_journal import change_journal
 
 router = APIRouter()
 
@@ -23,17 +25,13 @@ async def record_vital(
     data = vital.model_dump()
     response = await execute_with_retry_async(db.table("vital_signs").insert(data))
     new_vital = response.data[0]
+    change_journal.record_upsert(vital.admission_id, "vitals", new_vital)
 
     await create_audit_log(db, "NURSE", "CREATE_VITAL", str(new_vital["id"]))
 
     # Broadcast to dashboard and station
-    adm_response = await execute_with_retry_async(
-        db.table("admissions")
-        .select("access_token, room_number")
-        .eq("id", vital.admission_id)
-    )
-    if adm_response.data:
-        record = adm_response.data[0]
+    record = await admission_directory.by_id(db, vital.admission_id)
+    if record:
         token = record["access_token"]
         room_number = record["room_number"]
 
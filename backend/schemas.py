@@ -57,3 +57,32 @@ class DashboardResponse(BaseModel):
     meals: list[MealRequest]
     exam_schedules: list[ExamSchedule]
     document_requests: list[DocumentRequest]
+    cursor: Optional[str] = None  # 다음 증분 조회(?since=)에 사용
+
+class DashboardDelta(BaseModel):
+    """?since=<cursor> 증분 응답. reset=True 면 각 섹션이 전체 데이터이므로 병합하지 말고 교체합니다."""
+    cursor: str
+    reset: bool = False
+    admission: Optional[AdmissionResponse] = None
+    vitals: list[VitalSign] = []
+    iv_records: list[IVRecord] = []
+    meals: list[MealRequest] = []
+    exam_schedules: list[ExamSchedule] = []
+    document_requests: list[DocumentRequest] = []
+    deleted: dict[str, list[int]] = {}  # 섹션 -> 삭제된 행 id
+
+class DashboardSections(BaseModel):
+    """?sections= 부분 응답. omitted 의 섹션은 조회하지 않은 것이므로 null (빈 목록 = 조회 결과 없음)."""
+    admission: Optional[AdmissionResponse] = None
+    vitals: Optional[list[VitalSign]] = None
+    iv_records: Optional[list[IVRecord]] = None
+    meals: Optional[list[MealRequest]] = None
+    exam_schedules: Optional[list[ExamSchedule]] = None
+    document_requests: Optional[list[DocumentRequest]] = None
+    omitted: list[str] = []
+    cursor: Optional[str] = None
+
+class TemperatureSeries(BaseModel):
+    total: int  # 다운샘플링 전 전체 기록 수
+    width: int
+    points: list[VitalSign]
@@ -0,0 +1,86 @@
+"""
+보호자 대시보드 조회를 6개 PostgREST 쿼리(+토큰 조회) 경로와 get_dashboard_bundle RPC 1회 호출로 각각 실행해
+지연 분포를 비교합니다. 로컬 Postgres(supabase start) 또는 스테이징 DB 에 대해 실행하세요. 데이터를 변경하지 않습니다.
+(마이그레이션 20261018_dashboard_bundle.sql 적용 필요)
+
+사용법 (backend 디렉터리 기준, SUPABASE_URL/SUPABASE_KEY 필요):
+    python scripts/bench_dashboard_bundle.py --requests 300 --concurrency 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+_BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(_BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_DIR))
+
+from database import init_supabase  # noqa: E402
+from logger import logger  # noqa: E402
+from services.dashboard import _fetch_rows_postgrest  # noqa: E402
+from utils import execute_with_retry_async  # noqa: E402
+
+
+def summarize(name: str, samples: list[float]) -> None:
+    if not samples:
+        logger.warning(f"{name:<34} no successful samples")
+        return
+    samples.sort()
+    p = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]  # noqa: E731
+    logger.info(
+        f"{name:<34} n={len(samples):<5} p50={p(0.50) * 1000:7.2f}ms "
+        f"p95={p(0.95) * 1000:7.2f}ms p99={p(0.99) * 1000:7.2f}ms mean={statistics.mean(samples) * 1000:7.2f}ms"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    db = await init_supabase()
+    res = await execute_with_retry_async(db.table("view_station_dashboard").select("id,access_token"))
+    rows = res.data or []
+    if not rows:
+        logger.error("No active admissions to benchmark against.")
+        return
+    sem = asyncio.Semaphore(args.concurrency)
+
+    async def timed(samples: list[float], coro_factory):
+        async with sem:
+            started = time.perf_counter()
+            try:
+                await coro_factory()
+            except Exception as e:
+                logger.warning(f"request failed: {e}")
+                return
+            samples.append(time.perf_counter() - started)
+
+    async def bench(name: str, factory) -> None:
+        samples: list[float] = []
+        await asyncio.gather(*(timed(samples, lambda i=i: factory(rows[i % len(rows)])) for i in range(args.requests)))
+        summarize(name, samples)
+
+    async def six_queries(r: dict):
+        await execute_with_retry_async(
+            db.table("admissions").select("id").eq("access_token", r["access_token"])
+            .in_("status", ["IN_PROGRESS", "OBSERVATION"]).limit(1))
+        return await _fetch_rows_postgrest(db, r["id"])
+
+    # 캐시/single-flight 영향을 배제하기 위해 서비스 함수 대신 쿼리를 직접 실행
+    await bench("token lookup + 6 queries", six_queries)
+    await bench("get_dashboard_bundle (token)", lambda r: execute_with_retry_async(
+        db.rpc("get_dashboard_bundle", {"p_admission_id": None, "p_token": r["access_token"]})))
+    await bench("6 queries (admission_id)", lambda r: _fetch_rows_postgrest(db, r["id"]))
+    await bench("get_dashboard_bundle (admission_id)", lambda r: execute_with_retry_async(
+        db.rpc("get_dashboard_bundle", {"p_admission_id": r["id"], "p_token": None})))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
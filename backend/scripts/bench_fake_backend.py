@@ -0,0 +1,96 @@
+"""
+인메모리 Supabase(fake_supabase) 위에서 주요 읽기 경로의 지연 분포를 측정합니다.
+네트워크 없이 노트북에서 실행 가능하며, 호출당 지연/오류를 주입해 원격 DB를 흉내냅니다.
+
+사용법 (backend 디렉터리 기준):
+    python scripts/bench_fake_backend.py --patients 10 --requests 200 --concurrency 20 --latency-ms 15
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+_BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(_BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_DIR))
+os.environ.setdefault("USE_FAKE_SUPABASE", "true")
+
+from fake_supabase import FakeAsyncClient  # noqa: E402
+from logger import logger  # noqa: E402
+from services.admission_service import list_active_admissions_enriched  # noqa: E402
+from services.dashboard import fetch_dashboard_data  # noqa: E402
+
+
+def seed(db: FakeAsyncClient, patients: int, vitals_per_patient: int) -> list[str]:
+    now = datetime.now(timezone.utc)
+    ids = []
+    for p in range(patients):
+        adm = db.seed("admissions", [{"patient_name_masked": f"환*{p}", "room_number": str(301 + p)}])[0]
+        ids.append(adm["id"])
+        db.seed("vital_signs", [
+            {"admission_id": adm["id"], "temperature": 36.5 + (i % 25) / 10,
+             "recorded_at": (now - timedelta(hours=i)).isoformat()}
+            for i in range(vitals_per_patient)
+        ])
+        db.seed("iv_records", [
+            {"admission_id": adm["id"], "infusion_rate": 40, "created_at": (now - timedelta(hours=i * 6)).isoformat()}
+            for i in range(max(1, vitals_per_patient // 6))
+        ])
+    return ids
+
+
+def summarize(name: str, samples: list[float]) -> None:
+    samples.sort()
+    p = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]  # noqa: E731
+    logger.info(
+        f"{name:<28} n={len(samples):<5} p50={p(0.50) * 1000:7.2f}ms "
+        f"p95={p(0.95) * 1000:7.2f}ms p99={p(0.99) * 1000:7.2f}ms mean={statistics.mean(samples) * 1000:7.2f}ms"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    db = FakeAsyncClient(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate, seed=7)
+    ids = seed(db, args.patients, args.vitals)
+    sem = asyncio.Semaphore(args.concurrency)
+
+    async def timed(samples: list[float], coro_factory):
+        async with sem:
+            started = time.perf_counter()
+            try:
+                await coro_factory()
+            except Exception as e:
+                logger.warning(f"request failed: {e}")
+                return
+            samples.append(time.perf_counter() - started)
+
+    dashboard: list[float] = []
+    station: list[float] = []
+    await asyncio.gather(*(
+        timed(dashboard, lambda i=i: fetch_dashboard_data(db, ids[i % len(ids)])) for i in range(args.requests)
+    ))
+    await asyncio.gather(*(
+        timed(station, lambda: list_active_admissions_enriched(db)) for _ in range(args.requests)
+    ))
+    summarize("fetch_dashboard_data", dashboard)
+    summarize("list_active_admissions", station)
+    logger.info(f"DB calls: {sum(db.call_counts.values())} {dict(sorted(db.call_counts.items()))}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--patients", type=int, default=10)
+    parser.add_argument("--vitals", type=int, default=72, help="환자당 체온 기록 수")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=15.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+대시보드 응답 직렬화 비용 비교 (요청당 CPU 시간).
+
+  before: response_model(DashboardResponse) 검증 + 직렬화 + 표준 json 렌더링 (FastAPI 기본 경로)
+  after : fastjson.FastJSONResponse 로 서비스 결과를 바로 렌더링 (orjson 설치 시 orjson)
+브로드캐스트는 수신 채널 2개(STATION + 보호자 토큰) 기준으로 채널별 json.dumps 와 1회 직렬화를 비교합니다.
+
+사용법 (backend 디렉터리 기준):
+    python scripts/bench_json_responses.py --vitals 100 --iterations 2000
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+_BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(_BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_DIR))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+import fastjson  # noqa: E402
+from logger import logger  # noqa: E402
+from schemas import DashboardResponse  # noqa: E402
+
+
+def build_payload(vitals: int) -> dict:
+    now = datetime.now(timezone.utc)
+    adm_id = "3f0c2a1e-8a55-4c0a-9d53-2f7a9b1c0d11"
+    return {
+        "admission": {
+            "id": adm_id, "patient_name_masked": "김*수", "display_name": "김*수", "room_number": "301",
+            "status": "IN_PROGRESS", "discharged_at": None, "access_token": "b1c6f6f2-2c7e-4f55-8f0a-5d1d5a1c9e21",
+            "dob": "2021-03-04", "gender": "M", "check_in_at": now.isoformat(), "attending_physician": None,
+        },
+        "vitals": [
+            {"id": i, "admission_id": adm_id, "temperature": 36.5 + (i % 25) / 10, "has_medication": i % 9 == 0,
+             "medication_type": "A" if i % 9 == 0 else None, "recorded_at": (now - timedelta(hours=i)).isoformat()}
+            for i in range(vitals)
+        ],
+        "iv_records": [
+            {"id": i, "admission_id": adm_id, "photo_url": None, "infusion_rate": 40.0,
+             "created_at": (now - timedelta(hours=i * 6)).isoformat()}
+            for i in range(max(1, vitals // 2))
+        ],
+        "meals": [], "exam_schedules": [], "document_requests": [],
+        "cursor": "a1b2c3d4-42",
+    }
+
+
+def cpu_per_call(fn, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vitals", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    payload = build_payload(args.vitals)
+    # FastAPI serialize_response 와 같은 단계: response_model 검증 -> mode="json" 덤프 -> JSONResponse 렌더링
+    adapter = TypeAdapter(DashboardResponse)
+
+    def before() -> bytes:
+        return JSONResponse(adapter.dump_python(adapter.validate_python(payload), mode="json")).body
+
+    def after() -> bytes:
+        return fastjson.FastJSONResponse(payload).body
+
+    message = {"type": "NEW_VITAL", "data": {"room": "301", **payload["vitals"][0]}}
+
+    def broadcast_before() -> None:
+        for _ in ("STATION", "token"):
+            json.dumps(message)
+
+    def broadcast_after() -> None:
+        fastjson.dumps(message)
+
+    engine = "orjson" if fastjson.orjson is not None else "json (orjson 미설치)"
+    logger.info(f"dashboard payload: vitals={args.vitals}, bytes={len(after())}, encoder={engine}")
+    for name, old, new in (("dashboard response", before, after), ("broadcast x2 channels", broadcast_before, broadcast_after)):
+        t_old, t_new = cpu_per_call(old, args.iterations), cpu_per_call(new, args.iterations)
+        logger.info(
+            f"{name:<22} before={t_old * 1e6:8.1f}us after={t_new * 1e6:8.1f}us "
+            f"saved={(t_old - t_new) * 1e6:8.1f}us/request ({t_old / t_new:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
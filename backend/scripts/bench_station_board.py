@@ -0,0 +1,147 @@
+"""
+트리거로 증분 갱신되는 station_board 테이블(view_station_board)과 현재 view_station_dashboard(LATERAL top-1)를 비교합니다.
+
+bench_station_view.py 와 같은 임시 스키마·시딩 위에 supabase/migrations/20261021_station_board_table.sql 을
+그 스키마로 바꿔 적용(테이블·트리거·백필)한 뒤 다음을 출력합니다.
+- 백필 시간, 두 조회의 실행 계획(EXPLAIN ANALYZE, BUFFERS)과 반복 실행 지연
+- 쓰기 비용: 활력징후 INSERT 를 트리거 켠 상태/끈 상태로 각각 실행한 행당 시간
+- 정합성: 백필 직후와 INSERT·삭제·전동·퇴원 뒤에 두 결과 행이 같은지
+실제 테이블은 건드리지 않으며 종료 시 스키마를 삭제합니다(--keep 으로 보존).
+
+사용법 (backend 디렉터리 기준, asyncpg 및 DATABASE_URL 필요):
+    python scripts/bench_station_board.py --active 40 --discharged 20000 --vitals-per-admission 60 --runs 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+_BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(_BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_DIR))
+
+from logger import logger  # noqa: E402
+from scripts.bench_station_view import INDEXES, NEW_VIEW, SCHEMA, SETUP, asyncpg, seed, timed_runs  # noqa: E402
+
+MIGRATION = _BACKEND_DIR.parent / "supabase" / "migrations" / "20261021_station_board_table.sql"
+
+TRIGGERS = ("vital_signs", "iv_records", "meal_requests", "admissions")
+
+# 새 활력징후: 활성 입원마다 $1 건 (현재 시각 이후라 매번 최신 행이 바뀜)
+INSERT_VITALS = f"""
+INSERT INTO {SCHEMA}.vital_signs (admission_id, temperature, recorded_at)
+SELECT a.id, 36.0 + random() * 3, NOW() + (n || ' seconds')::interval
+FROM {SCHEMA}.admissions a, generate_series(1, $1) n
+WHERE a.status = 'IN_PROGRESS'
+"""
+
+# 최신 행 삭제 / 전동 / 퇴원 (트리거의 재계산·행 삭제 경로)
+MUTATE = f"""
+DELETE FROM {SCHEMA}.vital_signs v USING (
+    SELECT DISTINCT ON (admission_id) id FROM {SCHEMA}.vital_signs ORDER BY admission_id, recorded_at DESC, id DESC
+) latest WHERE v.id = latest.id;
+UPDATE {SCHEMA}.admissions SET room_number = room_number || '-1'
+WHERE id = (SELECT id FROM {SCHEMA}.admissions WHERE status = 'IN_PROGRESS' ORDER BY check_in_at LIMIT 1);
+UPDATE {SCHEMA}.admissions SET status = 'DISCHARGED'
+WHERE id = (SELECT id FROM {SCHEMA}.admissions WHERE status = 'IN_PROGRESS' ORDER BY check_in_at DESC LIMIT 1);
+"""
+
+
+def migration_sql() -> str:
+    """마이그레이션을 임시 스키마 대상으로 변환 (권한 구문은 로컬 역할 유무와 무관하도록 제외)."""
+    lines = [
+        line for line in MIGRATION.read_text(encoding="utf-8").splitlines()
+        if not line.startswith(("GRANT ", "REVOKE "))
+    ]
+    return "\n".join(lines).replace("public.", f"{SCHEMA}.").replace("search_path = public", f"search_path = {SCHEMA}")
+
+
+async def same_rows(conn) -> bool:
+    view_rows = await conn.fetch(f"SELECT * FROM {SCHEMA}.view_new")
+    board_rows = await conn.fetch(f"SELECT * FROM {SCHEMA}.view_station_board")
+    same = [tuple(r) for r in view_rows] == [tuple(r) for r in board_rows]
+    logger.info(f"result rows view={len(view_rows)} board={len(board_rows)} identical={same}")
+    return same
+
+
+async def insert_cost(conn, per_admission: int) -> float:
+    """활력징후 INSERT 의 행당 시간 (ms). 롤백해 다음 측정과 같은 상태에서 시작."""
+    tr = conn.transaction()
+    await tr.start()
+    try:
+        start = time.perf_counter()
+        status = await conn.execute(INSERT_VITALS, per_admission)
+        elapsed = time.perf_counter() - start
+    finally:
+        await tr.rollback()
+    inserted = int(status.split()[-1]) or 1
+    return elapsed * 1000 / inserted
+
+
+async def run(args: argparse.Namespace) -> None:
+    if asyncpg is None or not os.getenv("DATABASE_URL"):
+        logger.error("asyncpg and DATABASE_URL are required (pip install asyncpg; local: supabase start)")
+        return
+    conn = await asyncpg.connect(os.environ["DATABASE_URL"])
+    try:
+        await conn.execute(SETUP)
+        # 실제 스키마와 같은 타입 (station_board 컬럼과 반올림이 같도록)
+        await conn.execute(f"ALTER TABLE {SCHEMA}.vital_signs ALTER COLUMN temperature TYPE numeric(3, 1)")
+        await seed(conn, args)  # 수액 속도는 소수(cc/hr) 포함 → station_board.iv_rate 타입 차이도 정합성 비교에 드러남
+        await conn.execute(INDEXES)
+        await conn.execute(NEW_VIEW)
+
+        started = time.perf_counter()
+        await conn.execute(f"SET search_path TO {SCHEMA}")
+        await conn.execute(migration_sql())
+        await conn.execute(f"ANALYZE {SCHEMA}.station_board")
+        logger.info(f"migration + backfill in {time.perf_counter() - started:.2f}s")
+        await same_rows(conn)
+
+        for name, label in (("view_new", "view"), ("view_station_board", "board")):
+            sql = f"SELECT * FROM {SCHEMA}.{name}"
+            plan = await conn.fetch(f"EXPLAIN (ANALYZE, BUFFERS) {sql}")
+            logger.info(f"--- {label} plan ---\n" + "\n".join(r[0] for r in plan))
+            await timed_runs(conn, sql, 2)  # 캐시 워밍
+            samples = sorted(await timed_runs(conn, sql, args.runs))
+            logger.info(
+                f"{label:<6} runs={args.runs} p50={samples[len(samples) // 2] * 1000:8.2f}ms "
+                f"max={samples[-1] * 1000:8.2f}ms mean={statistics.mean(samples) * 1000:8.2f}ms"
+            )
+
+        with_triggers = await insert_cost(conn, args.writes)
+        for table in TRIGGERS:
+            await conn.execute(f"ALTER TABLE {SCHEMA}.{table} DISABLE TRIGGER trg_station_board_{table}")
+        without_triggers = await insert_cost(conn, args.writes)
+        for table in TRIGGERS:
+            await conn.execute(f"ALTER TABLE {SCHEMA}.{table} ENABLE TRIGGER trg_station_board_{table}")
+        logger.info(
+            f"vital INSERT per row: triggers={with_triggers:.3f}ms no-triggers={without_triggers:.3f}ms "
+            f"overhead={with_triggers - without_triggers:.3f}ms"
+        )
+
+        await conn.execute(INSERT_VITALS, args.writes)
+        await conn.execute(MUTATE)
+        await same_rows(conn)
+    finally:
+        if not args.keep:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--active", type=int, default=40, help="활성 입원 수")
+    parser.add_argument("--discharged", type=int, default=20000, help="퇴원 입원 수 (이력 규모)")
+    parser.add_argument("--vitals-per-admission", type=int, default=60)
+    parser.add_argument("--writes", type=int, default=50, help="쓰기 비용 측정 시 활성 입원당 INSERT 수")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="종료 후 임시 스키마 보존")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
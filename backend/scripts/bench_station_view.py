@@ -0,0 +1,209 @@
+"""
+view_station_dashboard 기존 정의(DISTINCT ON CTE)와 새 정의(LATERAL top-1)를 대량 이력 위에서 비교합니다.
+
+로컬 Postgres(supabase start) 에 임시 스키마(bench_station_view)를 만들고 최소 컬럼의 admissions / vital_signs /
+iv_records / meal_requests 를 generate_series 로 시딩한 뒤, 두 뷰의 실행 계획(EXPLAIN ANALYZE, BUFFERS)과
+반복 실행 지연을 출력합니다. 실제 테이블은 건드리지 않으며 종료 시 스키마를 삭제합니다(--keep 으로 보존).
+두 뷰의 결과 행이 같은지도 확인합니다 (시딩 데이터는 입원별 기록 시각이 겹치지 않아 id 동률 처리 차이가 없음).
+
+뷰 정의는 supabase/migrations/20260311_fix_view_security_invoker.sql(기존, DISTINCT ON 에 id 동률 처리 없음)과
+20261020_station_view_lateral.sql(신규)의 SELECT 와 같습니다.
+
+사용법 (backend 디렉터리 기준, asyncpg 및 DATABASE_URL 필요):
+    python scripts/bench_station_view.py --active 40 --discharged 20000 --vitals-per-admission 60 --runs 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+_BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(_BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_DIR))
+
+from logger import logger  # noqa: E402
+
+try:
+    import asyncpg
+except ImportError:  # 선택 의존성 (pyproject: read-engine)
+    asyncpg = None
+
+SCHEMA = "bench_station_view"
+
+_COLUMNS = """
+    a.id AS id, a.room_number, a.patient_name_masked AS display_name, a.access_token, a.dob, a.gender,
+    a.check_in_at, a.attending_physician,
+    v.temperature AS latest_temp, v.recorded_at AS last_vital_at,
+    CASE WHEN v.temperature >= 38.0 AND v.recorded_at >= (NOW() - INTERVAL '6 hours') THEN true ELSE false END
+        AS had_fever_in_6h,
+    i.infusion_rate AS iv_rate, i.photo_url AS iv_photo,
+    m.request_type AS meal_type, m.pediatric_meal_type, m.guardian_meal_type, m.created_at AS meal_requested_at
+"""
+
+OLD_VIEW = f"""
+CREATE VIEW {SCHEMA}.view_old AS
+WITH latest_vitals AS (
+    SELECT DISTINCT ON (admission_id) * FROM {SCHEMA}.vital_signs ORDER BY admission_id, recorded_at DESC
+),
+latest_iv AS (
+    SELECT DISTINCT ON (admission_id) * FROM {SCHEMA}.iv_records ORDER BY admission_id, created_at DESC
+),
+latest_meal AS (
+    SELECT DISTINCT ON (admission_id) * FROM {SCHEMA}.meal_requests ORDER BY admission_id, created_at DESC
+)
+SELECT {_COLUMNS}
+FROM {SCHEMA}.admissions a
+LEFT JOIN latest_vitals v ON a.id = v.admission_id
+LEFT JOIN latest_iv i ON a.id = i.admission_id
+LEFT JOIN latest_meal m ON a.id = m.admission_id
+WHERE a.status IN ('IN_PROGRESS', 'OBSERVATION')
+ORDER BY a.check_in_at DESC
+"""
+
+NEW_VIEW = f"""
+CREATE VIEW {SCHEMA}.view_new AS
+SELECT {_COLUMNS}
+FROM {SCHEMA}.admissions a
+LEFT JOIN LATERAL (
+    SELECT vs.temperature, vs.recorded_at FROM {SCHEMA}.vital_signs vs
+    WHERE vs.admission_id = a.id ORDER BY vs.recorded_at DESC, vs.id DESC LIMIT 1
+) v ON true
+LEFT JOIN LATERAL (
+    SELECT ir.infusion_rate, ir.photo_url FROM {SCHEMA}.iv_records ir
+    WHERE ir.admission_id = a.id ORDER BY ir.created_at DESC, ir.id DESC LIMIT 1
+) i ON true
+LEFT JOIN LATERAL (
+    SELECT mr.request_type, mr.pediatric_meal_type, mr.guardian_meal_type, mr.created_at FROM {SCHEMA}.meal_requests mr
+    WHERE mr.admission_id = a.id ORDER BY mr.created_at DESC, mr.id DESC LIMIT 1
+) m ON true
+WHERE a.status IN ('IN_PROGRESS', 'OBSERVATION')
+ORDER BY a.check_in_at DESC
+"""
+
+SETUP = f"""
+DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+CREATE SCHEMA {SCHEMA};
+CREATE TABLE {SCHEMA}.admissions (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    patient_name_masked text, room_number text, status text, access_token uuid DEFAULT gen_random_uuid(),
+    dob date, gender text, check_in_at timestamptz, attending_physician text
+);
+CREATE TABLE {SCHEMA}.vital_signs (
+    id bigserial PRIMARY KEY, admission_id uuid, temperature numeric, recorded_at timestamptz
+);
+CREATE TABLE {SCHEMA}.iv_records (
+    id bigserial PRIMARY KEY, admission_id uuid, infusion_rate numeric, photo_url text, created_at timestamptz
+);
+CREATE TABLE {SCHEMA}.meal_requests (
+    id bigserial PRIMARY KEY, admission_id uuid, request_type text, pediatric_meal_type text,
+    guardian_meal_type text, created_at timestamptz
+);
+"""
+
+# (SQL, 인자 이름): 문장마다 자기 $1..$n 만 받음 (asyncpg 는 인자 수·타입이 문장과 정확히 맞아야 함)
+SEED = (
+    (f"""
+INSERT INTO {SCHEMA}.admissions (patient_name_masked, room_number, status, check_in_at)
+SELECT '환*' || g, (300 + g % 100)::text,
+       CASE WHEN g <= $1 THEN 'IN_PROGRESS' ELSE 'DISCHARGED' END,
+       NOW() - (g || ' hours')::interval
+FROM generate_series(1, $1 + $2) g
+""", ("active", "discharged")),
+    (f"""
+INSERT INTO {SCHEMA}.vital_signs (admission_id, temperature, recorded_at)
+SELECT a.id, 36.0 + random() * 3, a.check_in_at + (n || ' hours')::interval
+FROM {SCHEMA}.admissions a, generate_series(1, $1) n
+""", ("vitals_per_admission",)),
+    (f"""
+INSERT INTO {SCHEMA}.iv_records (admission_id, infusion_rate, created_at)
+SELECT a.id, round((20 + n % 40 + random())::numeric, 1), a.check_in_at + (n * 6 || ' hours')::interval
+FROM {SCHEMA}.admissions a, generate_series(1, greatest($1 / 6, 1)) n
+""", ("vitals_per_admission",)),
+    (f"""
+INSERT INTO {SCHEMA}.meal_requests (admission_id, request_type, pediatric_meal_type, guardian_meal_type, created_at)
+SELECT a.id, 'STATION_UPDATE', '일반식', '선택 안함', a.check_in_at + (n * 8 || ' hours')::interval
+FROM {SCHEMA}.admissions a, generate_series(1, greatest($1 / 8, 1)) n
+""", ("vitals_per_admission",)),
+)
+
+INDEXES = f"""
+CREATE INDEX ON {SCHEMA}.vital_signs (admission_id, recorded_at DESC, id DESC);
+CREATE INDEX ON {SCHEMA}.iv_records (admission_id, created_at DESC, id DESC);
+CREATE INDEX ON {SCHEMA}.meal_requests (admission_id, created_at DESC, id DESC);
+CREATE INDEX ON {SCHEMA}.admissions (check_in_at DESC) WHERE status IN ('IN_PROGRESS', 'OBSERVATION');
+ANALYZE {SCHEMA}.admissions; ANALYZE {SCHEMA}.vital_signs; ANALYZE {SCHEMA}.iv_records; ANALYZE {SCHEMA}.meal_requests;
+"""
+
+
+async def seed(conn, args: argparse.Namespace) -> None:
+    """SEED 를 한 트랜잭션으로 실행 (문장마다 필요한 인자만 전달)."""
+    async with conn.transaction():
+        for statement, names in SEED:
+            await conn.execute(statement, *(getattr(args, name) for name in names))
+
+
+async def timed_runs(conn, sql: str, runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await conn.fetch(sql)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def run(args: argparse.Namespace) -> None:
+    if asyncpg is None or not os.getenv("DATABASE_URL"):
+        logger.error("asyncpg and DATABASE_URL are required (pip install asyncpg; local: supabase start)")
+        return
+    conn = await asyncpg.connect(os.environ["DATABASE_URL"])
+    try:
+        await conn.execute(SETUP)
+        started = time.perf_counter()
+        await seed(conn, args)
+        await conn.execute(INDEXES)
+        await conn.execute(OLD_VIEW)
+        await conn.execute(NEW_VIEW)
+        counts = await conn.fetchrow(
+            f"SELECT (SELECT count(*) FROM {SCHEMA}.admissions) AS admissions,"
+            f" (SELECT count(*) FROM {SCHEMA}.vital_signs) AS vitals,"
+            f" (SELECT count(*) FROM {SCHEMA}.iv_records) AS iv,"
+            f" (SELECT count(*) FROM {SCHEMA}.meal_requests) AS meals"
+        )
+        logger.info(f"seeded {dict(counts)} in {time.perf_counter() - started:.1f}s")
+
+        old_rows = await conn.fetch(f"SELECT * FROM {SCHEMA}.view_old")
+        new_rows = await conn.fetch(f"SELECT * FROM {SCHEMA}.view_new")
+        same = [tuple(r) for r in old_rows] == [tuple(r) for r in new_rows]
+        logger.info(f"result rows old={len(old_rows)} new={len(new_rows)} identical={same}")
+
+        for name in ("view_old", "view_new"):
+            sql = f"SELECT * FROM {SCHEMA}.{name}"
+            plan = await conn.fetch(f"EXPLAIN (ANALYZE, BUFFERS) {sql}")
+            logger.info(f"--- {name} plan ---\n" + "\n".join(r[0] for r in plan))
+            await timed_runs(conn, sql, 2)  # 캐시 워밍
+            samples = sorted(await timed_runs(conn, sql, args.runs))
+            logger.info(
+                f"{name:<10} runs={args.runs} p50={samples[len(samples) // 2] * 1000:8.2f}ms "
+                f"max={samples[-1] * 1000:8.2f}ms mean={statistics.mean(samples) * 1000:8.2f}ms"
+            )
+    finally:
+        if not args.keep:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--active", type=int, default=40, help="활성 입원 수")
+    parser.add_argument("--discharged", type=int, default=20000, help="퇴원 입원 수 (이력 규모)")
+    parser.add_argument("--vitals-per-admission", type=int, default=60)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="종료 후 임시 스키마 보존")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
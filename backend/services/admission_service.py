@@ -1,24 +1,50 @@
+import os
+
 from fastapi import HTTPException
+from postgrest.exceptions import APIError
 from supabase import AsyncClient
 from websocket_manager import manager
 
 from logger import logger
-from utils import execute_with_retry_async, mask_name, broadcast_to_station_and_patient, normalize_rpc_result
+from utils import execute_instrumented_async, mask_name, broadcast_to_station_and_patient, normalize_rpc_result
 from models import AdmissionCreate, TransferRequest
+import query_registry
+from change_journal import change_journal
+from admission_directory import admission_directory
+from station_board import station_board, summary_row
+
+# 트리거로 증분 갱신되는 station_board 테이블(view_station_board)에서 목록 조회.
+# 마이그레이션 미적용(PGRST205) 시 view_station_dashboard 로 폴백 (20261021_station_board_table.sql)
+STATION_BOARD_TABLE = os.getenv("STATION_BOARD_TABLE", "false").lower() == "true"
+_board_table_missing = False
+
+
+# 목록 소스 → query_registry 쿼리 이름
+_STATION_QUERIES = {"view_station_dashboard": "station_list", "view_station_board": "station_board_list"}
+
+
+def station_source() -> str:
+    return "view_station_board" if STATION_BOARD_TABLE and not _board_table_missing else "view_station_dashboard"
 
 async def transfer_patient(db: AsyncClient, admission_id: str, req: TransferRequest, ip_address: str = "127.0.0.1"):
     # Call RPC for atomic transfer and audit logging
     try:
-        res = await db.rpc("transfer_patient_transaction", {
+        res = await execute_instrumented_async(db.rpc("transfer_patient_transaction", {
             "p_admission_id": admission_id,
             "p_target_room": req.target_room,
             "p_actor_type": "NURSE",
             "p_ip_address": ip_address
-        }).execute()
+        }))
         
         data = normalize_rpc_result(res)
         if not data:
             raise HTTPException(status_code=400, detail="Transfer failed: No data returned from RPC")
+        # 병실이 바뀌었으므로 캐시된 조회 결과 폐기
+        query_registry.invalidate("admission_broadcast_target")
+        query_registry.invalidate("active_admission_by_token")
+        admission_directory.move(admission_id, data['new_room'])
+        station_board.move(admission_id, data['new_room'])
+        change_journal.record_reset(admission_id)
 
         msg = {
             "type": "ADMISSION_TRANSFERRED",
@@ -36,15 +62,21 @@ async def transfer_patient(db: AsyncClient, admission_id: str, req: TransferRequ
 
 async def discharge_patient(db: AsyncClient, admission_id: str, ip_address: str = "127.0.0.1"):
     try:
-        res = await db.rpc("discharge_patient_transaction", {
+        res = await execute_instrumented_async(db.rpc("discharge_patient_transaction", {
             "p_admission_id": admission_id,
             "p_actor_type": "NURSE",
             "p_ip_address": ip_address
-        }).execute()
+        }))
         
         data = normalize_rpc_result(res)
         if not data:
             raise HTTPException(status_code=400, detail="Discharge failed: No data returned from RPC")
+        # 퇴원한 토큰이 캐시로 계속 유효하지 않도록 폐기
+        query_registry.invalidate("admission_broadcast_target")
+        query_registry.invalidate("active_admission_by_token")
+        admission_directory.remove(admission_id)
+        station_board.remove(admission_id)
+        change_journal.record_reset(admission_id)
 
         msg = {
             "type": "ADMISSION_DISCHARGED",
@@ -62,7 +94,7 @@ async def discharge_patient(db: AsyncClient, admission_id: str, ip_address: str
 async def create_admission(db: AsyncClient, admission: AdmissionCreate, ip_address: str = "127.0.0.1"):
     masked_name = mask_name(admission.patient_name)
     try:
-        res = await db.rpc("create_admission_transaction", {
+        res = await execute_instrumented_async(db.rpc("create_admission_transaction", {
             "p_patient_name_masked": masked_name,
             "p_room_number": admission.room_number,
             "p_dob": admission.dob.isoformat() if admission.dob else None,
@@ -71,7 +103,7 @@ async def create_admission(db: AsyncClient, admission: AdmissionCreate, ip_addre
             "p_actor_type": "NURSE",
             "p_ip_address": ip_address,
             "p_attending_physician": admission.attending_physician or None
-        }).execute()
+        }))
         
         # Use centralized utility for normalized result handling
         data = normalize_rpc_result(res)
@@ -81,6 +113,10 @@ async def create_admission(db: AsyncClient, admission: AdmissionCreate, ip_addre
             raise HTTPException(status_code=500, detail="Admission created but response data is missing or invalid")
             
         logger.info(f"Successfully created admission: {data['id']}")
+        if data.get("access_token"):
+            admission_directory.put(data["id"], data["access_token"], data.get("room_number") or admission.room_number)
+        change_journal.record_reset(data["id"])  # 스테이션 목록 버전 갱신
+        station_board.invalidate()  # 새 행은 뷰에서 다시 적재
         return data
     except HTTPException:
         raise
@@ -102,45 +138,31 @@ async def create_admission(db: AsyncClient, admission: AdmissionCreate, ip_addre
         # Return detail for debugging if 500
         raise HTTPException(status_code=500, detail=f"RPC Error or Model Validation Failed: {error_msg}")
 
-async def list_active_admissions_enriched(db: AsyncClient):
+async def fetch_station_view(db: AsyncClient) -> list[dict]:
     # Use SQL View to fetch pre-calculated dashboard state (No N+1)
     # Order is now handled by the SQL View (ORDER BY check_in_at DESC)
+    global _board_table_missing
+    source = station_source()
     try:
-        res = await execute_with_retry_async(db.table("view_station_dashboard").select("*"))
-        data = res.data or []
+        try:
+            # query_registry: asyncpg 엔진 우선, 비활성/실패 시 PostgREST
+            data = await query_registry.run_query(db, _STATION_QUERIES[source])
+        except APIError as e:
+            if source == "view_station_dashboard" or e.code != "PGRST205":
+                raise
+            _board_table_missing = True
+            logger.warning("view_station_board not found; falling back to view_station_dashboard.")
+            return await fetch_station_view(db)
         # [검증용] 첫 요청 시 빈 배열 원인 추적 (Cold Start / 스키마 캐시 등)
-        logger.info(f"[view_station_dashboard] rows={len(data)}")
-        if getattr(res, "error", None):
-            logger.error(f"[view_station_dashboard] res.error={res.error}")
+        logger.info(f"[{source}] rows={len(data)}")
     except Exception as e:
-        logger.error(f"[view_station_dashboard] fetch failed: {e}", exc_info=True)
+        logger.error(f"[{source}] fetch failed: {e}", exc_info=True)
         raise
+    return data
+
+async def list_active_admissions_enriched(db: AsyncClient):
+    # 스테이션 보드(메모리)에서 응답. 미적재 시에만 view_station_dashboard (또는 view_station_board) 조회
+    data = await station_board.rows(lambda: fetch_station_view(db))
+
+    return [summary_row(item) for item in data]
 
-    enriched = []
-    for item in data:
-        row = {
-            "id": item['id'],
-            "room_number": item['room_number'],
-            "display_name": item.get('display_name') or item.get('patient_name_masked') or "환자",
-            "access_token": item['access_token'],
-            "dob": item['dob'],
-            "gender": item['gender'],
-            "check_in_at": item['check_in_at'],
-            "attending_physician": item.get('attending_physician'),
-            "latest_temp": item['latest_temp'],
-            "last_vital_at": item['last_vital_at'],
-            "had_fever_in_6h": item['had_fever_in_6h'],
-            "latest_iv": {
-                "infusion_rate": item['iv_rate'],
-                "photo_url": item['iv_photo']
-            } if item['iv_rate'] is not None else None,
-            "latest_meal": {
-                "request_type": item['meal_type'],
-                "pediatric_meal_type": item['pediatric_meal_type'],
-                "guardian_meal_type": item['guardian_meal_type'],
-                "created_at": item['meal_requested_at']
-            } if item['meal_type'] is not None else None
-        }
-        enriched.append(row)
-        
-    return enriched
@@ -1,62 +1,63 @@
 import asyncio
-from typing import Any, cast
+import os
+import uuid
+from typing import Any, AsyncIterator, cast
 from fastapi import HTTPException
+from postgrest.exceptions import APIError
 from supabase import AsyncClient
+from logger import logger
 from utils import execute_with_retry_async, create_audit_log
+from admission_directory import admission_directory
+from dashboard_cache import dashboard_cache
+from change_journal import change_journal, UPSERT
+from etag import make_etag
+import read_engine
+from query_registry import SECTION_COLUMNS, run_query
 
-async def fetch_dashboard_data(db: AsyncClient, admission_id: str):
+# get_dashboard_bundle RPC(1회 왕복)로 대시보드 조회. 마이그레이션 미적용(PGRST202) 시 6개 쿼리 경로로 폴백
+DASHBOARD_BUNDLE_RPC = os.getenv("DASHBOARD_BUNDLE_RPC", "false").lower() == "true"
+_bundle_rpc_missing = False
+
+DASHBOARD_SECTIONS = ("admission", "vitals", "iv_records", "meals", "exam_schedules", "document_requests")
+
+def _is_uuid(value: str) -> bool:
+    try:
+        uuid.UUID(value)
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+async def _fetch_bundle_rpc(db: AsyncClient, admission_id: str | None = None, token: str | None = None) -> dict | None:
     """
-    Helper to fetch all related data for a given admission_id in parallel
+    get_dashboard_bundle RPC 로 DashboardResponse 전체를 단일 JSON 으로 조회
+    (비활성/미배포 시 None, 대상 입원이 없으면 {})
     """
-    # Define all query tasks with explicit column selection to optimize payload size
-    tasks = [
-        # 1. Admission Info
-        execute_with_retry_async(
-            db.table("admissions")
-            .select("id,patient_name_masked,room_number,status,discharged_at,access_token,dob,gender,check_in_at,attending_physician")
-            .eq("id", admission_id)
-        ),
-        # 2. Vitals
-        execute_with_retry_async(
-            db.table("vital_signs")
-            .select("id,admission_id,temperature,has_medication,medication_type,recorded_at")
-            .eq("admission_id", admission_id)
-            .order("recorded_at", desc=True)
-            .limit(100)
-        ),
-        # 3. IV Records
-        execute_with_retry_async(
-            db.table("iv_records")
-            .select("id,admission_id,photo_url,infusion_rate,created_at")
-            .eq("admission_id", admission_id)
-            .order("created_at", desc=True)
-            .limit(50)
-        ),
-        # 4. Meal Requests
-        execute_with_retry_async(
-            db.table("meal_requests")
-            .select("id,admission_id,request_type,pediatric_meal_type,guardian_meal_type,requested_pediatric_meal_type,requested_guardian_meal_type,room_note,meal_date,meal_time,status,created_at")
-            .eq("admission_id", admission_id)
-            .order("meal_date", desc=True)
-            .limit(50)
-        ),
-        # 5. Exam Schedules
-        execute_with_retry_async(
-            db.table("exam_schedules")
-            .select("id,admission_id,scheduled_at,name,note")
-            .eq("admission_id", admission_id)
-            .order("scheduled_at")
-        ),
-        # 6. Document Requests (PENDING + COMPLETED 모두 포함. 신청된 서류 섹션에 완료 이력 노출용)
-        execute_with_retry_async(
-            db.table("document_requests")
-            .select("id,admission_id,request_items,status,created_at")
-            .eq("admission_id", admission_id)
-            .order("created_at", desc=True)
-            .limit(10)
+    global _bundle_rpc_missing
+    if not DASHBOARD_BUNDLE_RPC or _bundle_rpc_missing:
+        return None
+    try:
+        res = await execute_with_retry_async(
+            db.rpc("get_dashboard_bundle", {"p_admission_id": admission_id, "p_token": token}),
+            coalesce=True,
         )
-    ]
-    
+    except APIError as e:
+        if e.code != "PGRST202":
+            raise
+        _bundle_rpc_missing = True
+        logger.warning("get_dashboard_bundle RPC not found; falling back to per-section dashboard queries.")
+        return None
+    return cast(dict, res.data) or {}
+
+async def _fetch_rows_postgrest(
+    db: AsyncClient, admission_id: str, sections: tuple[str, ...] = DASHBOARD_SECTIONS
+) -> tuple[list, ...]:
+    """
+    PostgREST 로 섹션별 쿼리(query_registry 의 dashboard_<section>)를 병렬 실행 (sections 순서대로 결과 반환)
+    (동일 admission 동시 조회는 single-flight 로 합쳐지고, 느린 시도는 hedge 대상)
+    """
+    tasks = [run_query(db, f"dashboard_{section}", admission_id=admission_id) for section in sections]
+
     # Execute in parallel
     results = await asyncio.gather(*tasks, return_exceptions=True)
     
@@ -65,42 +66,222 @@ async def fetch_dashboard_data(db: AsyncClient, admission_id: str):
         if isinstance(res, Exception):
             raise res
 
-    adm_res, vitals_res, iv_records_res, meals_res, exam_schedules_res, doc_res = cast(
-        tuple[Any, Any, Any, Any, Any, Any], results
-    )
+    return tuple(results)
 
-    # 1. Info
-    if not adm_res.data:
-        raise HTTPException(status_code=404, detail="Admission not found")
-    admission = adm_res.data[0]
-    
+def _log_view(db: AsyncClient, admission_id: str) -> None:
+    # Fire and forget audit log to avoid blocking response (스냅샷 캐시 hit 도 열람 기록)
+    task = asyncio.create_task(create_audit_log(db, "GUARDIAN", "VIEW", admission_id))
+    task.add_done_callback(lambda t: t.exception() if not t.cancelled() else None)
+
+def _finish_dashboard(db: AsyncClient, data: dict, generation: int) -> dict:
+    admission = data["admission"]
     if "display_name" not in admission or not admission["display_name"]:
         admission["display_name"] = admission.get("patient_name_masked", "환자")
-    
-    # 2. Vitals
-    vitals = vitals_res.data or []
-    
-    # 3. IV Records
-    iv_records = iv_records_res.data or []
-    
-    # 4. Meals
-    meals = meals_res.data or []
 
-    # 5. Exam Schedules
-    exam_schedules = exam_schedules_res.data or []
+    _log_view(db, admission["id"])
+    snapshot = {
+        "admission": admission,
+        "vitals": data.get("vitals") or [],
+        "iv_records": data.get("iv_records") or [],
+        "meals": data.get("meals") or [],
+        "exam_schedules": data.get("exam_schedules") or [],
+        "document_requests": data.get("document_requests") or []
+    }
+    dashboard_cache.put(admission["id"], snapshot, generation)
+    return snapshot
 
-    # 6. Document requests
-    document_requests = doc_res.data or []
+async def fetch_dashboard_data(db: AsyncClient, admission_id: str):
+    """
+    Helper to fetch all related data for a given admission_id in parallel
+    (스냅샷 캐시 hit 이면 DB 조회 없음. DASHBOARD_BUNDLE_RPC=true 면 단일 RPC,
+    DB_READ_ENGINE=asyncpg 면 직접 연결, 둘 다 실패 시 PostgREST 6개 쿼리)
+    """
+    snapshot = dashboard_cache.get(admission_id)
+    if snapshot is not None:
+        _log_view(db, admission_id)
+        return snapshot
 
-    # Fire and forget audit log to avoid blocking response
-    task = asyncio.create_task(create_audit_log(db, "GUARDIAN", "VIEW", admission_id))
-    task.add_done_callback(lambda t: t.exception() if not t.cancelled() else None)
+    generation = dashboard_cache.generation()
+    bundle = await _fetch_bundle_rpc(db, admission_id=admission_id)
+    if bundle is None:
+        rows = await read_engine.fetch_dashboard_rows(admission_id)
+        if rows is None:
+            rows = await _fetch_rows_postgrest(db, admission_id)
+        bundle = dict(zip(DASHBOARD_SECTIONS, rows))
+        bundle["admission"] = bundle["admission"][0] if bundle["admission"] else None
+
+    # 1. Info
+    if not bundle.get("admission"):
+        raise HTTPException(status_code=404, detail="Admission not found")
+    return _finish_dashboard(db, bundle, generation)
+
+async def stream_dashboard_sections(db: AsyncClient, admission_id: str) -> AsyncIterator[dict]:
+    """
+    섹션 쿼리가 끝나는 순서대로 {"section", "data"} 를 하나씩 내보냄 (admission 항상 먼저).
+    실패한 섹션은 {"section", "error"} 로 알리고 나머지는 계속 진행, 마지막 줄은 {"done", "cursor", "errors"}.
+    스냅샷 캐시 hit 이면 캐시에서 바로 내보내고, 모든 섹션이 성공했을 때만 캐시에 저장.
+    (번들 RPC/asyncpg 는 한 번에 전체를 받으므로 이 경로는 PostgREST 섹션별 쿼리만 사용)
+    """
+    cursor = change_journal.version(admission_id)
+    snapshot = dashboard_cache.get(admission_id)
+    if snapshot is not None:
+        _log_view(db, admission_id)
+        for section in DASHBOARD_SECTIONS:
+            yield {"section": section, "data": snapshot[section]}
+        yield {"done": True, "cursor": cursor, "errors": []}
+        return
+
+    generation = dashboard_cache.generation()
+    tasks = {
+        asyncio.ensure_future(run_query(db, f"dashboard_{section}", admission_id=admission_id)): section
+        for section in DASHBOARD_SECTIONS
+    }
+    results: dict[str, Any] = {}
+    errors: list[str] = []
+    try:
+        admission_task = next(iter(tasks))
+        await asyncio.wait([admission_task])
+        ready, pending = [admission_task], set(tasks) - {admission_task}
+        while True:
+            for task in ready:
+                section = tasks[task]
+                if task.exception() is not None:
+                    logger.warning(f"[dashboard stream] section '{section}' failed for {admission_id}: {task.exception()}")
+                    errors.append(section)
+                    yield {"section": section, "error": type(task.exception()).__name__}
+                    continue
+                rows = task.result()
+                if section == "admission":
+                    if not rows:  # 스트림 시작 후라 상태 코드 대신 오류 줄로 종료
+                        yield {"section": section, "error": "Admission not found"}
+                        yield {"done": True, "cursor": cursor, "errors": [section]}
+                        return
+                    rows = rows[0]
+                    rows["display_name"] = rows.get("display_name") or rows.get("patient_name_masked", "환자")
+                    _log_view(db, admission_id)
+                results[section] = rows
+                yield {"section": section, "data": rows}
+            if not pending:
+                break
+            ready, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:  # 클라이언트 연결이 끊기거나 조기 종료하면 남은 쿼리 취소
+            if not task.done():
+                task.cancel()
+
+    if not errors:
+        dashboard_cache.put(admission_id, {section: results[section] for section in DASHBOARD_SECTIONS}, generation)
+    yield {"done": True, "cursor": cursor, "errors": errors}
+
+async def fetch_dashboard_data_by_token(db: AsyncClient, token: str):
+    """
+    보호자 토큰(활성 입원만)으로 대시보드 조회.
+    번들 RPC 가 켜져 있으면 토큰 확인까지 1회 왕복, 아니면 토큰 조회 후 fetch_dashboard_data
+    """
+    snapshot = dashboard_cache.get_by_token(token)
+    if snapshot is not None:
+        _log_view(db, snapshot["admission"]["id"])
+        return snapshot
+
+    generation = dashboard_cache.generation()
+    bundle = None
+    if _is_uuid(token):  # UUID 형식이 아니면 RPC 인자 변환 오류 대신 기존 조회 경로로 판정
+        bundle = await _fetch_bundle_rpc(db, token=token)
+    if bundle is not None:
+        if not bundle.get("admission"):
+            raise HTTPException(status_code=404, detail="Invalid or inactive admission token")
+        return _finish_dashboard(db, bundle, generation)
+
+    # Enforce active status (admission_directory: 활성 입원만)
+    return await fetch_dashboard_data(db, await resolve_admission_id(db, token))
+
+
+async def resolve_admission_id(db: AsyncClient, token: str) -> str:
+    """보호자 토큰 → 활성 입원 id (admission_directory)."""
+    entry = await admission_directory.by_token(db, token)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Invalid or inactive admission token")
+    return entry["id"]
+
+def dashboard_etag(admission_id: str, sections: tuple[str, ...] | None = None) -> str:
+    """입원 단위 데이터 버전 기반 ETag (스냅샷 캐시 TTL 구간마다 갱신). 부분 응답은 섹션 조합별로 구분"""
+    return make_etag("dashboard", admission_id, change_journal.version(admission_id), *(sections or ()),
+                     bucket_seconds=dashboard_cache.ttl)
+
+def parse_sections(value: str | None) -> tuple[str, ...] | None:
+    """
+    ?sections=vitals,iv_records -> DASHBOARD_SECTIONS 순서의 튜플.
+    미지정이거나 전체 섹션이면 None (기존 전체 조회 경로), 알 수 없는 섹션은 400
+    """
+    if not value:
+        return None
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = sorted(names.difference(DASHBOARD_SECTIONS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown dashboard sections: {', '.join(unknown)}")
+    if not names or names == set(DASHBOARD_SECTIONS):
+        return None
+    return tuple(section for section in DASHBOARD_SECTIONS if section in names)
+
+async def fetch_dashboard_sections(db: AsyncClient, admission_id: str, sections: tuple[str, ...]) -> dict:
+    """
+    요청한 섹션의 쿼리만 실행한 부분 대시보드 (DashboardSections 형식).
+    조회하지 않은 섹션은 빈 목록이 아니라 None 이며 omitted 에 이름이 들어감.
+    스냅샷 캐시 hit 이면 캐시에서 잘라 반환하고, 부분 결과는 캐시에 저장하지 않음
+    """
+    data = dashboard_cache.get(admission_id)
+    if data is None:
+        wanted = sections
+        # admission 섹션을 요청하지 않았어도 존재하지 않는 입원은 404 (활성 입원은 디렉터리로 확인, 그 외만 PK 조회)
+        if "admission" not in sections and await admission_directory.by_id(db, admission_id) is None:
+            wanted = ("admission", *sections)
+        data = dict(zip(wanted, await _fetch_rows_postgrest(db, admission_id, wanted)))
+        if "admission" in data:
+            if not data["admission"]:
+                raise HTTPException(status_code=404, detail="Admission not found")
+            admission = data["admission"][0]
+            admission["display_name"] = admission.get("patient_name_masked", "환자")
+            data["admission"] = admission
+
+    _log_view(db, admission_id)
+    return {
+        **{section: data[section] if section in sections else None for section in DASHBOARD_SECTIONS},
+        "omitted": [section for section in DASHBOARD_SECTIONS if section not in sections],
+    }
+
+async def fetch_dashboard_delta(db: AsyncClient, token: str, since: str) -> dict:
+    """
+    since 커서 이후 변경분만 반환 (섹션별 추가/수정 행 + deleted 의 섹션별 삭제 id, 새 cursor).
+    커서가 만료·무효이거나 전동/퇴원 등 섹션 단위로 표현할 수 없는 변경이 있으면 reset=True 와 전체 데이터.
+    """
+    cursor = change_journal.cursor()
+    admission_id = await resolve_admission_id(db, token)
+
+    changes = change_journal.changes_since(since, admission_id)
+    if changes is None:
+        return {**await fetch_dashboard_data(db, admission_id), "cursor": cursor, "reset": True, "deleted": {}}
+
+    admission = None
+    upserted: dict[str, dict] = {section: {} for section in DASHBOARD_SECTIONS[1:]}
+    deleted: dict[str, set] = {section: set() for section in DASHBOARD_SECTIONS[1:]}
+    for change in changes:  # 기록 순서대로 적용: 같은 행은 마지막 변경이 우선
+        if change.section == "admission":  # 입원 정보 수정 (시딩의 check_in_at 등)
+            admission = {c: change.row.get(c) for c in SECTION_COLUMNS["admission"].split(",")}
+            admission["display_name"] = admission.get("patient_name_masked") or "환자"
+        elif change.op == UPSERT:
+            columns = SECTION_COLUMNS[change.section].split(",")
+            upserted[change.section][change.row["id"]] = {c: change.row.get(c) for c in columns}
+            deleted[change.section].discard(change.row["id"])
+        else:
+            upserted[change.section].pop(change.row, None)
+            deleted[change.section].add(change.row)
+    if changes:
+        _log_view(db, admission_id)
 
     return {
+        "cursor": cursor,
+        "reset": False,
         "admission": admission,
-        "vitals": vitals,
-        "iv_records": iv_records,
-        "meals": meals,
-        "exam_schedules": exam_schedules,
-        "document_requests": document_requests
+        **{section: list(rows.values()) for section, rows in upserted.items()},
+        "deleted": {section: sorted(ids) for section, ids in deleted.items() if ids},
     }
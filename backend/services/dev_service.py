@@ -1,10 +1,15 @@
 import random
 import asyncio
-import json
+import fastjson
 from datetime import datetime, date, timedelta, timezone
 from supabase import AsyncClient
 from websocket_manager import manager
-from utils import execute_with_retry_async, broadcast_to_station_and_patient, normalize_rpc_result, mask_name
+import query_registry
+from change_journal import change_journal
+from admission_directory import admission_directory
+from station_board import station_board
+from query_registry import SECTION_COLUMNS
+from utils import execute_with_retry_async, execute_instrumented_async, normalize_rpc_result, mask_name
 
 async def discharge_all(db: AsyncClient):
     """
@@ -12,41 +17,53 @@ async def discharge_all(db: AsyncClient):
     모든 활성 환자를 퇴원 처리합니다.
     """
     # RPC 호출 (admissions 테이블 직접 수정 대신 사용)
-    res = await db.rpc("discharge_all_transaction", {
+    res = await execute_instrumented_async(db.rpc("discharge_all_transaction", {
         "p_actor_type": "NURSE",
         "p_ip_address": "127.0.0.1"
-    }).execute()
+    }))
     
     # RPC 결과에서 업데이트된 행 수 추출 (Python SDK execute() 결과 대응)
     raw_data = res.data
     data_dict = raw_data if isinstance(raw_data, dict) else None
     updated_count: int = data_dict.get('count', 0) if data_dict else 0
+    query_registry.invalidate()
+    admission_directory.clear()
+    change_journal.record_reset()
     
     if updated_count > 0:
-        import json
         # 웹소켓을 통해 프론트엔드에 즉시 갱신 신호 전송
-        await manager.broadcast_all(json.dumps({
+        await manager.broadcast_all(fastjson.dumps({
             "type": "ADMISSION_DISCHARGED",
             "data": {"message": f"Total {updated_count} patients discharged."}
         }))
     
     return {"count": updated_count, "message": "All active patients discharged successfully."}
 
+async def _fetch_seeded_meals(db: AsyncClient, admission_ids: list[str], entries: list[dict]) -> list[dict]:
+    # upsert_meal_requests_admin 은 결과를 반환하지 않으므로 시딩한 날짜의 행을 다시 조회 (id·created_at 포함)
+    res = await execute_with_retry_async(
+        db.table("meal_requests")
+        .select(SECTION_COLUMNS["meals"])
+        .in_("admission_id", admission_ids)
+        .in_("meal_date", sorted({e["meal_date"] for e in entries}))
+    )
+    return res.data or []
+
 async def seed_patient_data(db: AsyncClient, admission_id: str):
     now = datetime.now(timezone.utc)
     start_time = now - timedelta(hours=72)
     
-    await execute_with_retry_async(
+    adm_update = await execute_with_retry_async(
         db.table("admissions").update({"check_in_at": start_time.isoformat()}).eq("id", admission_id)
     )
 
     # Idempotency: Clear existing seeded data to prevent duplication
-    await asyncio.gather(
-        execute_with_retry_async(db.table("vital_signs").delete().eq("admission_id", admission_id)),
-        execute_with_retry_async(db.table("iv_records").delete().eq("admission_id", admission_id)),
-        execute_with_retry_async(db.table("exam_schedules").delete().eq("admission_id", admission_id)),
-        execute_with_retry_async(db.table("meal_requests").delete().eq("admission_id", admission_id))
-    )
+    seeded_tables = (("vitals", "vital_signs"), ("iv_records", "iv_records"),
+                     ("exam_schedules", "exam_schedules"), ("meals", "meal_requests"))
+    deleted = await asyncio.gather(*(
+        execute_with_retry_async(db.table(table).delete().eq("admission_id", admission_id))
+        for _, table in seeded_tables
+    ))
 
     vitals = []
     for i in range(19):
@@ -61,24 +78,22 @@ async def seed_patient_data(db: AsyncClient, admission_id: str):
             "medication_type": "A" if temp >= 38.0 else None,
             "recorded_at": rec_time.isoformat()
         })
-    await execute_with_retry_async(db.table("vital_signs").insert(vitals))  # type: ignore[arg-type]
+    vital_res = await execute_with_retry_async(db.table("vital_signs").insert(vitals))  # type: ignore[arg-type]
     
     ivs = [
         {"admission_id": admission_id, "infusion_rate": 40, "photo_url": "https://images.unsplash.com/photo-1516549655169-df83a0774514?w=400", "created_at": (start_time + timedelta(hours=1)).isoformat()},
         {"admission_id": admission_id, "infusion_rate": 40, "photo_url": "https://images.unsplash.com/photo-1516549655169-df83a0774514?w=400", "created_at": (now - timedelta(minutes=30)).isoformat()}
     ]
-    await execute_with_retry_async(db.table("iv_records").insert(ivs))  # type: ignore[arg-type]
+    iv_res = await execute_with_retry_async(db.table("iv_records").insert(ivs))  # type: ignore[arg-type]
     
     exams = [
         {"admission_id": admission_id, "scheduled_at": (now + timedelta(hours=2)).isoformat(), "name": "오전 X-ray (Dev)", "note": "가상 데이터"},
         {"admission_id": admission_id, "scheduled_at": (now + timedelta(hours=5)).isoformat(), "name": "오후 혈액검사 (Dev)", "note": "가상 데이터"}
     ]
-    await execute_with_retry_async(db.table("exam_schedules").insert(exams))
+    exam_res = await execute_with_retry_async(db.table("exam_schedules").insert(exams))
 
     adm_res = await execute_with_retry_async(db.table("admissions").select("access_token, room_number").eq("id", admission_id).single())
     if adm_res.data:
-        token = adm_res.data['access_token']
-        
         # 3일치 랜덤 식단 데이터 생성 (오늘 ~ 내레)
         meal_times = ["BREAKFAST", "LUNCH", "DINNER"]
         pediatric_types = ["일반식", "죽1", "죽2", "죽3"]
@@ -104,18 +119,26 @@ async def seed_patient_data(db: AsyncClient, admission_id: str):
                 })
         
         await execute_with_retry_async(db.rpc("upsert_meal_requests_admin", {"p_meals": meal_entries}))
+        meals = await _fetch_seeded_meals(db, [admission_id], meal_entries)
+    else:
+        meals = []
+
+    # 과거 시각 데이터 일괄 삽입: 스테이션 행은 뷰에서 이 입원만 다시 읽어 교체
+    view_res = await execute_with_retry_async(db.table("view_station_dashboard").select("*").eq("id", admission_id))
+    if view_res.data:
+        station_board.put(view_res.data[0])
+
+    # 바뀐 행을 한 번에 기록 -> 같은 틱의 PATCH 하나로 전송 (전체 재조회 신호 불필요)
+    if adm_update.data:
+        change_journal.record_upsert(admission_id, "admission", adm_update.data[0])
+    for (section, _), res in zip(seeded_tables, deleted):
+        for row in res.data or []:
+            change_journal.record_delete(admission_id, section, row["id"])
+    for section, rows in (("vitals", vital_res.data), ("iv_records", iv_res.data),
+                          ("exam_schedules", exam_res.data), ("meals", meals)):
+        for row in rows or []:
+            change_journal.record_upsert(admission_id, section, row)
 
-        # 개별 브로드캐스트 제거 (REFRESH_DASHBOARD가 전체 데이터를 갱신하므로 불필요한 시각적 깜빡임 방지)
-        # 1. NEW_VITAL 제거
-        # 2. NEW_IV 제거
-        # 3. NEW_EXAM_SCHEDULE 제거 (이미 이전 수정에서 제거됨)
-        
-        # 전체 데이터 갱신을 지시하는 신호 전송
-        await broadcast_to_station_and_patient(manager, {
-            "type": "REFRESH_DASHBOARD",
-            "data": {"admission_id": admission_id}
-        }, token)
-    
     return {"message": "Seeded successfully"}
 
 async def seed_all_meals(db: AsyncClient):
@@ -159,11 +182,8 @@ async def seed_all_meals(db: AsyncClient):
                 
     if meal_records:
         await execute_with_retry_async(db.rpc("upsert_meal_requests_admin", {"p_meals": meal_records}))
-        # 모든 클라이언트(Station, Guardian 등)에게 대시보드 갱신 트리거 전송
-        await manager.broadcast_all(json.dumps({
-            "type": "REFRESH_DASHBOARD",
-            "data": {"admission_id": "ALL"}
-        }))
+        for row in await _fetch_seeded_meals(db, [adm['id'] for adm in admissions], meal_records):
+            change_journal.record_upsert(row["admission_id"], "meals", row)
         return {"message": f"성공: {len(admissions)}명의 환자에게 총 {len(meal_records)}개의 식단 데이터가 시딩되었습니다."}
     
     return {"message": "생성된 데이터가 없습니다."}
@@ -200,7 +220,7 @@ async def seed_single_patient(db: AsyncClient):
     dummy_dob = date(birth_year, random.randint(1, 12), random.randint(1, 28))
     
     # create_admission_transaction은 {id, access_token}을 반환함
-    adm_res = await db.rpc("create_admission_transaction", {
+    adm_res = await execute_instrumented_async(db.rpc("create_admission_transaction", {
         "p_patient_name_masked": dummy_name_masked,
         "p_room_number": target_room,
         "p_dob": dummy_dob.isoformat(),
@@ -209,13 +229,15 @@ async def seed_single_patient(db: AsyncClient):
         "p_actor_type": "SYSTEM",
         "p_ip_address": "127.0.0.1",
         "p_attending_physician": random.choice(["조요셉", "김종률", "원유종", "이승주"])
-    }).execute()
+    }))
     
     data = normalize_rpc_result(adm_res)
     if not data or not data.get("id"):
         return {"error": "더미 환자 생성 실패"}
         
     admission_id = data["id"]
+    if data.get("access_token"):
+        admission_directory.put(admission_id, data["access_token"], target_room)
     
     # 4. 데이터 시딩 (이미 구현된 로직 재사용)
     await seed_patient_data(db, admission_id)
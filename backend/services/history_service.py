@@ -0,0 +1,109 @@
+import base64
+import json
+import os
+from datetime import datetime
+from typing import AsyncIterator
+from fastapi import HTTPException
+from supabase import AsyncClient
+import fastjson
+from utils import execute_with_retry_async
+from query_registry import SECTION_COLUMNS
+from downsample import downsample_indices, peak_indices
+
+# 대시보드(최근 100/50건) 밖의 과거 이력은 (시각, id) keyset 페이지로 조회. OFFSET 없이 인덱스 범위 스캔만 사용
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "100"))
+HISTORY_MAX_PAGE_SIZE = int(os.getenv("HISTORY_MAX_PAGE_SIZE", "500"))
+
+# 체온 차트 다운샘플링: 이 온도 이상의 국소 최댓값(발열 피크)과 투약 기록은 항상 유지
+FEVER_THRESHOLD = 38.0
+SERIES_DEFAULT_WIDTH = int(os.getenv("VITALS_SERIES_DEFAULT_WIDTH", "600"))
+SERIES_MAX_WIDTH = 4000
+# 체온 시계열 조회 1회당 행 수. PostgREST db-max-rows(Supabase 기본 1000) 이하로 설정
+SERIES_FETCH_ROWS = int(os.getenv("VITALS_SERIES_FETCH_ROWS", "1000"))
+
+# 섹션 -> (테이블, 정렬 시각 컬럼)
+HISTORY_SOURCES = {
+    "vitals": ("vital_signs", "recorded_at"),
+    "iv_records": ("iv_records", "created_at"),
+}
+
+
+def encode_cursor(ts: str, row_id: int) -> str:
+    raw = json.dumps([ts, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    """불투명 커서 -> (시각, id). 형식이 맞지 않으면 400."""
+    try:
+        ts, row_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(ts, str) or '"' in ts or not isinstance(row_id, int):
+            raise ValueError(cursor)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid history cursor")
+    return ts, row_id
+
+
+def page_size(limit: int | None) -> int:
+    return max(1, min(limit or HISTORY_PAGE_SIZE, HISTORY_MAX_PAGE_SIZE))
+
+
+async def fetch_history_page(
+    db: AsyncClient, section: str, admission_id: str, cursor: str | None = None, limit: int | None = None
+) -> dict:
+    """
+    최신순 한 페이지와 다음 페이지 커서(next_cursor, 마지막 페이지면 None) 반환.
+    limit+1 건을 조회해 다음 페이지 존재 여부를 별도 count 없이 판정
+    """
+    table, ts_column = HISTORY_SOURCES[section]
+    size = page_size(limit)
+    query = db.table(table).select(SECTION_COLUMNS[section]).eq("admission_id", admission_id)
+    if cursor:
+        ts, row_id = decode_cursor(cursor)
+        query = query.or_(f'{ts_column}.lt."{ts}",and({ts_column}.eq."{ts}",id.lt.{row_id})')
+    query = query.order(ts_column, desc=True).order("id", desc=True).limit(size + 1)
+
+    res = await execute_with_retry_async(query, coalesce=True)
+    rows = res.data or []
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor(rows[-1][ts_column], rows[-1]["id"])
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+async def iter_history_json(page: dict) -> AsyncIterator[bytes]:
+    """페이지를 행 단위로 직렬화해 흘려보냄 (큰 페이지도 응답 본문 전체를 한 번에 만들지 않음)."""
+    yield b'{"items":['
+    for i, row in enumerate(page["items"]):
+        yield (b"," if i else b"") + fastjson.dumpb(row)
+    yield b'],"next_cursor":' + fastjson.dumpb(page["next_cursor"]) + b"}"
+
+
+async def fetch_temperature_series(db: AsyncClient, admission_id: str, width: int | None = None) -> dict:
+    """
+    재원 전체 체온 기록을 차트 폭(width 점)에 맞게 다운샘플링 (시간 오름차순).
+    발열 피크와 투약(has_medication) 점은 폭과 무관하게 포함되므로 points 가 width 를 조금 넘을 수 있음.
+    (admission_id, recorded_at, id) 인덱스 순서로 바로 읽는 오름차순 쿼리 1회. 기록이 SERIES_FETCH_ROWS 건을
+    넘는 재원만 max-rows 로 잘린 지점부터 이어 읽으므로 왕복 수는 ceil(전체 건수 / SERIES_FETCH_ROWS).
+    """
+    width = max(3, min(width or SERIES_DEFAULT_WIDTH, SERIES_MAX_WIDTH))
+    rows: list[dict] = []
+    while True:
+        query = db.table("vital_signs").select(SECTION_COLUMNS["vitals"]).eq("admission_id", admission_id)
+        if rows:
+            ts, row_id = rows[-1]["recorded_at"], rows[-1]["id"]
+            query = query.or_(f'recorded_at.gt."{ts}",and(recorded_at.eq."{ts}",id.gt.{row_id})')
+        res = await execute_with_retry_async(
+            query.order("recorded_at").order("id").limit(SERIES_FETCH_ROWS), coalesce=True
+        )
+        chunk = res.data or []
+        rows += chunk
+        if len(chunk) < SERIES_FETCH_ROWS:
+            break
+
+    x = [datetime.fromisoformat(str(r["recorded_at"]).replace("Z", "+00:00")).timestamp() for r in rows]
+    y = [float(r["temperature"]) for r in rows]
+    keep = [i for i, r in enumerate(rows) if r.get("has_medication")] + peak_indices(y, FEVER_THRESHOLD)
+    indices = downsample_indices(x, y, width, keep)
+    return {"total": len(rows), "width": width, "points": [rows[i] for i in indices]}
@@ -7,6 +7,8 @@ from supabase import AsyncClient
 from websocket_manager import manager
 from utils import execute_with_retry_async, create_audit_log, broadcast_to_station_and_patient
 from models import IVRecordCreate
+from admission_directory import admission_directory
+from change_journal import change_journal
 
 async def record_iv(db: AsyncClient, iv: IVRecordCreate):
     data = iv.model_dump()
@@ -16,11 +18,12 @@ async def record_iv(db: AsyncClient, iv: IVRecordCreate):
         raise HTTPException(status_code=500, detail="Failed to save IV record")
         
     new_iv = response.data[0]
+    change_journal.record_upsert(iv.admission_id, "iv_records", new_iv)
     
     async def post_record():
-        adm_res = await execute_with_retry_async(db.table("admissions").select("access_token, room_number").eq("id", iv.admission_id).single())
-        token = adm_res.data.get('access_token') if adm_res.data else None
-        room = adm_res.data.get('room_number') if adm_res.data else None
+        entry = await admission_directory.by_id(db, iv.admission_id)
+        token = entry['access_token'] if entry else None
+        room = entry['room_number'] if entry else None
         
         msg = {
             "type": "NEW_IV",
@@ -64,9 +67,8 @@ async def upload_iv_photo(db: AsyncClient, file: UploadFile, token: str | None):
         
     image_url = f"/static/{filename}"
     
-    res = await execute_with_retry_async(db.table("admissions").select("id, room_number").eq("access_token", token))
-    if res.data:
-        adm = res.data[0]
+    adm = await admission_directory.by_token(db, token)
+    if adm:
         await create_audit_log(db, "MOBILE_USER", "UPLOAD_PHOTO", adm['id'])
         msg = {
             "type": "IV_PHOTO_UPLOADED",
@@ -8,6 +8,8 @@ from utils import execute_with_retry_async, broadcast_to_station_and_patient, is
 from models import MealRequestCreate
 from schemas import CommonMealPlan, PatientMealOverrideCreate
 from services.station_service import format_meal_notification_data
+from change_journal import change_journal
+from admission_directory import admission_directory
 
 async def get_meal_plans(db: AsyncClient, start_date: date, end_date: date):
     res = await execute_with_retry_async(
@@ -83,22 +85,21 @@ async def upsert_meal_request(db: AsyncClient, req: MealRequestCreate):
             new_req_data = upsert_res.data[0] if upsert_res and upsert_res.data else None
         else:
             raise e
+    if new_req_data:
+        change_journal.record_upsert(req.admission_id, "meals", new_req_data)
+    else:
+        change_journal.record_reset(req.admission_id)
 
     if new_req_data:
         async def broadcast():
             try:
-                adm_res = await asyncio.wait_for(
-                    execute_with_retry_async(
-                        db.table("admissions").select("access_token, room_number").eq("id", req.admission_id).single()
-                    ),
-                    timeout=10.0
-                )
-                if adm_res.data:
+                adm = await asyncio.wait_for(admission_directory.by_id(db, req.admission_id), timeout=10.0)
+                if adm:
                     msg = {
                         "type": "NEW_MEAL_REQUEST",
                         "data": {
                             "id": new_req_data['id'],
-                            "room": adm_res.data.get("room_number"),
+                            "room": adm["room_number"],
                             "admission_id": req.admission_id,
                             "request_type": req.request_type,
                             "meal_date": req.meal_date.isoformat(),
@@ -110,7 +111,7 @@ async def upsert_meal_request(db: AsyncClient, req: MealRequestCreate):
                             "content": f"[{format_meal_notification_data(new_req_data)['date_label']} {format_meal_notification_data(new_req_data)['time_label']}] 식단 신청 ({format_meal_notification_data(new_req_data)['meal_desc']})"
                         }
                     }
-                    await broadcast_to_station_and_patient(manager, msg, adm_res.data.get("access_token"))
+                    await broadcast_to_station_and_patient(manager, msg, adm["access_token"])
             except asyncio.TimeoutError:
                 get_logger().warning("Meal broadcast timed out after 10s")
             except Exception as be:
@@ -0,0 +1,106 @@
+"""
+Single-flight: 동시에 들어온 동일한 읽기 쿼리를 하나의 PostgREST 호출로 합칩니다.
+
+PATCH reset(전체 만료) 직후처럼 모든 스테이션 탭·보호자 단말이 같은 쿼리를
+동시에 재요청하는 상황(refresh storm)에서 DB 부하를 1회 호출로 줄이기 위한 용도입니다.
+첫 호출자(leader)의 결과를 나머지 대기자(follower)에게 복사본으로 전달합니다.
+
+공유 호출은 요청 데드라인(deadline.py)이 없는 컨텍스트에서 실행되고, 각 대기자는 자기 예산만큼만
+기다립니다. 예산이 짧은 leader 때문에 예산이 긴 follower 가 DeadlineExceeded 를 받지 않습니다.
+모든 대기자가 떠나면 공유 호출을 취소합니다.
+"""
+import asyncio
+import contextvars
+import copy
+import os
+from typing import Any, Awaitable, Callable, Hashable
+
+import deadline
+from deadline import DeadlineExceeded
+
+SINGLE_FLIGHT_ENABLED = os.getenv("DB_SINGLE_FLIGHT", "true").lower() == "true"
+
+
+def query_key(query_builder) -> tuple | None:
+    """
+    postgrest 빌더(및 fake_supabase)의 request 설정으로부터 쿼리 식별 키를 만듭니다.
+    GET(읽기) 요청이 아니거나 키를 만들 수 없으면 None (합치지 않음).
+    """
+    req = getattr(query_builder, "request", None)
+    if req is None or getattr(req, "http_method", None) != "GET":
+        return None
+    headers = getattr(req, "headers", None) or {}
+    return (str(req.path), str(req.params), headers.get("Accept"))
+
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._waiters: dict[asyncio.Task, int] = {}
+        self.leaders = 0
+        self.collapsed = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        is_leader = task is None
+        if is_leader:
+            # 호출자 취소가 공유 호출을 중단시키지 않도록 별도 태스크로 실행.
+            # leader 의 데드라인은 공유 호출에 물려주지 않음 (대기자마다 자기 예산으로 기다림)
+            context = contextvars.copy_context()
+            context.run(deadline.clear)
+            task = asyncio.create_task(fn(), context=context)
+            self._inflight[key] = task
+            self.leaders += 1
+            task.add_done_callback(lambda t: self._release(key, t))
+        else:
+            self.collapsed += 1
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            result = await self._wait(task)
+        finally:
+            self._leave(key, task)
+        # follower 는 복사본을 받음 (서비스 계층이 응답 dict 를 가공하므로 공유 시 오염 방지)
+        return result if is_leader else copy.deepcopy(result)
+
+    async def _wait(self, task: asyncio.Task) -> Any:
+        """현재 요청의 남은 예산 안에서 공유 호출 결과를 기다림."""
+        budget_left = deadline.remaining()
+        if budget_left is None:
+            return await asyncio.shield(task)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout=max(0.0, budget_left))
+        except asyncio.TimeoutError:
+            if task.done():
+                raise  # 공유 호출 자체의 TimeoutError
+            raise DeadlineExceeded(deadline.route_class() or "unknown", "single-flight wait") from None
+
+    def _leave(self, key: Hashable, task: asyncio.Task) -> None:
+        left = self._waiters.get(task, 1) - 1
+        if left > 0:
+            self._waiters[task] = left
+            return
+        self._waiters.pop(task, None)
+        if not task.done():
+            # 결과를 기다리는 요청이 없음: 취소하고, 새 호출자가 취소 중인 태스크에 합류하지 않도록 즉시 해제
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+            task.cancel()
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        self._waiters.pop(task, None)
+        if not task.cancelled():
+            task.exception()  # 모든 대기자가 취소된 경우 미회수 예외 경고 방지
+
+    def stats(self) -> dict:
+        return {
+            "enabled": SINGLE_FLIGHT_ENABLED,
+            "leaders": self.leaders,
+            "collapsed": self.collapsed,
+            "inflight": len(self._inflight),
+        }
+
+
+single_flight = SingleFlight()
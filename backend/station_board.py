@@ -0,0 +1,272 @@
+"""
+스테이션 보드 상태 저장소 (프로세스 메모리, 이벤트 반영).
+
+스테이션 목록(view_station_dashboard)은 매 조회마다 활성 입원별 최신 vital_signs·iv_records·meal_requests 를
+다시 조회합니다. 보드는 뷰 결과를 한 번 적재한 뒤 쓰기 경로의 도메인 이벤트로 행을 직접 갱신해 메모리에서 응답합니다.
+- 활력징후·수액·식사 기록: change_journal 의 UPSERT 가 apply_change 로 전달됩니다 (NEW_VITAL / NEW_IV / NEW_MEAL_REQUEST 등).
+- 입원 생애주기: 전동 move, 퇴원 remove, 신규 입원은 invalidate (다음 조회 때 뷰 재적재), 시딩은 단건 뷰 행으로 put.
+- 다른 인스턴스·직접 DB 수정에 대비해 STATION_BOARD_RECONCILE_SECONDS 마다 뷰와 대조(reconcile)해 드리프트를 기록하고 교체합니다.
+STATION_BOARD_TABLE=true 면 적재·대조 원본은 트리거로 유지되는 station_board 테이블(view_station_board)입니다.
+"""
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+import metrics
+from logger import logger
+
+FEVER_THRESHOLD = 38.0
+FEVER_WINDOW = timedelta(hours=6)
+
+Fetch = Callable[[], Awaitable[list[dict]]]
+
+
+def _ts(value: Any) -> datetime | None:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _newer(candidate: Any, current: Any) -> bool:
+    """candidate 시각이 current 이상이면 True (current 를 알 수 없으면 새 이벤트를 최신으로 간주)."""
+    new, cur = _ts(candidate), _ts(current)
+    return cur is None or (new is not None and new >= cur)
+
+
+def _comparable(row: dict) -> dict:
+    # 시간에 따라 바뀌는 had_fever_in_6h 는 제외, 시각은 표기 차이(Z/+00:00) 무시
+    return {k: (_ts(v) or v) if k.endswith("_at") else v for k, v in row.items() if k != "had_fever_in_6h"}
+
+
+def _event_key(name: str, args: tuple) -> str:
+    """보드 이벤트가 건드린 입원 id (_put 은 행 전체, 나머지는 첫 인자가 id)."""
+    return str(args[0]["id"]) if name == "_put" else args[0]
+
+
+def summary_row(item: dict) -> dict:
+    """뷰 행 → 스테이션 목록 응답 행 (GET /admissions, 스테이션 PATCH 공용)."""
+    return {
+        "id": item['id'],
+        "room_number": item['room_number'],
+        "display_name": item.get('display_name') or item.get('patient_name_masked') or "환자",
+        "access_token": item['access_token'],
+        "dob": item['dob'],
+        "gender": item['gender'],
+        "check_in_at": item['check_in_at'],
+        "attending_physician": item.get('attending_physician'),
+        "latest_temp": item['latest_temp'],
+        "last_vital_at": item['last_vital_at'],
+        "had_fever_in_6h": item['had_fever_in_6h'],
+        "latest_iv": {
+            "infusion_rate": item['iv_rate'],
+            "photo_url": item['iv_photo']
+        } if item['iv_rate'] is not None else None,
+        "latest_meal": {
+            "request_type": item['meal_type'],
+            "pediatric_meal_type": item['pediatric_meal_type'],
+            "guardian_meal_type": item['guardian_meal_type'],
+            "created_at": item['meal_requested_at']
+        } if item['meal_type'] is not None else None
+    }
+
+
+class StationBoard:
+    def __init__(self, reconcile_interval: float = 60.0, enabled: bool = True):
+        self.reconcile_interval = reconcile_interval
+        self.enabled = enabled
+        self._rows: dict[str, dict] | None = None  # None = 미적재 (다음 조회 때 뷰 적재)
+        self._iv_at: dict[str, Any] = {}  # 뷰에 없는 최신 수액 기록 시각 (이벤트로만 채움)
+        self._replay: list[tuple] | None = None  # 적재 중 도착한 이벤트 (적재 결과 위에 다시 적용)
+        self._stale = False  # 적재 중 invalidate 되면 그 적재 결과는 보관하지 않음
+        self._load: asyncio.Task | None = None
+        self._task: asyncio.Task | None = None
+        self.loads = 0
+        self.events = 0
+        self.reconciles = 0
+        self.drift = 0
+
+    # --- 조회 -----------------------------------------------------------------
+
+    async def rows(self, fetch: Fetch) -> list[dict]:
+        """view_station_dashboard 와 같은 형태의 행 목록 (had_fever_in_6h 는 조회 시점 기준으로 계산)."""
+        if not self.enabled:
+            return await fetch()
+        rows = self._rows
+        if rows is None:
+            data, _ = await self._reload(fetch)
+            rows = self._rows if self._rows is not None else {str(row["id"]): row for row in data}
+        now = datetime.now(timezone.utc)
+        return [self._with_fever(row, now) for row in rows.values()]
+
+    @property
+    def loaded(self) -> bool:
+        return self.enabled and self._rows is not None
+
+    def row(self, admission_id: str) -> dict | None:
+        """적재된 보드의 한 행 (had_fever_in_6h 는 조회 시점 기준). 미적재이거나 목록에 없으면 None."""
+        row = (self._rows or {}).get(str(admission_id)) if self.enabled else None
+        return self._with_fever(row, datetime.now(timezone.utc)) if row is not None else None
+
+    @staticmethod
+    def _with_fever(row: dict, now: datetime) -> dict:
+        recorded = _ts(row.get("last_vital_at"))
+        if recorded is None:  # 시각을 해석할 수 없으면 뷰가 계산한 값 유지
+            return dict(row)
+        temp = row.get("latest_temp")
+        return {**row, "had_fever_in_6h": temp is not None and temp >= FEVER_THRESHOLD and recorded >= now - FEVER_WINDOW}
+
+    async def load(self, fetch: Fetch) -> None:
+        """기동 시 선적재."""
+        if self.enabled:
+            await self._reload(fetch)
+
+    async def _reload(self, fetch: Fetch) -> tuple[list[dict], int]:
+        """뷰 전체를 다시 적재 (동시 호출은 하나의 조회로 합침). (뷰 행, 기존 보드와 다른 행 수) 반환."""
+        if self._load is None or self._load.done():
+            self._load = asyncio.ensure_future(self._fetch_and_replace(fetch))
+        return await asyncio.shield(self._load)
+
+    async def _fetch_and_replace(self, fetch: Fetch) -> tuple[list[dict], int]:
+        self._replay, self._stale = [], False
+        try:
+            data = await fetch()
+            drifted = 0
+            if self._rows is not None:  # 적재된 보드를 교체하는 경우(reconcile) 이벤트로 못 따라간 행 수
+                # 조회 도중 이벤트가 반영된 행은 조회 결과와 시점이 달라 비교에서 제외 (드리프트 아님)
+                touched = {_event_key(name, args) for name, args in self._replay}
+                fresh = {str(row["id"]): _comparable(row) for row in data}
+                before = {key: _comparable(row) for key, row in self._rows.items()}
+                drifted = sum(
+                    1 for key in (before.keys() | fresh.keys()) - touched if before.get(key) != fresh.get(key)
+                )
+            if not self._stale:
+                self._rows = {str(row["id"]): dict(row) for row in data}
+                self._iv_at = {}
+                for name, args in self._replay:  # 조회 도중 반영된 이벤트는 적재 결과보다 새로울 수 있음
+                    getattr(self, name)(*args)
+            self.loads += 1
+            return data, drifted
+        finally:
+            self._replay = None
+
+    # --- 이벤트 반영 -----------------------------------------------------------
+
+    def _dispatch(self, name: str, *args) -> None:
+        # 미적재 상태면 반영할 곳이 없음 (다음 적재가 DB 상태를 그대로 가져옴)
+        self.events += 1
+        if self._replay is not None:
+            self._replay.append((name, args))
+        if self._rows is not None:
+            getattr(self, name)(*args)
+
+    def apply_change(self, admission_id: str, section: str | None, row: Any) -> None:
+        """change_journal UPSERT 반영 (vitals / iv_records / meals 외 섹션은 목록에 영향 없음)."""
+        if section in ("vitals", "iv_records", "meals") and isinstance(row, dict):
+            self._dispatch("_apply_change", str(admission_id), section, row)
+
+    def move(self, admission_id: str, room_number: str) -> None:
+        """ADMISSION_TRANSFERRED"""
+        self._dispatch("_move", str(admission_id), room_number)
+
+    def remove(self, admission_id: str) -> None:
+        """ADMISSION_DISCHARGED"""
+        self._dispatch("_remove", str(admission_id))
+
+    def put(self, row: dict) -> None:
+        """한 입원의 뷰 행을 통째로 교체 (시딩처럼 여러 섹션이 과거 시각으로 한꺼번에 바뀐 뒤의 단건 재조회 결과)."""
+        self._dispatch("_put", dict(row))
+
+    def invalidate(self) -> None:
+        """신규 입원·일괄 변경 등 이벤트로 표현하지 않는 변경: 다음 조회 때 뷰를 다시 적재."""
+        self._rows = None
+        self._iv_at = {}
+        self._stale = self._replay is not None  # 진행 중 적재 결과도 이 변경 이전일 수 있으므로 버림
+
+    def _apply_change(self, admission_id: str, section: str, row: dict) -> None:
+        board_row = self._rows.get(admission_id)
+        if board_row is None:
+            return
+        if section == "vitals":
+            if _newer(row.get("recorded_at"), board_row.get("last_vital_at")):
+                board_row["latest_temp"] = row.get("temperature")
+                board_row["last_vital_at"] = row.get("recorded_at")
+        elif section == "iv_records":
+            if _newer(row.get("created_at"), self._iv_at.get(admission_id)):
+                self._iv_at[admission_id] = row.get("created_at")
+                board_row["iv_rate"] = row.get("infusion_rate")
+                board_row["iv_photo"] = row.get("photo_url")
+        elif _newer(row.get("created_at"), board_row.get("meal_requested_at")):
+            board_row["meal_type"] = row.get("request_type")
+            board_row["pediatric_meal_type"] = row.get("pediatric_meal_type")
+            board_row["guardian_meal_type"] = row.get("guardian_meal_type")
+            board_row["meal_requested_at"] = row.get("created_at")
+
+    def _put(self, row: dict) -> None:
+        admission_id = str(row["id"])
+        self._rows[admission_id] = row
+        self._iv_at.pop(admission_id, None)
+
+    def _move(self, admission_id: str, room_number: str) -> None:
+        if admission_id in self._rows:
+            self._rows[admission_id]["room_number"] = room_number
+
+    def _remove(self, admission_id: str) -> None:
+        self._rows.pop(admission_id, None)
+
+    # --- 정합성 대조 -----------------------------------------------------------
+
+    async def reconcile(self, fetch: Fetch) -> int:
+        """
+        뷰를 다시 읽어 보드와 다른 행 수를 기록하고 보드를 교체. 드리프트 행 수를 반환.
+        조회 도중 이벤트가 도착한 행은 세지 않습니다 (교체 후 그 이벤트를 다시 적용).
+        """
+        _, drifted = await self._reload(fetch)
+        self.reconciles += 1
+        if drifted:
+            self.drift += drifted
+            metrics.station_board_drift.inc(drifted)
+            logger.warning(f"[station_board] reconcile replaced {drifted} drifted row(s)")
+        return drifted
+
+    async def _run(self, fetch: Fetch) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                await self.reconcile(fetch)
+            except Exception as e:
+                logger.warning(f"[station_board] reconcile failed: {e}")
+
+    def start(self, fetch: Fetch) -> None:
+        """주기적 reconcile 루프 시작 (비활성 또는 주기 0 이하면 생략)."""
+        if not self.enabled or self.reconcile_interval <= 0 or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.create_task(self._run(fetch))
+        self._task.add_done_callback(lambda t: t.exception() if not t.cancelled() else None)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "loaded": self._rows is not None,
+            "rows": len(self._rows or {}),
+            "loads": self.loads,
+            "events": self.events,
+            "reconciles": self.reconciles,
+            "drift": self.drift,
+        }
+
+
+station_board = StationBoard(
+    reconcile_interval=float(os.getenv("STATION_BOARD_RECONCILE_SECONDS", "60")),
+    enabled=os.getenv("STATION_BOARD", "true").lower() == "true",
+)
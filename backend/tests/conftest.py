@@ -0,0 +1,111 @@
+"""
+공용 테스트 설정: 프로세스 전역 대시보드 스냅샷 캐시가 테스트 간/테스트 내 조회 결과를 공유하지 않도록 기본 비활성화합니다.
+캐시 동작 자체는 tests/test_dashboard_cache.py 에서 활성화해 검증합니다.
+입원 디렉터리와 스테이션 보드도 테스트마다 비워 다른 테스트의 fake DB 항목이 남지 않게 합니다.
+테스트 모듈이 import 시점에 sys.modules 를 MagicMock 으로 바꿔도(test_station_optimizations) 수집이 끝나면
+원래 모듈로 되돌려, 이후 수집·실행되는 테스트가 실제 fastapi/pydantic 을 쓰도록 합니다.
+라우트 테스트용 client_and_db 는 모듈에서 routers fixture 를 재정의해 올릴 라우터를 고릅니다.
+"""
+import importlib
+import sys
+
+import pytest
+
+from admission_directory import admission_directory
+from dashboard_cache import dashboard_cache
+from station_board import station_board
+
+# import 시점에 MagicMock 으로 교체되는 외부 패키지
+_STUBBED_MODULES = (
+    "fastapi", "pydantic", "loguru", "httpx",
+    "supabase", "supabase._async", "supabase._async.client",
+    "postgrest", "postgrest.exceptions",
+)
+
+# client_and_db 가 올리는 라우터 모듈 -> prefix (main.py 와 동일)
+_ROUTER_PREFIXES = {
+    "admissions": "/api/v1/admissions",
+    "station": "/api/v1",
+    "iv_records": "/api/v1",
+    "vitals": "/api/v1/vitals",
+    "exams": "/api/v1",
+    "meals": "/api/v1/meals",
+}
+
+# 라우트 테스트에서 제거하는 부수효과 (감사 로그 기록, WebSocket 브로드캐스트)
+_NOOP_TARGETS = (
+    "services.dashboard.create_audit_log",
+    "routers.vitals.create_audit_log",
+    "routers.vitals.broadcast_to_station_and_patient",
+    "services.iv_service.create_audit_log",
+    "services.iv_service.broadcast_to_station_and_patient",
+    "services.admission_service.broadcast_to_station_and_patient",
+)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector):
+    if not isinstance(collector, pytest.Module):
+        yield
+        return
+    saved = {name: sys.modules.get(name) for name in _STUBBED_MODULES}
+    yield
+    for name, module in saved.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
+
+
+@pytest.fixture(autouse=True)
+def _isolate_dashboard_cache(monkeypatch):
+    monkeypatch.setattr(dashboard_cache, "enabled", False)
+    dashboard_cache.invalidate()
+    yield
+    dashboard_cache.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def _reset_admission_directory():
+    admission_directory.invalidate()
+    yield
+    admission_directory.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def _reset_station_board():
+    station_board.invalidate()
+    yield
+    station_board.invalidate()
+
+
+@pytest.fixture
+def routers() -> tuple[str, ...]:
+    """client_and_db 에 올릴 라우터 모듈 이름. 테스트 모듈에서 같은 이름의 fixture 로 재정의합니다."""
+    return tuple(_ROUTER_PREFIXES)
+
+
+@pytest.fixture
+def client_and_db(monkeypatch, routers):
+    """routers 만 올린 앱의 TestClient 와 그 앱이 쓰는 FakeAsyncClient."""
+    # 수집 중 fastapi 를 교체하는 모듈이 있으므로 fixture 실행 시점에 import
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    import query_registry
+    from dependencies import get_supabase
+    from fake_supabase import FakeAsyncClient
+
+    async def noop(*args, **kwargs):
+        return None
+    for target in _NOOP_TARGETS:
+        monkeypatch.setattr(target, noop)
+    query_registry.invalidate()
+
+    db = FakeAsyncClient()
+    app = FastAPI()
+    for name in routers:
+        app.include_router(importlib.import_module(f"routers.{name}").router, prefix=_ROUTER_PREFIXES[name])
+    app.dependency_overrides[get_supabase] = lambda: db
+    with TestClient(app) as client:
+        yield client, db
@@ -0,0 +1,102 @@
+"""
+입원 디렉터리: 적재 후 token/id 조회가 DB 왕복 없이 처리되고, 입원·전동·퇴원 경로가 디렉터리를 갱신하는지 검증합니다.
+"""
+import pytest
+
+import query_registry
+from admission_directory import AdmissionDirectory, admission_directory
+from fake_supabase import FakeAsyncClient
+from models import AdmissionCreate, TransferRequest
+from services.admission_service import create_admission, discharge_patient, transfer_patient
+
+
+@pytest.fixture(autouse=True)
+def quiet(monkeypatch):
+    async def noop(*args, **kwargs):
+        return None
+    monkeypatch.setattr("services.admission_service.broadcast_to_station_and_patient", noop)
+    query_registry.invalidate()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_lookups_are_dictionary_hits_after_load(anyio_backend):
+    db = FakeAsyncClient()
+    active, discharged = db.seed("admissions", [
+        {"patient_name_masked": "김*수", "room_number": "301"},
+        {"patient_name_masked": "이*희", "room_number": "302", "status": "DISCHARGED"},
+    ])
+    await admission_directory.load(db)
+    assert db.call_counts["admissions"] == 1
+
+    entry = await admission_directory.by_token(db, active["access_token"])
+    assert entry == {"id": active["id"], "access_token": active["access_token"], "room_number": "301"}
+    assert (await admission_directory.by_id(db, active["id"]))["room_number"] == "301"
+    assert db.call_counts["admissions"] == 1
+
+    # 비활성 입원: token 은 거부, id 는 브로드캐스트용 폴백 조회
+    assert await admission_directory.by_token(db, discharged["access_token"]) is None
+    assert (await admission_directory.by_id(db, discharged["id"]))["room_number"] == "302"
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_create_transfer_discharge_keep_directory_coherent(anyio_backend):
+    db = FakeAsyncClient()
+    await admission_directory.load(db)
+
+    created = await create_admission(db, AdmissionCreate(patient_name="홍길동", room_number="303"))
+    calls = db.call_counts.get("admissions", 0)
+    assert (await admission_directory.by_token(db, created["access_token"]))["room_number"] == "303"
+
+    await transfer_patient(db, created["id"], TransferRequest(target_room="305"))
+    assert (await admission_directory.by_id(db, created["id"]))["room_number"] == "305"
+    assert db.call_counts.get("admissions", 0) == calls
+
+    await discharge_patient(db, created["id"])
+    assert await admission_directory.by_token(db, created["access_token"]) is None
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_ttl_expiry_reloads(anyio_backend):
+    db = FakeAsyncClient()
+    directory = AdmissionDirectory(ttl=0)
+    adm = db.seed("admissions", [{"patient_name_masked": "박*민", "room_number": "304"}])[0]
+    await directory.by_token(db, adm["access_token"])
+    adm["room_number"] = "306"  # 다른 인스턴스에서 전동
+    assert (await directory.by_token(db, adm["access_token"]))["room_number"] == "306"
+    assert directory.stats()["refreshes"] == 2
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_discharge_and_transfer_during_reload_survive_the_swap(anyio_backend, monkeypatch):
+    import asyncio
+
+    import admission_directory as module
+    from utils import execute_with_retry_async
+
+    db = FakeAsyncClient()
+    a, b = db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"},
+                                  {"patient_name_masked": "이*희", "room_number": "302"}])
+    directory = AdmissionDirectory()
+    snapshot_taken, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_execute(query, *args, **kwargs):
+        res = await execute_with_retry_async(query, *args, **kwargs)  # 퇴원·전동 이전 스냅샷
+        snapshot_taken.set()
+        await release.wait()
+        return res
+    monkeypatch.setattr(module, "execute_with_retry_async", slow_execute)
+
+    load = asyncio.ensure_future(directory.load(db))
+    await snapshot_taken.wait()
+    await discharge_patient(db, a["id"])  # DB 도 퇴원 상태 (이후 폴백 조회도 거부)
+    directory.remove(a["id"])
+    directory.move(b["id"], "305")
+    release.set()
+    await load
+
+    assert await directory.by_token(db, a["access_token"]) is None
+    assert directory.peek(b["id"])["room_number"] == "305"
@@ -11,8 +11,8 @@ def mock_db():
 @pytest.fixture
 def mock_execute(monkeypatch):
     m = AsyncMock()
-    # Mocking in the service module now
-    monkeypatch.setattr("services.admission_service.execute_with_retry_async", m)
+    # 목록 조회는 query_registry(station_list) 를 거쳐 실행
+    monkeypatch.setattr("query_registry.execute_with_retry_async", m)
     return m
 
 @pytest.mark.anyio
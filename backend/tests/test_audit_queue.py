@@ -0,0 +1,132 @@
+"""
+Write-behind 감사 로그 큐: 일괄 flush, 종료 시 flush, DB 장애 시 디스크 spill 및 재전송을 검증합니다.
+"""
+import asyncio
+import json
+import os
+
+import pytest
+
+from audit_queue import AuditQueue
+from fake_supabase import FakeAsyncClient, _api_error
+from utils import create_audit_log
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_entries_are_batched_and_flushed_on_stop(anyio_backend, tmp_path, monkeypatch):
+    queue = AuditQueue(batch_size=100, flush_interval=60, spill_path=str(tmp_path / "spill.jsonl"))
+    monkeypatch.setattr("audit_queue.audit_queue", queue)
+    db = FakeAsyncClient()
+    queue.start(db)
+
+    for i in range(250):
+        await create_audit_log(db, "NURSE", "CREATE_VITAL", str(i))
+    assert "rpc/log_audit_activity" not in db.call_counts  # 요청 경로에서 RPC 호출 없음
+
+    await queue.stop()
+    assert len(db.rows("audit_logs")) == 250
+    assert db.call_counts["rpc/log_audit_activity_batch"] == 3
+    assert queue.stats()["queued"] == 0
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_unreachable_db_spills_to_disk_and_replays(anyio_backend, tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    down = FakeAsyncClient()
+    down.inject_error(1.0, target="rpc/log_audit_activity_batch")
+    queue = AuditQueue(batch_size=10, flush_interval=60, spill_path=str(spill))
+    queue.start(down)
+    for i in range(15):
+        queue.enqueue("GUARDIAN", "VIEW", f"adm-{i}")
+    await queue.stop()
+
+    assert down.rows("audit_logs") == []
+    assert sum(1 for _ in spill.open(encoding="utf-8")) == 15
+
+    # 재시작 후 DB 가 복구되면 spill 파일을 재전송
+    up = FakeAsyncClient()
+    queue = AuditQueue(batch_size=10, flush_interval=60, spill_path=str(spill))
+    queue.start(up)
+    await queue.stop()
+    assert sorted(r["target_id"] for r in up.rows("audit_logs")) == sorted(f"adm-{i}" for i in range(15))
+    assert not os.path.exists(spill)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_per_entry_fallback_spills_only_failed_entries(anyio_backend, tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    db = FakeAsyncClient()
+    # anon 키: 배치 RPC 실행 권한 없음 → 건별 RPC 로 폴백
+    db.inject_error(1.0, target="rpc/log_audit_activity_batch",
+                    factory=lambda: _api_error("permission denied for function log_audit_activity_batch", "42501"))
+    recorded = db._rpc_log_audit_activity
+
+    def flaky(p_actor_type, p_action, p_target_id, p_ip_address="0.0.0.0"):
+        if int(p_target_id) % 3 == 0:
+            raise _api_error("Injected fault: service unavailable", "503")
+        return recorded(p_actor_type, p_action, p_target_id, p_ip_address)
+    db._rpc_log_audit_activity = flaky
+
+    queue = AuditQueue(batch_size=10, flush_interval=60, spill_path=str(spill))
+    for i in range(10):
+        queue.enqueue("NURSE", "CREATE_VITAL", str(i), "10.0.0.1")
+    queue._db = db
+    queue._flush_lock = asyncio.Lock()
+    assert await queue.flush() is False
+
+    assert sorted(int(r["target_id"]) for r in db.rows("audit_logs")) == [1, 2, 4, 5, 7, 8]
+    assert sorted(json.loads(line)["target_id"] for line in spill.open(encoding="utf-8")) == ["0", "3", "6", "9"]
+    assert queue.stats()["flushed"] == 6 and queue.stats()["spilled"] == 4
+    # 재전송용으로 적재 시각을 함께 보존
+    assert all(json.loads(line)["created_at"] for line in spill.open(encoding="utf-8"))
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_replay_keeps_enqueue_time(anyio_backend, tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    queue = AuditQueue(max_size=0, spill_path=str(spill))
+    queue.enqueue("NURSE", "CREATE_VITAL", "1")
+    enqueued_at = json.loads(spill.read_text(encoding="utf-8"))["created_at"]
+
+    db = FakeAsyncClient()
+    queue = AuditQueue(flush_interval=60, spill_path=str(spill))
+    queue.start(db)
+    await queue.stop()
+    assert [r["created_at"] for r in db.rows("audit_logs")] == [enqueued_at]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_leftover_replay_file_is_merged_not_overwritten(anyio_backend, tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    # 이전 재전송이 중단되어 남은 .replay 파일 (잘린 마지막 줄 포함) + 새 spill 파일
+    leftover = tmp_path / "spill.jsonl.replay"
+    leftover.write_text(
+        json.dumps({"actor_type": "NURSE", "action": "CREATE_IV", "target_id": "old", "ip_address": "0.0.0.0"})
+        + '\n{"actor_type": "NU', encoding="utf-8")
+    spill.write_text(
+        json.dumps({"actor_type": "NURSE", "action": "CREATE_IV", "target_id": "new", "ip_address": "0.0.0.0"}) + "\n",
+        encoding="utf-8")
+
+    db = FakeAsyncClient()
+    queue = AuditQueue(flush_interval=60, spill_path=str(spill))
+    queue.start(db)
+    await queue.stop()
+
+    assert sorted(r["target_id"] for r in db.rows("audit_logs")) == ["new", "old"]
+    assert not leftover.exists() and not spill.exists()
+    assert (tmp_path / "spill.jsonl.rejected").read_text(encoding="utf-8") == '{"actor_type": "NU\n'
+
+
+def test_memory_bound_spills_oldest_entries(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    queue = AuditQueue(max_size=5, spill_path=str(spill))
+    for i in range(8):
+        queue.enqueue("NURSE", "CREATE_IV", str(i))
+    assert queue.stats()["queued"] == 5
+    assert [line.count('"target_id": "0"') for line in spill.open(encoding="utf-8")][0] == 1
+    assert queue.stats()["spilled"] == 3
@@ -0,0 +1,150 @@
+"""
+공용 Circuit Breaker / Retry Budget 동작 검증.
+장애 시 DB 호출 없이 즉시 실패(fail-fast)하고, 복구 시 HALF_OPEN probe 를 거쳐 CLOSED 로 돌아와야 합니다.
+"""
+import asyncio
+
+import pytest
+
+import deadline
+from circuit_breaker import CircuitBreaker, CircuitOpenError, RetryBudget, CLOSED, OPEN, HALF_OPEN
+from deadline import DeadlineExceeded
+from fake_supabase import FakeAsyncClient
+from utils import execute_with_retry_async
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _no_sleep(_seconds):
+    return None
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(monkeypatch, clock):
+    b = CircuitBreaker(failure_threshold=3, reset_timeout=10.0, clock=clock)
+    monkeypatch.setattr("utils.db_breaker", b)
+    monkeypatch.setattr("utils.retry_budget", RetryBudget(capacity=100, refill_per_sec=0, clock=clock))
+    monkeypatch.setattr("utils.asyncio.sleep", _no_sleep)
+    return b
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_breaker_opens_and_fails_fast(anyio_backend, breaker, clock):
+    db = FakeAsyncClient()
+    db.inject_error(1.0, target="admissions")
+
+    with pytest.raises(Exception):
+        await execute_with_retry_async(db.table("admissions").select("id"))
+    assert breaker.state == OPEN
+    assert db.call_counts["admissions"] == 3
+
+    # OPEN: DB 호출 없이 즉시 실패
+    with pytest.raises(CircuitOpenError):
+        await execute_with_retry_async(db.table("admissions").select("id"))
+    assert db.call_counts["admissions"] == 3
+
+    # reset_timeout 경과 -> HALF_OPEN probe 성공 -> CLOSED
+    clock.now += 10.0
+    assert breaker.state == HALF_OPEN
+    db.inject_error(0, target="admissions")
+    await execute_with_retry_async(db.table("admissions").select("id"))
+    assert breaker.state == CLOSED
+
+
+def test_half_open_allows_limited_probes(clock):
+    b = CircuitBreaker(failure_threshold=1, reset_timeout=5.0, clock=clock)
+    b.record_failure()
+    assert not b.allow()
+    clock.now += 5.0
+    assert b.allow()
+    assert not b.allow()  # probe 진행 중에는 추가 호출 차단
+    b.record_failure()
+    assert b.state == OPEN
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_retry_budget_limits_retries(anyio_backend, monkeypatch, clock):
+    monkeypatch.setattr("utils.db_breaker", CircuitBreaker(failure_threshold=100, clock=clock))
+    budget = RetryBudget(capacity=2, refill_per_sec=0, clock=clock)
+    monkeypatch.setattr("utils.retry_budget", budget)
+    monkeypatch.setattr("utils.asyncio.sleep", _no_sleep)
+
+    db = FakeAsyncClient()
+    db.inject_error(1.0, target="vital_signs")
+    with pytest.raises(Exception):
+        await execute_with_retry_async(db.table("vital_signs").select("id"))
+
+    # 1회 시도 + 예산 2회 재시도 후 중단
+    assert db.call_counts["vital_signs"] == 3
+    assert budget.snapshot()["denied"] == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_probe_slot_released_on_deadline_and_cancel(anyio_backend, monkeypatch, clock):
+    # 실제 sleep 이 필요하므로 breaker fixture(sleep 무력화) 대신 직접 구성
+    b = CircuitBreaker(failure_threshold=1, reset_timeout=10.0, clock=clock)
+    monkeypatch.setattr("utils.db_breaker", b)
+    b.record_failure()
+    clock.now += 10.0
+    assert b.state == HALF_OPEN
+    db = FakeAsyncClient(latency_ms=500)
+
+    # probe 가 요청 deadline 에 잘림: 결과는 기록되지 않지만 슬롯은 반환
+    with deadline.deadline_scope(0.02, deadline.STATION_READ):
+        with pytest.raises(DeadlineExceeded):
+            await execute_with_retry_async(db.table("admissions").select("id"))
+    assert b.state == HALF_OPEN and b.snapshot()["rejected_count"] == 0
+
+    # probe 도중 취소(클라이언트 연결 종료)
+    task = asyncio.ensure_future(execute_with_retry_async(db.table("admissions").select("id")))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert b.state == HALF_OPEN
+
+    # 다음 probe 가 통과해 CLOSED 로 복귀
+    db.set_latency(0)
+    await execute_with_retry_async(db.table("admissions").select("id"))
+    assert b.state == CLOSED and b.snapshot()["rejected_count"] == 0
+
+
+def test_release_ignores_probe_from_previous_half_open(clock):
+    b = CircuitBreaker(failure_threshold=1, reset_timeout=5.0, clock=clock)
+    b.record_failure()
+    clock.now += 5.0
+    old_probe = b.check()
+    b.record_failure()  # probe 실패 -> OPEN
+    clock.now += 5.0
+    assert b.check() is not None
+    b.release(old_probe)  # 이전 구간 probe 의 늦은 반환은 현재 probe 슬롯에 영향 없음
+    assert not b.allow()
+
+
+def test_success_closes_only_through_a_probe(clock):
+    b = CircuitBreaker(failure_threshold=1, reset_timeout=5.0, clock=clock)
+    b.record_failure()
+    b.record_success()  # OPEN 전에 시작된 호출의 늦은 성공
+    assert b.state == OPEN
+
+    clock.now += 5.0
+    assert b.state == HALF_OPEN
+    b.record_success()  # probe 가 아닌 호출
+    assert b.state == HALF_OPEN
+    probe = b.check()
+    b.record_success(probe)
+    assert b.state == CLOSED
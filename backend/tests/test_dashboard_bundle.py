@@ -0,0 +1,80 @@
+"""
+get_dashboard_bundle RPC: 6개 쿼리 경로와 동일한 응답을 1회 호출로 반환하고,
+RPC 미배포(PGRST202) 시 6개 쿼리 경로로 폴백하는지 검증합니다.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+import query_registry
+from fake_supabase import FakeAsyncClient
+from services import dashboard
+
+
+@pytest.fixture(autouse=True)
+def bundle_enabled(monkeypatch):
+    async def no_audit(*args, **kwargs):
+        return None
+    monkeypatch.setattr("services.dashboard.create_audit_log", no_audit)
+    monkeypatch.setattr(dashboard, "DASHBOARD_BUNDLE_RPC", True)
+    monkeypatch.setattr(dashboard, "_bundle_rpc_missing", False)
+    query_registry.invalidate()
+
+
+def _seed(db: FakeAsyncClient) -> dict:
+    now = datetime.now(timezone.utc)
+    adm = db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"}])[0]
+    db.seed("vital_signs", [
+        {"admission_id": adm["id"], "temperature": 37.0 + i / 10, "recorded_at": (now - timedelta(hours=i)).isoformat()}
+        for i in range(120)
+    ])
+    db.seed("exam_schedules", [
+        {"admission_id": adm["id"], "name": f"검사{i}", "scheduled_at": (now + timedelta(days=3 - i)).isoformat()}
+        for i in range(3)
+    ])
+    return adm
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_bundle_matches_six_query_path(anyio_backend, monkeypatch):
+    db = FakeAsyncClient()
+    adm = _seed(db)
+
+    bundled = await dashboard.fetch_dashboard_data_by_token(db, adm["access_token"])
+    assert db.call_counts == {"rpc/get_dashboard_bundle": 1}
+
+    monkeypatch.setattr(dashboard, "DASHBOARD_BUNDLE_RPC", False)
+    assert await dashboard.fetch_dashboard_data(db, adm["id"]) == bundled
+    assert len(bundled["vitals"]) == 100
+    assert [e["name"] for e in bundled["exam_schedules"]] == ["검사2", "검사1", "검사0"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_bundle_token_requires_active_admission(anyio_backend):
+    db = FakeAsyncClient()
+    adm = db.seed("admissions", [{"patient_name_masked": "이*희", "room_number": "302", "status": "DISCHARGED"}])[0]
+
+    with pytest.raises(HTTPException) as exc:
+        await dashboard.fetch_dashboard_data_by_token(db, adm["access_token"])
+    assert exc.value.status_code == 404
+    # 퇴원 환자도 admission_id 로는 조회 가능 (기존 동작)
+    result = await dashboard.fetch_dashboard_data(db, adm["id"])
+    assert result["admission"]["status"] == "DISCHARGED"
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_missing_rpc_falls_back_once(anyio_backend, monkeypatch):
+    db = FakeAsyncClient()
+    adm = _seed(db)
+    monkeypatch.delattr(FakeAsyncClient, "_rpc_get_dashboard_bundle")
+
+    for _ in range(2):
+        result = await dashboard.fetch_dashboard_data_by_token(db, adm["access_token"])
+        assert result["admission"]["id"] == adm["id"]
+    # PGRST202 는 한 번만 확인하고 이후 6개 쿼리 경로 사용
+    assert db.call_counts["rpc/get_dashboard_bundle"] == 1
+    assert db.call_counts["vital_signs"] == 2
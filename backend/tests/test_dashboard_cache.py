@@ -0,0 +1,82 @@
+"""
+대시보드 스냅샷 캐시: 반복 조회는 DB 왕복 0회, 쓰기 경로는 무효화, LRU 제한, 조회 중 무효화 시 저장 생략을 검증합니다.
+"""
+import pytest
+
+import metrics
+import query_registry
+from dashboard_cache import DashboardSnapshotCache, dashboard_cache
+from fake_supabase import FakeAsyncClient
+from models import VitalSignCreate
+from routers.vitals import record_vital
+from services.dashboard import fetch_dashboard_data, fetch_dashboard_data_by_token
+
+
+@pytest.fixture(autouse=True)
+def cache_enabled(monkeypatch):
+    async def noop(*args, **kwargs):
+        return None
+    monkeypatch.setattr("services.dashboard.create_audit_log", noop)
+    monkeypatch.setattr("routers.vitals.create_audit_log", noop)
+    monkeypatch.setattr("routers.vitals.broadcast_to_station_and_patient", noop)
+    monkeypatch.setattr(dashboard_cache, "enabled", True)
+    query_registry.invalidate()
+
+
+def _snapshot(admission_id: str, token: str = "t", status: str = "IN_PROGRESS") -> dict:
+    return {"admission": {"id": admission_id, "access_token": token, "status": status}}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_repeat_views_cost_no_db_calls_until_write(anyio_backend):
+    db = FakeAsyncClient()
+    adm = db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"}])[0]
+    hits_before = metrics.dashboard_cache.value(result="hit")
+
+    first = await fetch_dashboard_data_by_token(db, adm["access_token"])
+    calls = sum(db.call_counts.values())
+    for _ in range(3):
+        assert await fetch_dashboard_data_by_token(db, adm["access_token"]) == first
+        assert await fetch_dashboard_data(db, adm["id"]) == first
+    assert sum(db.call_counts.values()) == calls
+    assert metrics.dashboard_cache.value(result="hit") - hits_before == 6
+
+    await record_vital(VitalSignCreate(admission_id=adm["id"], temperature=38.4), db)
+    refreshed = await fetch_dashboard_data(db, adm["id"])
+    assert [v["temperature"] for v in refreshed["vitals"]] == [38.4]
+
+
+def test_lru_eviction_and_token_index():
+    cache = DashboardSnapshotCache(max_entries=2)
+    for aid in ("a", "b"):
+        cache.put(aid, _snapshot(aid, token=f"tok-{aid}"), cache.generation())
+    assert cache.get("a") is not None  # a 를 최근 사용으로
+    cache.put("c", _snapshot("c", token="tok-c"), cache.generation())
+
+    assert cache.get("b") is None
+    assert cache.get_by_token("tok-b") is None
+    assert cache.get_by_token("tok-a")["admission"]["id"] == "a"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidation_during_fetch_discards_result():
+    cache = DashboardSnapshotCache()
+    generation = cache.generation()
+    cache.invalidate("a")  # 조회 도중 쓰기 발생
+    cache.put("a", _snapshot("a"), generation)
+    cache.put("b", _snapshot("b"), generation)  # 다른 입원은 영향 없음
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+    generation = cache.generation()
+    cache.invalidate()
+    cache.put("b", _snapshot("b"), generation)
+    assert cache.get("b") is None
+
+
+def test_token_lookup_ignores_discharged_snapshot():
+    cache = DashboardSnapshotCache()
+    cache.put("a", _snapshot("a", token="tok", status="DISCHARGED"), cache.generation())
+    assert cache.get_by_token("tok") is None
+    assert cache.get("a") is not None
@@ -0,0 +1,85 @@
+"""
+증분 대시보드(?since=cursor): 커서 이후 추가/삭제분만 반환하고, 만료·무효 커서나 전동 이후에는 전체 데이터로 reset 하는지 검증합니다.
+"""
+import pytest
+
+import query_registry
+from change_journal import ChangeJournal
+from fake_supabase import FakeAsyncClient
+from models import ExamScheduleCreate, VitalSignCreate
+from routers.exams import create_exam_schedule, delete_exam_schedule
+from routers.vitals import record_vital
+from services.dashboard import fetch_dashboard_delta
+
+
+@pytest.fixture(autouse=True)
+def quiet_side_effects(monkeypatch):
+    async def noop(*args, **kwargs):
+        return None
+    for target in ("services.dashboard.create_audit_log", "routers.vitals.create_audit_log",
+                   "routers.vitals.broadcast_to_station_and_patient", "routers.exams.create_audit_log",
+                   "routers.exams.broadcast_to_station_and_patient",
+                   "services.admission_service.broadcast_to_station_and_patient"):
+        monkeypatch.setattr(target, noop)
+    query_registry.invalidate()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_delta_returns_only_changes_since_cursor(anyio_backend):
+    db = FakeAsyncClient()
+    adm = db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"}])[0]
+    token = adm["access_token"]
+
+    full = await fetch_dashboard_delta(db, token, "")
+    assert full["reset"] is True and full["admission"]["id"] == adm["id"]
+
+    vital = await record_vital(VitalSignCreate(admission_id=adm["id"], temperature=38.2), db)
+    exam = await create_exam_schedule(
+        ExamScheduleCreate(admission_id=adm["id"], scheduled_at="2026-10-18T09:00:00+00:00", name="X-ray"), db)
+    delta = await fetch_dashboard_delta(db, token, full["cursor"])
+    assert delta["reset"] is False
+    assert [v["id"] for v in delta["vitals"]] == [vital["id"]]
+    assert [e["name"] for e in delta["exam_schedules"]] == ["X-ray"]
+    assert delta["meals"] == [] and delta["deleted"] == {}
+
+    await delete_exam_schedule(exam["id"], db)
+    after_delete = await fetch_dashboard_delta(db, token, delta["cursor"])
+    assert after_delete["exam_schedules"] == []
+    assert after_delete["deleted"] == {"exam_schedules": [exam["id"]]}
+
+    # 변경 없으면 빈 증분, 커서는 그대로 유효
+    idle = await fetch_dashboard_delta(db, token, after_delete["cursor"])
+    assert not any(idle[s] for s in ("vitals", "iv_records", "meals", "exam_schedules", "document_requests"))
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_transfer_forces_reset(anyio_backend):
+    from models import TransferRequest
+    from services.admission_service import transfer_patient
+
+    db = FakeAsyncClient()
+    adm = db.seed("admissions", [{"patient_name_masked": "이*희", "room_number": "302"}])[0]
+    first = await fetch_dashboard_delta(db, adm["access_token"], "")
+    await transfer_patient(db, adm["id"], TransferRequest(target_room="305"))
+
+    delta = await fetch_dashboard_delta(db, adm["access_token"], first["cursor"])
+    assert delta["reset"] is True
+    assert delta["admission"]["room_number"] == "305"
+
+
+def test_expired_and_foreign_cursors():
+    journal = ChangeJournal(per_admission=2)
+    start = journal.cursor()
+    for i in range(3):
+        journal.record_upsert("a", "vitals", {"id": i})
+    assert journal.changes_since(start, "a") is None  # 보관 한도 초과
+    assert [c.row["id"] for c in journal.changes_since(f"{journal.epoch}-1", "a")] == [1, 2]
+    assert journal.changes_since(start, "b") == []
+    assert journal.changes_since("other-0", "a") is None
+    assert journal.changes_since("garbage", "a") is None
+
+    cursor = journal.cursor()
+    journal.record_reset()
+    assert journal.changes_since(cursor, "b") is None
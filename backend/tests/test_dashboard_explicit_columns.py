@@ -18,11 +18,15 @@ def test_dashboard_uses_explicit_columns_no_star():
 
 
 def test_dashboard_has_six_explicit_selects():
-    """Expect exactly 6 table select() calls (admissions, vital_signs, iv_records, meal_requests, exam_schedules, document_requests)."""
-    dashboard_path = Path(__file__).resolve().parent.parent / "services" / "dashboard.py"
-    source = dashboard_path.read_text(encoding="utf-8")
-    # .select("...explicit columns...") count
-    selects = source.count(".select(")
-    assert selects >= 6, (
-        f"dashboard.py should have at least 6 explicit .select(...) calls, found {selects}."
+    """Expect 6 registered dashboard queries (admissions, vital_signs, iv_records, meal_requests, exam_schedules, document_requests), each with an explicit column list."""
+    registry_path = Path(__file__).resolve().parent.parent / "query_registry.py"
+    source = registry_path.read_text(encoding="utf-8")
+    blocks = source.split('name="dashboard_')[1:]
+    assert len(blocks) == 6, (
+        f"query_registry.py should register 6 dashboard section queries, found {len(blocks)}."
     )
+    for block in blocks:
+        block = block[:block.index("\n))")]
+        assert "columns=SECTION_COLUMNS[" in block, (
+            f"dashboard query 'dashboard_{block.split(chr(34))[0]}' must select explicit SECTION_COLUMNS, not '*'."
+        )
@@ -0,0 +1,122 @@
+"""
+행 단위 PATCH: 저널 변경이 보호자 채널(섹션 행 + 입원 버전)과 스테이션 채널(목록 행의 바뀐 필드)로
+버전과 함께 전달되고, 행으로 표현할 수 없는 변경은 reset 으로 알리는지 검증합니다.
+dev 시딩은 전체 재조회 신호 대신 행 단위 변경을 기록합니다.
+"""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import dashboard_patches
+from admission_directory import AdmissionDirectory
+from change_journal import ChangeJournal
+from dashboard_patches import PatchPublisher
+from fake_supabase import FakeAsyncClient
+from services import dev_service
+from services.dashboard import fetch_dashboard_delta
+from station_board import station_board
+
+ADM = "3f0c2a1e-8a55-4c0a-9d53-2f7a9b1c0d11"
+TOKEN = "b1c6f6f2-2c7e-4f55-8f0a-5d1d5a1c9e21"
+
+
+def _view_row() -> dict:
+    return {
+        "id": ADM, "room_number": "301", "display_name": "김*수", "access_token": TOKEN, "dob": None, "gender": "M",
+        "check_in_at": "2026-10-17T00:00:00+00:00", "attending_physician": None, "latest_temp": None,
+        "last_vital_at": None, "had_fever_in_6h": False, "iv_rate": None, "iv_photo": None, "meal_type": None,
+        "pediatric_meal_type": None, "guardian_meal_type": None, "meal_requested_at": None,
+    }
+
+
+@pytest.fixture
+def journal(monkeypatch):
+    directory = AdmissionDirectory()
+    directory.put(ADM, TOKEN, "301")
+    monkeypatch.setattr(dashboard_patches, "admission_directory", directory)
+    monkeypatch.setattr(dashboard_patches, "manager", SimpleNamespace(active_connections={"STATION": set(), TOKEN: set()}))
+    journal = ChangeJournal()
+    journal.batch = []
+    journal.subscribe(lambda *args: journal.batch.append((journal.epoch, *args)))
+    return journal
+
+
+def _by_channel(messages: list[tuple[str, dict]]) -> dict[str, dict]:
+    return {channel: message["data"] for channel, message in messages}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_row_patches_carry_versions_and_changed_fields(anyio_backend, journal):
+    async def fetch():
+        return [_view_row()]
+    await station_board.load(fetch)
+    publisher = PatchPublisher()
+    now = datetime.now(timezone.utc).isoformat()
+
+    journal.record_upsert(ADM, "vitals", {"id": 5, "admission_id": ADM, "temperature": 38.9, "has_medication": False,
+                                          "medication_type": None, "recorded_at": now, "extra": "x"})
+    journal.record_delete(ADM, "exam_schedules", 7)
+    sent = _by_channel(publisher.messages_for(journal.batch))
+
+    guardian = sent[TOKEN]
+    assert (guardian["prev"], guardian["version"], guardian["reset"]) == (0, 2, False)
+    assert guardian["rows"][0]["row"] == {"id": 5, "admission_id": ADM, "temperature": 38.9, "has_medication": False,
+                                          "medication_type": None, "recorded_at": now}
+    assert guardian["rows"][1] == {"section": "exam_schedules", "op": "delete", "id": 7}
+    assert f"{guardian['epoch']}-{guardian['version']}" == journal.version(ADM)
+
+    station = sent["STATION"]
+    assert (station["prev"], station["version"], station["reset"]) == (0, 1, False)
+    assert station["rows"] == [{"op": "upsert", "id": ADM, "latest_temp": 38.9, "last_vital_at": now,
+                                "had_fever_in_6h": True}]
+
+    # 문서 요청은 목록에 영향이 없으므로 스테이션 패치(버전)도 없음
+    journal.batch.clear()
+    journal.record_upsert(ADM, "document_requests", {"id": 1, "admission_id": ADM, "request_items": [], "status": "PENDING"})
+    sent = _by_channel(publisher.messages_for(journal.batch))
+    assert "STATION" not in sent and sent[TOKEN]["prev"] == 2
+
+    # 퇴원: 보호자는 reset, 스테이션은 목록 행 삭제
+    journal.batch.clear()
+    station_board.remove(ADM)
+    journal.record_reset(ADM)
+    sent = _by_channel(publisher.messages_for(journal.batch))
+    assert sent[TOKEN]["reset"] is True and sent[TOKEN]["rows"] == []
+    assert (sent["STATION"]["prev"], sent["STATION"]["rows"]) == (1, [{"op": "delete", "id": ADM}])
+
+
+def test_unloaded_board_and_global_reset_fall_back_to_refetch(journal):
+    publisher = PatchPublisher()
+    journal.record_upsert(ADM, "iv_records", {"id": 1, "admission_id": ADM, "infusion_rate": 40})
+    station = _by_channel(publisher.messages_for(journal.batch))["STATION"]
+    assert station["reset"] is True and station["rows"] == []
+
+    # 전체 만료: 이전 기록은 버리고 모든 채널에 reset
+    journal.batch.clear()
+    journal.record_upsert(ADM, "vitals", {"id": 2, "admission_id": ADM, "temperature": 37.0})
+    journal.record_reset()
+    sent = publisher.messages_for(journal.batch)
+    assert sorted(channel for channel, _ in sent) == ["STATION", TOKEN]
+    assert all(message["data"] == {"epoch": journal.epoch, "reset": True} for _, message in sent)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_seed_records_row_changes_instead_of_reset(anyio_backend, monkeypatch):
+    async def noop(*args, **kwargs):
+        return None
+    monkeypatch.setattr("services.dashboard.create_audit_log", noop)
+    db = FakeAsyncClient()
+    adm = db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"}])[0]
+    db.seed("vital_signs", [{"admission_id": adm["id"], "temperature": 36.5}])
+    cursor = (await fetch_dashboard_delta(db, adm["access_token"], ""))["cursor"]
+
+    await dev_service.seed_patient_data(db, adm["id"])
+
+    delta = await fetch_dashboard_delta(db, adm["access_token"], cursor)
+    assert delta["reset"] is False
+    assert delta["admission"]["check_in_at"] == db.rows("admissions")[0]["check_in_at"]
+    assert len(delta["vitals"]) == len(db.rows("vital_signs")) and delta["deleted"]["vitals"]
+    assert len(delta["meals"]) == 9 and len(delta["exam_schedules"]) == 2
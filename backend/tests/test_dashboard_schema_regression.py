@@ -50,7 +50,7 @@ async def test_fetch_dashboard_data_schema_contract(anyio_backend):
     ]
 
     mock_db = MagicMock()
-    with patch("services.dashboard.execute_with_retry_async", new_callable=AsyncMock, side_effect=mock_responses):
+    with patch("query_registry.execute_with_retry_async", new_callable=AsyncMock, side_effect=mock_responses):
         with patch("services.dashboard.create_audit_log"):
             result = await fetch_dashboard_data(mock_db, "test-admission-id")
 
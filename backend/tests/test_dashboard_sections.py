@@ -0,0 +1,61 @@
+"""
+?sections= 부분 대시보드: 요청한 섹션 쿼리만 실행하고, 나머지는 빈 목록이 아닌 null + omitted 로 표시하는지 검증합니다.
+"""
+import pytest
+
+
+@pytest.fixture
+def routers():
+    return ("admissions", "station")
+
+
+def test_token_route_runs_only_requested_queries(client_and_db):
+    client, db = client_and_db
+    adm = db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"}])[0]
+    db.seed("iv_records", [{"admission_id": adm["id"], "infusion_rate": 40}])
+    before = dict(db.call_counts)
+
+    res = client.get(f"/api/v1/dashboard/{adm['access_token']}", params={"sections": "iv_records,meals"})
+    body = res.json()
+    assert res.status_code == 200 and res.headers["etag"]
+    assert [r["infusion_rate"] for r in body["iv_records"]] == [40]
+    assert body["meals"] == []
+    assert body["vitals"] is None and body["admission"] is None
+    assert body["omitted"] == ["admission", "vitals", "exam_schedules", "document_requests"]
+    assert body["cursor"]
+    for table in ("vital_signs", "exam_schedules", "document_requests"):
+        assert db.call_counts.get(table) == before.get(table)
+
+    again = client.get(f"/api/v1/dashboard/{adm['access_token']}",
+                       params={"sections": "iv_records,meals"}, headers={"If-None-Match": res.headers["etag"]})
+    assert again.status_code == 304
+
+
+def test_id_route_sections_and_validation(client_and_db):
+    client, db = client_and_db
+    adm = db.seed("admissions", [{"patient_name_masked": "이*희", "room_number": "302"}])[0]
+    url = f"/api/v1/admissions/{adm['id']}/dashboard"
+
+    body = client.get(url, params={"sections": "admission"}).json()
+    assert body["admission"]["display_name"] == "이*희"
+    assert body["omitted"] == ["vitals", "iv_records", "meals", "exam_schedules", "document_requests"]
+
+    assert client.get(url, params={"sections": "vitals,unknown"}).status_code == 400
+    missing = "/api/v1/admissions/00000000-0000-0000-0000-000000000000/dashboard"
+    assert client.get(missing, params={"sections": "vitals"}).status_code == 404
+    # 전체 섹션 지정은 기존 DashboardResponse 와 동일
+    full = client.get(url, params={"sections": "admission,vitals,iv_records,meals,exam_schedules,document_requests"})
+    assert "omitted" not in full.json()
+
+
+def test_openapi_documents_every_dashboard_shape(client_and_db):
+    client, _ = client_and_db
+    paths = client.get("/openapi.json").json()["paths"]
+
+    def shapes(path):
+        schema = paths[path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        return {ref["$ref"].rsplit("/", 1)[1] for ref in schema["anyOf"]}
+
+    assert shapes("/api/v1/dashboard/{token}") == {"DashboardResponse", "DashboardDelta", "DashboardSections"}
+    assert shapes("/api/v1/admissions/{admission_id}/dashboard") == {"DashboardResponse", "DashboardSections"}
+    assert "application/x-ndjson" in paths["/api/v1/dashboard/{token}/stream"]["get"]["responses"]["200"]["content"]
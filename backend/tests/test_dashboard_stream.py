@@ -0,0 +1,54 @@
+"""
+NDJSON 대시보드 스트림: admission 이 먼저 오고 나머지는 완료 순서대로 오며,
+실패한 섹션은 error 줄로만 보고되고 응답 전체는 성공하는지 검증합니다.
+"""
+import json
+
+import pytest
+
+from dashboard_cache import dashboard_cache
+from fake_supabase import _api_error
+
+
+@pytest.fixture
+def routers():
+    return ("station",)
+
+
+def _lines(res):
+    return [json.loads(line) for line in res.text.splitlines()]
+
+
+def test_stream_orders_by_completion_admission_first(client_and_db):
+    client, db = client_and_db
+    adm = db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"}])[0]
+    db.seed("vital_signs", [{"admission_id": adm["id"], "temperature": 38.2}])
+    db.set_latency(40, target="admissions")
+    db.set_latency(80, target="meal_requests")
+
+    res = client.get(f"/api/v1/dashboard/{adm['access_token']}/stream")
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "application/x-ndjson"
+    lines = _lines(res)
+    sections = [line.get("section") for line in lines[:-1]]
+    assert sections[0] == "admission" and sections[-1] == "meals"
+    assert sorted(sections) == sorted(["admission", "vitals", "iv_records", "meals", "exam_schedules", "document_requests"])
+    assert lines[0]["data"]["display_name"] == "김*수"
+    assert [v["temperature"] for v in lines[sections.index("vitals")]["data"]] == [38.2]
+    assert lines[-1]["done"] is True and lines[-1]["errors"] == []
+
+
+def test_failed_section_is_reported_not_fatal(client_and_db, monkeypatch):
+    monkeypatch.setattr(dashboard_cache, "enabled", True)
+    client, db = client_and_db
+    adm = db.seed("admissions", [{"patient_name_masked": "이*희", "room_number": "302"}])[0]
+    db.inject_error(1.0, target="exam_schedules", factory=lambda: _api_error("permission denied", "42501"))
+
+    res = client.get(f"/api/v1/dashboard/{adm['access_token']}/stream")
+    assert res.status_code == 200
+    lines = _lines(res)
+    assert {"section": "exam_schedules", "error": "APIError"} in lines
+    assert lines[-1]["errors"] == ["exam_schedules"]
+    assert dashboard_cache.get(adm["id"]) is None  # 불완전한 결과는 캐시하지 않음
+
+    assert client.get("/api/v1/dashboard/not-a-token/stream").status_code == 404
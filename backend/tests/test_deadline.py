@@ -0,0 +1,67 @@
+"""
+요청 데드라인이 DB 재시도 루프(시도·백오프)를 제한하는지 검증합니다.
+"""
+import time
+
+import pytest
+
+import deadline
+from circuit_breaker import CircuitBreaker, RetryBudget
+from deadline import DeadlineExceeded
+from fake_supabase import FakeAsyncClient
+from utils import execute_with_retry_async
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    instance = CircuitBreaker(failure_threshold=100)
+    monkeypatch.setattr("utils.db_breaker", instance)
+    monkeypatch.setattr("utils.retry_budget", RetryBudget(capacity=100))
+    return instance
+
+
+def test_classify_route_classes():
+    assert deadline.classify("GET", "/api/v1/dashboard/abc") == deadline.GUARDIAN_READ
+    assert deadline.classify("GET", "/api/v1/admissions") == deadline.STATION_READ
+    assert deadline.classify("POST", "/api/v1/vitals") == deadline.WRITE
+    assert deadline.classify("PATCH", "/api/v1/documents/requests/1") == deadline.WRITE
+    assert deadline.classify("GET", "/health") is None
+    assert deadline.classify("POST", "/api/v1/dev/seed-single") is None
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_backoff_beyond_budget_is_abandoned(anyio_backend, breaker):
+    db = FakeAsyncClient()
+    db.inject_error(1.0, target="admissions")
+
+    started = time.monotonic()
+    with deadline.deadline_scope(0.3, deadline.STATION_READ):
+        with pytest.raises(DeadlineExceeded) as exc:
+            await execute_with_retry_async(db.table("admissions").select("id"))
+    # 첫 백오프(≥0.5s)가 예산보다 길어 sleep 없이 즉시 포기
+    assert time.monotonic() - started < 0.3
+    assert exc.value.route_class == deadline.STATION_READ
+    assert db.call_counts["admissions"] == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_slow_attempt_is_cut_at_deadline(anyio_backend, breaker):
+    db = FakeAsyncClient(latency_ms=500)
+
+    started = time.monotonic()
+    with deadline.deadline_scope(0.05, deadline.GUARDIAN_READ):
+        with pytest.raises(DeadlineExceeded):
+            await execute_with_retry_async(db.table("admissions").select("id"))
+    assert time.monotonic() - started < 0.3
+    # 예산 소진은 DB 장애가 아니므로 breaker 실패로 집계하지 않음
+    assert breaker.snapshot()["consecutive_failures"] == 0
+    assert deadline.remaining() is None
+
+
+def test_nested_scope_keeps_shorter_outer_deadline():
+    with deadline.deadline_scope(0.5, deadline.WRITE):
+        with deadline.deadline_scope(10, "custom"):
+            assert deadline.remaining() <= 0.5
+            assert deadline.route_class() == deadline.WRITE
@@ -0,0 +1,90 @@
+"""
+체온 차트 다운샘플링: 폭에 맞게 줄이면서 발열 피크·투약 기록을 잃지 않는지 검증합니다.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import downsample
+from dependencies import get_supabase
+from fake_supabase import FakeAsyncClient
+from routers import admissions, station
+
+
+def _series(n):
+    x = [float(i) for i in range(n)]
+    y = [36.5 + (i % 7) * 0.05 for i in range(n)]
+    return x, y
+
+
+def test_lttb_keeps_endpoints_and_spike():
+    x, y = _series(1000)
+    y[437] = 39.5
+    idx = downsample.lttb_indices(x, y, 50)
+    assert len(idx) == 50
+    assert idx[0] == 0 and idx[-1] == 999
+    assert idx == sorted(set(idx))
+    assert 437 in idx
+    assert downsample.lttb_indices(x[:10], y[:10], 50) == list(range(10))
+
+
+def test_numpy_and_python_paths_agree(monkeypatch):
+    np = pytest.importorskip("numpy")
+    x, y = _series(2000)
+    y[1234] = 40.1
+    vectorized = downsample.lttb_indices(x, y, 120)
+    monkeypatch.setattr(downsample, "np", None)
+    assert downsample.lttb_indices(x, y, 120) == vectorized
+    assert np is not None
+
+
+def test_series_endpoint_keeps_fever_and_medication():
+    db = FakeAsyncClient()
+    app = FastAPI()
+    app.include_router(admissions.router, prefix="/api/v1/admissions")
+    app.include_router(station.router, prefix="/api/v1")
+    app.dependency_overrides[get_supabase] = lambda: db
+
+    adm = db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"}])[0]
+    start = datetime(2026, 9, 1, tzinfo=timezone.utc)
+    rows = [
+        {"admission_id": adm["id"], "temperature": 36.6 + (i % 5) * 0.1,
+         "recorded_at": (start + timedelta(minutes=30 * i)).isoformat()}
+        for i in range(1200)
+    ]
+    rows[300]["temperature"] = 38.9
+    rows[301]["temperature"] = 38.4
+    rows[800].update(has_medication=True, medication_type="A")
+    db.seed("vital_signs", rows)
+
+    with TestClient(app) as client:
+        body = client.get(f"/api/v1/admissions/{adm['id']}/vitals/series", params={"width": 100}).json()
+        by_token = client.get(f"/api/v1/dashboard/{adm['access_token']}/vitals/series", params={"width": 100}).json()
+
+    assert body == by_token
+    assert body["total"] == 1200
+    assert len(body["points"]) <= 102
+    times = [p["recorded_at"] for p in body["points"]]
+    assert times == sorted(times)
+    assert 38.9 in [p["temperature"] for p in body["points"]]
+    assert any(p["has_medication"] and p["medication_type"] == "A" for p in body["points"])
+
+
+def test_series_reads_whole_history_in_max_rows_chunks(client_and_db, monkeypatch):
+    monkeypatch.setattr("services.history_service.SERIES_FETCH_ROWS", 500)
+    client, db = client_and_db
+    adm = db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"}])[0]
+    start = datetime(2026, 9, 1, tzinfo=timezone.utc)
+    # 같은 시각이 청크 경계(500번째 행)에 걸려도 누락·중복 없이 이어 읽음
+    db.seed("vital_signs", [
+        {"admission_id": adm["id"], "temperature": 36.8,
+         "recorded_at": (start + timedelta(minutes=30 * (i // 2))).isoformat()}
+        for i in range(1200)
+    ])
+    body = client.get(f"/api/v1/admissions/{adm['id']}/vitals/series", params={"width": 2000}).json()
+
+    assert db.call_counts["vital_signs"] == 3  # ceil(1200 / 500)
+    assert body["total"] == 1200
+    assert len({p["id"] for p in body["points"]}) == 1200
@@ -0,0 +1,44 @@
+"""
+조건부 GET: If-None-Match 가 현재 버전과 같으면 DB 조회 없이 304, 쓰기 이후에는 새 ETag 로 200 을 반환하는지 검증합니다.
+"""
+import pytest
+
+
+@pytest.fixture
+def routers():
+    return ("admissions", "station", "vitals")
+
+
+def test_dashboard_304_skips_detail_queries(client_and_db):
+    client, db = client_and_db
+    adm = db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"}])[0]
+    url = f"/api/v1/dashboard/{adm['access_token']}"
+
+    first = client.get(url)
+    tag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    calls = dict(db.call_counts)
+    second = client.get(url, headers={"If-None-Match": tag})
+    assert second.status_code == 304 and second.content == b""
+    assert db.call_counts.get("vital_signs") == calls.get("vital_signs")
+
+    assert client.post("/api/v1/vitals", json={"admission_id": adm["id"], "temperature": 38.1}).status_code == 201
+    third = client.get(url, headers={"If-None-Match": tag})
+    assert third.status_code == 200
+    assert third.headers["etag"] != tag
+    assert [v["temperature"] for v in third.json()["vitals"]] == [38.1]
+
+
+def test_station_list_etag(client_and_db):
+    client, db = client_and_db
+    adm = db.seed("admissions", [{"patient_name_masked": "이*희", "room_number": "302"}])[0]
+
+    first = client.get("/api/v1/admissions")
+    tag = first.headers["etag"]
+    views = db.call_counts.get("view_station_dashboard")
+    assert client.get("/api/v1/admissions", headers={"If-None-Match": f'W/{tag}, "other"'}).status_code == 304
+    assert db.call_counts.get("view_station_dashboard") == views
+
+    client.post("/api/v1/vitals", json={"admission_id": adm["id"], "temperature": 37.2})
+    assert client.get("/api/v1/admissions", headers={"If-None-Match": tag}).status_code == 200
@@ -0,0 +1,122 @@
+"""
+인메모리 Supabase 대체 백엔드(fake_supabase)가 서비스 계층이 사용하는
+PostgREST 부분집합과 RPC를 올바르게 재현하는지 검증합니다.
+"""
+import time
+
+import pytest
+from postgrest.exceptions import APIError
+
+from circuit_breaker import CircuitBreaker
+from fake_supabase import FakeAsyncClient
+from models import AdmissionCreate, TransferRequest
+from utils import execute_with_retry_async
+
+
+def _seed_admission(db: FakeAsyncClient, room: str = "301") -> dict:
+    return db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": room}])[0]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_select_filter_order_limit(anyio_backend):
+    db = FakeAsyncClient()
+    adm = _seed_admission(db)
+    db.seed("vital_signs", [
+        {"admission_id": adm["id"], "temperature": 36.5 + i / 10, "recorded_at": f"2026-03-0{i + 1}T00:00:00+00:00"}
+        for i in range(5)
+    ])
+
+    res = await db.table("vital_signs").select("id,temperature", count="exact") \
+        .eq("admission_id", adm["id"]).order("recorded_at", desc=True).limit(2).execute()
+
+    assert res.count == 5
+    assert [r["temperature"] for r in res.data] == [36.9, 36.8]
+    assert set(res.data[0].keys()) == {"id", "temperature"}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_station_view_breaks_timestamp_ties_by_id(anyio_backend):
+    db = FakeAsyncClient()
+    adm = _seed_admission(db)
+    at = "2026-03-01T00:00:00+00:00"
+    # 같은 시각: 뷰(ORDER BY recorded_at DESC, id DESC)처럼 id 가 큰 행이 최신. 저장 순서와 무관
+    db.seed("vital_signs", [{"id": 7, "admission_id": adm["id"], "temperature": 38.4, "recorded_at": at},
+                            {"id": 3, "admission_id": adm["id"], "temperature": 36.6, "recorded_at": at}])
+    db.seed("iv_records", [{"admission_id": adm["id"], "infusion_rate": rate, "created_at": at} for rate in (40, 60)])
+
+    res = await db.table("view_station_dashboard").select("*").execute()
+    assert res.data[0]["latest_temp"] == 38.4
+    assert res.data[0]["iv_rate"] == 60
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_inner_join_and_single(anyio_backend):
+    db = FakeAsyncClient()
+    adm = _seed_admission(db, "305")
+    db.seed("document_requests", [
+        {"admission_id": adm["id"], "request_items": ["RECEIPT"]},
+        {"admission_id": "orphan", "request_items": ["CERT"]},
+    ])
+
+    res = await db.table("document_requests") \
+        .select("id, request_items, admissions!inner(room_number)").eq("status", "PENDING").execute()
+    assert len(res.data) == 1
+    assert res.data[0]["admissions"] == {"room_number": "305"}
+
+    with pytest.raises(APIError) as exc:
+        await db.table("admissions").select("id").eq("room_number", "999").single().execute()
+    assert exc.value.code == "PGRST116"
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_admission_rpc_lifecycle_and_view(anyio_backend, monkeypatch):
+    from services import admission_service
+
+    broadcasts = []
+
+    async def capture(manager, msg, token=None):
+        broadcasts.append(msg["type"])
+
+    monkeypatch.setattr(admission_service, "broadcast_to_station_and_patient", capture)
+    db = FakeAsyncClient()
+
+    created = await admission_service.create_admission(db, AdmissionCreate(patient_name="홍길동", room_number="301"))
+    assert created["access_token"]
+
+    rows = await admission_service.list_active_admissions_enriched(db)
+    assert [r["room_number"] for r in rows] == ["301"]
+
+    await admission_service.transfer_patient(db, created["id"], TransferRequest(target_room="302"))
+    await admission_service.discharge_patient(db, created["id"])
+
+    assert await admission_service.list_active_admissions_enriched(db) == []
+    assert broadcasts == ["ADMISSION_TRANSFERRED", "ADMISSION_DISCHARGED"]
+    assert [a["action"] for a in db.rows("audit_logs")] == ["CREATE", "TRANSFER", "DISCHARGE"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_latency_and_error_injection(anyio_backend, monkeypatch):
+    db = FakeAsyncClient(seed=1)
+    db.set_latency(20, target="admissions")
+    started = time.perf_counter()
+    await db.table("admissions").select("id").execute()
+    assert time.perf_counter() - started >= 0.018
+
+    # 재시도 백오프 대기는 생략 (utils.asyncio 는 전역 asyncio 모듈이므로 fake 가 사용하는 sleep 도 함께 대체됨)
+    monkeypatch.setattr("utils.asyncio.sleep", _no_sleep)
+    # 공유 circuit breaker 상태가 다른 테스트로 새지 않도록 격리
+    monkeypatch.setattr("utils.db_breaker", CircuitBreaker(failure_threshold=100))
+    db.inject_error(1.0, target="vital_signs")
+    with pytest.raises(APIError):
+        await execute_with_retry_async(db.table("vital_signs").select("id"))
+    # 503 주입 오류는 재시도 대상이므로 최대 시도 횟수만큼 호출되어야 함
+    assert db.call_counts["vital_signs"] == 5
+
+
+async def _no_sleep(_seconds):
+    return None
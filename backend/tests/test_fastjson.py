@@ -0,0 +1,53 @@
+"""
+fastjson: orjson 경로와 표준 json 대체 경로가 같은 바이트를 만들고, 브로드캐스트는 채널 수와 무관하게 한 번만 직렬화하는지 검증합니다.
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+import fastjson
+from utils import broadcast_to_station_and_patient
+
+
+PAYLOAD = {
+    "id": UUID("3f0c2a1e-8a55-4c0a-9d53-2f7a9b1c0d11"),
+    "room": "301",
+    "name": "김*수",
+    "temperature": Decimal("38.5"),
+    "recorded_at": datetime(2026, 10, 1, 9, 30, tzinfo=timezone.utc),
+    "items": ("RECEIPT", "DETAIL"),
+    "note": None,
+}
+
+
+def test_fallback_matches_orjson(monkeypatch):
+    pytest.importorskip("orjson")
+    fast = fastjson.dumpb(PAYLOAD)
+    monkeypatch.setattr(fastjson, "orjson", None)
+    assert fastjson.dumpb(PAYLOAD) == fast
+    assert fastjson.FastJSONResponse(PAYLOAD).body == fast
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_broadcast_serializes_once(monkeypatch, anyio_backend):
+    calls = []
+    real_dumps = fastjson.dumps
+
+    def counting_dumps(obj):
+        calls.append(obj)
+        return real_dumps(obj)
+    monkeypatch.setattr(fastjson, "dumps", counting_dumps)
+
+    sent = []
+
+    class Manager:
+        async def broadcast(self, message, token):
+            sent.append((token, message))
+
+    await broadcast_to_station_and_patient(Manager(), {"type": "NEW_VITAL", "data": PAYLOAD}, "tok")
+    assert len(calls) == 1
+    assert [t for t, _ in sent] == ["STATION", "tok"]
+    assert sent[0][1] is sent[1][1]
@@ -0,0 +1,78 @@
+"""
+Hedged reads: p95 초과 시 두 번째 요청 발송, 먼저 온 응답 사용, 예산 제한을 검증합니다.
+"""
+import asyncio
+import time
+
+import pytest
+
+from fake_supabase import FakeAsyncClient
+from hedging import HedgeBudget, Hedger, LatencyTracker
+from utils import execute_with_retry_async
+
+
+def _warm_tracker(key: str, seconds: float) -> LatencyTracker:
+    tracker = LatencyTracker(min_samples=20)
+    for _ in range(20):
+        tracker.observe(key, seconds)
+    return tracker
+
+
+def _slow_then_fast():
+    calls = {"n": 0}
+
+    async def fn():
+        calls["n"] += 1
+        n = calls["n"]
+        await asyncio.sleep(0.5 if n == 1 else 0.01)
+        return n
+    return fn, calls
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_hedge_wins_when_primary_exceeds_p95(anyio_backend):
+    hedger = Hedger(tracker=_warm_tracker("vital_signs", 0.02))
+    fn, calls = _slow_then_fast()
+
+    started = time.perf_counter()
+    result = await hedger.run("vital_signs", fn)
+    assert result == 2  # hedge 응답 사용
+    assert time.perf_counter() - started < 0.2
+    assert hedger.stats()["hedges"] == 1
+    assert hedger.stats()["hedge_wins"] == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_hedges_are_budget_limited(anyio_backend):
+    hedger = Hedger(tracker=_warm_tracker("admissions", 0.001), budget=HedgeBudget(ratio=0.05))
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    await asyncio.gather(*(hedger.run("admissions", slow) for _ in range(20)))
+    stats = hedger.stats()
+    # 초기 토큰 1 + 20 요청 × 5% = 최대 2회
+    assert stats["hedges"] <= 2
+    assert stats["denied"] >= 18
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_execute_with_retry_hedges_only_when_enabled_reads(anyio_backend, monkeypatch):
+    db = FakeAsyncClient(latency_ms=50)
+    db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"}])
+    hedger = Hedger(tracker=_warm_tracker("admissions", 0.005))
+    monkeypatch.setattr("utils.hedger", hedger)
+    monkeypatch.setattr("utils.HEDGING_ENABLED", True)
+
+    res = await execute_with_retry_async(db.table("admissions").select("room_number"), hedge=True)
+    assert res.data == [{"room_number": "301"}]
+    assert db.call_counts["admissions"] == 2
+
+    # 쓰기는 hedge 대상이 아님
+    await execute_with_retry_async(db.table("admissions").update({"room_number": "302"}).eq("room_number", "301"), hedge=True)
+    assert db.call_counts["admissions"] == 3
+    assert hedger.stats()["requests"] == 1
@@ -0,0 +1,50 @@
+"""
+활력징후/수액 이력 keyset 페이지: 같은 시각의 행이 페이지 경계에 걸려도 누락·중복 없이 최신순으로 이어지는지 검증합니다.
+"""
+import pytest
+
+
+@pytest.fixture
+def routers():
+    return ("admissions",)
+
+
+def _walk(client, url, limit):
+    ids, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        body = client.get(url, params=params).json()
+        ids += [row["id"] for row in body["items"]]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+
+def test_vitals_history_pages_across_equal_timestamps(client_and_db):
+    client, db = client_and_db
+    adm = db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"}])[0]
+    other = db.seed("admissions", [{"patient_name_masked": "이*희", "room_number": "302"}])[0]
+    times = ["2026-10-01T09:00:00+00:00"] * 3 + ["2026-10-02T09:00:00+00:00"] * 4
+    rows = db.seed("vital_signs", [{"admission_id": adm["id"], "temperature": 37.0, "recorded_at": t} for t in times])
+    db.seed("vital_signs", [{"admission_id": other["id"], "temperature": 36.5, "recorded_at": times[0]}])
+
+    ids, pages = _walk(client, f"/api/v1/admissions/{adm['id']}/vitals/history", limit=2)
+    expected = [r["id"] for r in sorted(rows, key=lambda r: (r["recorded_at"], r["id"]), reverse=True)]
+    assert ids == expected
+    assert pages == 4
+
+
+def test_iv_history_default_page_and_invalid_cursor(client_and_db):
+    client, db = client_and_db
+    adm = db.seed("admissions", [{"patient_name_masked": "박*민", "room_number": "303"}])[0]
+    db.seed("iv_records", [{"admission_id": adm["id"], "infusion_rate": 20, "created_at": "2026-10-01T09:00:00+00:00"}])
+    url = f"/api/v1/admissions/{adm['id']}/iv-records/history"
+
+    res = client.get(url)
+    assert res.status_code == 200
+    assert res.json()["next_cursor"] is None
+    assert [r["infusion_rate"] for r in res.json()["items"]] == [20]
+
+    assert client.get(url, params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get(url, params={"limit": 0}).status_code == 422
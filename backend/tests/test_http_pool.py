@@ -0,0 +1,74 @@
+"""
+공유 httpx 풀 설정이 transport 에 반영되고, in-flight/대기 시간 계측이 동작하는지 검증합니다.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+import http_pool
+from fake_supabase import FakeAsyncClient
+from http_pool import InstrumentedTransport, PoolConfig
+
+
+class _Body(httpx.AsyncByteStream):
+    async def __aiter__(self):
+        yield b'[{"id": 1}]'
+
+
+class _SlowTransport(httpx.AsyncBaseTransport):
+    """httpcore 처럼 커넥션 배정 후 trace 이벤트를 발생시키는 테스트용 transport."""
+
+    def __init__(self, pool_slots: int):
+        self._slots = asyncio.Semaphore(pool_slots)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        async with self._slots:
+            await request.extensions["trace"]("http11.send_request_headers.started", {})
+            await asyncio.sleep(0.02)
+        return httpx.Response(200, stream=_Body())
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_instrumented_transport_tracks_in_flight_and_wait(anyio_backend):
+    transport = InstrumentedTransport(_SlowTransport(pool_slots=2))
+    async with httpx.AsyncClient(transport=transport, base_url="http://db") as client:
+        await asyncio.gather(*(client.get("/rest/v1/admissions") for _ in range(6)))
+
+    stats = transport.stats()
+    assert stats["requests"] == 6
+    assert stats["peak_in_flight"] == 6
+    assert stats["in_flight"] == 0
+    # 슬롯 2개에 6개 요청 → 마지막 배치는 앞선 두 배치를 기다림
+    assert stats["wait_ms"]["max"] >= 30
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_build_http_client_applies_config_and_warm_up(anyio_backend):
+    config = PoolConfig(max_connections=7, max_keepalive=3, keepalive_expiry=12, http2=False, warmup_connections=4)
+    client = http_pool.build_http_client(config)
+    try:
+        pool = http_pool._transport._inner._pool
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+        assert pool._keepalive_expiry == 12
+        assert client.timeout.connect == config.connect_timeout
+        assert http_pool.pool_stats()["max_connections"] == 7
+
+        # HTTP/1.1: 커넥션마다 경량 쿼리 1건 (무거운 스테이션 뷰는 조회하지 않음)
+        db = FakeAsyncClient()
+        await http_pool.warm_up(db)
+        assert db.call_counts["admissions"] == 3  # warmup_connections=4 이지만 keep-alive 한도 3
+        assert "view_station_dashboard" not in db.call_counts
+    finally:
+        await http_pool.aclose()
+    assert http_pool.pool_stats() is None
+
+
+def test_warmup_count_follows_connection_model():
+    # HTTP/2 는 한 커넥션에 다중화되므로 병렬 요청을 여러 개 보내도 커넥션은 하나
+    assert PoolConfig(http2=True, warmup_connections=6).warmup_count() == 1
+    assert PoolConfig(http2=False, warmup_connections=6).warmup_count() == 6
+    assert PoolConfig(http2=False, warmup_connections=0).warmup_count() == 1
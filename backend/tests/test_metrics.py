@@ -0,0 +1,69 @@
+"""
+DB 호출 계측(지연·행 수·재시도·오류 분류)과 Prometheus 텍스트 출력을 검증합니다.
+"""
+import pytest
+
+import metrics
+from circuit_breaker import CircuitBreaker, RetryBudget
+from fake_supabase import FakeAsyncClient
+from utils import execute_instrumented_async, execute_with_retry_async
+
+
+@pytest.fixture
+def fresh_metrics(monkeypatch):
+    for name, metric in [
+        ("db_query_duration", metrics.Histogram("db_query_duration_seconds", "t", metrics.LATENCY_BUCKETS, ("target", "method", "outcome"))),
+        ("db_query_rows", metrics.Histogram("db_query_rows", "t", metrics.ROW_BUCKETS, ("target",))),
+        ("db_query_retries", metrics.Counter("db_query_retries_total", "t", ("target",))),
+        ("db_query_errors", metrics.Counter("db_query_errors_total", "t", ("target", "error_class"))),
+    ]:
+        monkeypatch.setattr(metrics, name, metric)
+    registry = metrics.Registry()
+    for name in ("db_query_duration", "db_query_rows", "db_query_retries", "db_query_errors"):
+        registry.register(getattr(metrics, name))
+    monkeypatch.setattr(metrics, "registry", registry)
+    monkeypatch.setattr("utils.db_breaker", CircuitBreaker(failure_threshold=100))
+    monkeypatch.setattr("utils.retry_budget", RetryBudget(capacity=100))
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_query_and_rpc_are_instrumented(anyio_backend, fresh_metrics, monkeypatch):
+    db = FakeAsyncClient()
+    db.seed("vital_signs", [{"admission_id": "a", "temperature": 37.0} for _ in range(3)])
+
+    await execute_with_retry_async(db.table("vital_signs").select("id").eq("admission_id", "a"))
+    assert metrics.db_query_duration.count(target="vital_signs", method="GET", outcome="ok") == 1
+    assert metrics.db_query_rows.count(target="vital_signs") == 1
+
+    # 재시도 후 성공: 오류 분류 + 재시도 카운트
+    async def no_sleep(_):
+        return None
+    monkeypatch.setattr("utils.asyncio.sleep", no_sleep)
+    db.inject_error(1.0, target="admissions")
+    with pytest.raises(Exception):
+        await execute_with_retry_async(db.table("admissions").select("id"))
+    assert metrics.db_query_errors.value(target="admissions", error_class="APIError:503") == 5
+    assert metrics.db_query_retries.value(target="admissions") == 4
+    assert metrics.db_query_duration.count(target="admissions", method="GET", outcome="error") == 1
+
+    # 재시도 없는 트랜잭션 RPC
+    with pytest.raises(Exception):
+        await execute_instrumented_async(db.rpc("no_such_function", {}))
+    assert metrics.db_query_errors.value(target="rpc/no_such_function", error_class="APIError:PGRST202") == 1
+    assert metrics.db_query_duration.count(target="rpc/no_such_function", method="POST", outcome="error") == 1
+
+
+def test_render_prometheus_text_format(fresh_metrics):
+    metrics.observe_query("admissions", "GET", 0.02, "ok", rows=2)
+    metrics.db_query_errors.inc(target="rpc/x", error_class='Err"or')
+    text = metrics.render_prometheus([("db_circuit_state", "state", 0, {})], [("db_circuit_opened_total", "opened", 2, {})])
+
+    assert '# TYPE db_query_duration_seconds histogram' in text
+    assert 'db_query_duration_seconds_bucket{target="admissions",method="GET",outcome="ok",le="0.01"} 0' in text
+    assert 'db_query_duration_seconds_bucket{target="admissions",method="GET",outcome="ok",le="0.025"} 1' in text
+    assert 'db_query_duration_seconds_count{target="admissions",method="GET",outcome="ok"} 1' in text
+    assert 'db_query_rows_bucket{target="admissions",le="5"} 1' in text
+    assert 'db_query_errors_total{target="rpc/x",error_class="Err\\"or"} 1' in text
+    assert "# TYPE db_circuit_state gauge\ndb_circuit_state 0\n" in text
+    assert "# TYPE db_circuit_opened_total counter\ndb_circuit_opened_total 2\n" in text
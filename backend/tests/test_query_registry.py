@@ -0,0 +1,79 @@
+"""
+이름 기반 쿼리 레지스트리: projection/필터, TTL 캐시와 무효화, 쿼리별 타임아웃 정책을 검증합니다.
+"""
+import pytest
+
+import query_registry
+from deadline import DeadlineExceeded
+from fake_supabase import FakeAsyncClient
+from query_registry import NamedQuery, QueryPolicy, run_query
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    query_registry.invalidate()
+    yield
+    query_registry.invalidate()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_token_lookup_is_cached_and_invalidated_on_discharge(anyio_backend, monkeypatch):
+    async def no_broadcast(*args, **kwargs):
+        return None
+    monkeypatch.setattr("services.admission_service.broadcast_to_station_and_patient", no_broadcast)
+    from services.admission_service import discharge_patient
+
+    db = FakeAsyncClient()
+    adm = db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"}])[0]
+
+    rows = await run_query(db, "active_admission_by_token", token=adm["access_token"])
+    assert rows == [{"id": adm["id"], "room_number": "301"}]
+    await run_query(db, "active_admission_by_token", token=adm["access_token"])
+    assert db.call_counts["admissions"] == 1  # TTL 캐시 hit
+
+    await discharge_patient(db, adm["id"])
+    assert await run_query(db, "active_admission_by_token", token=adm["access_token"]) == []
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_cached_rows_are_isolated_copies(anyio_backend):
+    db = FakeAsyncClient()
+    adm = db.seed("admissions", [{"patient_name_masked": "이*희", "room_number": "302"}])[0]
+
+    first = await run_query(db, "admission_broadcast_target", admission_id=adm["id"])
+    first[0]["room_number"] = "999"
+    second = await run_query(db, "admission_broadcast_target", admission_id=adm["id"])
+    assert second == [{"access_token": adm["access_token"], "room_number": "302"}]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_dashboard_sections_and_station_list_are_registered(anyio_backend):
+    db = FakeAsyncClient()
+    adm = db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"}])[0]
+    db.seed("vital_signs", [
+        {"admission_id": adm["id"], "temperature": 36.5 + i / 10, "recorded_at": f"2026-10-17T0{i}:00:00+00:00"}
+        for i in range(3)
+    ])
+
+    vitals = await run_query(db, "dashboard_vitals", admission_id=adm["id"])
+    assert [v["temperature"] for v in vitals] == [36.7, 36.6, 36.5]
+    assert set(vitals[0]) == set(query_registry.SECTION_COLUMNS["vitals"].split(","))
+    assert [row["id"] for row in await run_query(db, "station_list")] == [adm["id"]]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_query_timeout_policy(anyio_backend, monkeypatch):
+    monkeypatch.setitem(query_registry.QUERIES, "slow_admissions", NamedQuery(
+        name="slow_admissions",
+        table="admissions",
+        columns="id",
+        build=lambda q: q,
+        policy=QueryPolicy(timeout=0.05),
+    ))
+    db = FakeAsyncClient(latency_ms=300)
+    with pytest.raises(DeadlineExceeded):
+        await run_query(db, "slow_admissions")
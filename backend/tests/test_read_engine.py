@@ -0,0 +1,119 @@
+"""
+asyncpg 읽기 엔진: 값 변환이 PostgREST JSON 표현과 같고, 엔진 오류 시 PostgREST 로 폴백하는지 검증합니다.
+(asyncpg 없이 실행 가능하도록 엔진 객체만 대체)
+"""
+import asyncio
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+import deadline
+import metrics
+import read_engine
+import utils
+from circuit_breaker import OPEN, CircuitBreaker
+from deadline import DeadlineExceeded
+from fake_supabase import FakeAsyncClient
+from services.dashboard import fetch_dashboard_data
+
+
+class _StubEngine:
+    def __init__(self, rows: dict[str, list[dict]] | None = None, fail: bool = False, delay: float = 0.0):
+        self.rows = rows or {}
+        self.fail = fail
+        self.delay = delay
+        self.calls: list[str] = []
+
+    async def fetch(self, name: str, *args) -> list[dict]:
+        self.calls.append(name)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("connection refused")
+        return self.rows.get(name, [])
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers(monkeypatch):
+    monkeypatch.setattr(read_engine, "engine_breaker", CircuitBreaker(failure_threshold=3))
+    monkeypatch.setattr("utils.db_breaker", CircuitBreaker(failure_threshold=100))
+
+
+def test_to_json_value_matches_postgrest_representation():
+    aid = uuid.uuid4()
+    assert read_engine.to_json_value(aid) == str(aid)
+    assert read_engine.to_json_value(datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)) == "2026-01-02T03:04:05+00:00"
+    assert read_engine.to_json_value(date(2026, 1, 2)) == "2026-01-02"
+    assert read_engine.to_json_value(Decimal("37.5")) == 37.5
+    value = read_engine.to_json_value(Decimal("40"))
+    assert value == 40.0 and isinstance(value, float)
+    assert read_engine.to_json_value([aid]) == [str(aid)]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_dashboard_uses_engine_and_falls_back(anyio_backend, monkeypatch):
+    monkeypatch.setattr("services.dashboard.create_audit_log", lambda *a, **k: _noop())
+    db = FakeAsyncClient()
+    adm = db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"}])[0]
+
+    engine = _StubEngine({"admission": [{"id": adm["id"], "patient_name_masked": "이*희"}]})
+    monkeypatch.setattr(read_engine, "_engine", engine)
+    result = await fetch_dashboard_data(db, adm["id"])
+    assert result["admission"]["display_name"] == "이*희"
+    assert set(engine.calls) == set(read_engine.DASHBOARD_QUERIES)
+    assert sum(db.call_counts.values()) == 0
+
+    # 엔진 장애 → PostgREST(fake) 경로
+    monkeypatch.setattr(read_engine, "_engine", _StubEngine(fail=True))
+    result = await fetch_dashboard_data(db, adm["id"])
+    assert result["admission"]["room_number"] == "301"
+    assert db.call_counts["admissions"] == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_token_lookup_rejects_non_uuid_without_query(anyio_backend, monkeypatch):
+    engine = _StubEngine()
+    monkeypatch.setattr(read_engine, "_engine", engine)
+    assert await read_engine.fetch_active_admission("not-a-uuid") == []
+    assert engine.calls == []
+
+    monkeypatch.setattr(read_engine, "_engine", None)
+    assert await read_engine.fetch_active_admission(str(uuid.uuid4())) is None
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_engine_calls_share_deadline_breaker_and_metrics(anyio_backend, monkeypatch):
+    token = str(uuid.uuid4())
+    engine = _StubEngine({"active_admission_by_token": [{"id": "a", "room_number": "301"}]})
+    monkeypatch.setattr(read_engine, "_engine", engine)
+    before = metrics.db_query_duration.count(target="asyncpg/active_admission_by_token", method="GET", outcome="ok")
+    assert await read_engine.fetch_active_admission(token) == [{"id": "a", "room_number": "301"}]
+    assert metrics.db_query_duration.count(
+        target="asyncpg/active_admission_by_token", method="GET", outcome="ok") == before + 1
+
+    # 요청 예산 소진: PostgREST 로 폴백하지 않고 504 로 전파
+    monkeypatch.setattr(read_engine, "_engine", _StubEngine(delay=0.5))
+    with deadline.deadline_scope(0.02, deadline.GUARDIAN_READ):
+        with pytest.raises(DeadlineExceeded):
+            await read_engine.fetch_active_admission(token)
+
+    # 연결 장애가 이어지면 엔진 breaker 가 열려 더는 연결을 시도하지 않고 바로 폴백 (db_breaker 는 그대로)
+    failing = _StubEngine(fail=True)
+    monkeypatch.setattr(read_engine, "_engine", failing)
+    for _ in range(3):
+        assert await read_engine.fetch_active_admission(token) is None
+    assert read_engine.engine_breaker.state == OPEN
+    assert await read_engine.fetch_active_admission(token) is None
+    assert len(failing.calls) == 3
+    assert metrics.db_query_errors.value(
+        target="asyncpg/active_admission_by_token", error_class="ConnectionError") >= 3
+    assert utils.db_breaker.snapshot()["consecutive_failures"] == 0
+
+
+async def _noop():
+    return None
+
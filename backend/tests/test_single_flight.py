@@ -0,0 +1,100 @@
+"""
+동시 동일 읽기 쿼리가 하나의 DB 호출로 합쳐지고(single-flight),
+쓰기 쿼리·비활성 호출은 합쳐지지 않는지 검증합니다.
+"""
+import asyncio
+
+import pytest
+
+import deadline
+from deadline import DeadlineExceeded
+from fake_supabase import FakeAsyncClient
+from single_flight import SingleFlight
+from utils import execute_with_retry_async
+
+
+@pytest.fixture
+def sf(monkeypatch):
+    instance = SingleFlight()
+    monkeypatch.setattr("utils.single_flight", instance)
+    return instance
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_concurrent_identical_reads_share_one_call(anyio_backend, sf):
+    db = FakeAsyncClient(latency_ms=20)
+    db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"}])
+
+    results = await asyncio.gather(*(
+        execute_with_retry_async(db.table("admissions").select("id,room_number").eq("room_number", "301"), coalesce=True)
+        for _ in range(10)
+    ))
+
+    assert db.call_counts["admissions"] == 1
+    assert sf.stats()["collapsed"] == 9
+    assert sf.stats()["inflight"] == 0
+    # follower 는 독립된 복사본을 받아야 함
+    results[1].data[0]["room_number"] = "999"
+    assert results[0].data[0]["room_number"] == "301"
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_different_filters_and_writes_are_not_collapsed(anyio_backend, sf):
+    db = FakeAsyncClient(latency_ms=10)
+
+    await asyncio.gather(
+        execute_with_retry_async(db.table("vital_signs").select("id").eq("admission_id", "a"), coalesce=True),
+        execute_with_retry_async(db.table("vital_signs").select("id").eq("admission_id", "b"), coalesce=True),
+        execute_with_retry_async(db.table("vital_signs").insert({"admission_id": "a", "temperature": 37}), coalesce=True),
+        execute_with_retry_async(db.table("vital_signs").insert({"admission_id": "a", "temperature": 37}), coalesce=True),
+    )
+
+    assert db.call_counts["vital_signs"] == 4
+    assert sf.stats()["collapsed"] == 0
+    assert len(db.rows("vital_signs")) == 2
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_follower_waits_with_its_own_deadline(anyio_backend):
+    sf = SingleFlight()
+    seen_deadlines = []
+
+    async def slow_read():
+        seen_deadlines.append(deadline.remaining())
+        await asyncio.sleep(0.05)
+        return {"rows": 1}
+
+    async def call(budget: float):
+        with deadline.deadline_scope(budget, deadline.GUARDIAN_READ):
+            return await sf.do("key", slow_read)
+
+    leader, follower = await asyncio.gather(call(0.01), call(1.0), return_exceptions=True)
+
+    # 공유 호출은 leader 의 데드라인을 물려받지 않음 → 예산이 긴 follower 는 결과를 받음
+    assert seen_deadlines == [None]
+    assert isinstance(leader, DeadlineExceeded)
+    assert follower == {"rows": 1}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_shared_call_is_cancelled_when_every_waiter_gives_up(anyio_backend):
+    sf = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def hanging_read():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with deadline.deadline_scope(0.01, deadline.GUARDIAN_READ):
+        with pytest.raises(DeadlineExceeded):
+            await sf.do("key", hanging_read)
+
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    assert sf.stats()["inflight"] == 0
@@ -0,0 +1,122 @@
+"""
+스테이션 보드: 최초 1회만 뷰를 읽고 이후 쓰기 이벤트로 메모리 행을 갱신하며,
+reconcile 이 이벤트를 거치지 않은 DB 변경(드리프트)을 찾아 교체하는지 검증합니다.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from fake_supabase import FakeAsyncClient
+from models import TransferRequest
+from services import admission_service
+from station_board import StationBoard, station_board
+
+
+@pytest.fixture
+def routers():
+    return ("admissions", "vitals", "iv_records")
+
+
+def test_list_served_from_memory_after_events(client_and_db):
+    client, db = client_and_db
+    adm = db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"}])[0]
+
+    assert client.get("/api/v1/admissions").json()[0]["latest_temp"] is None
+    client.post("/api/v1/vitals", json={"admission_id": adm["id"], "temperature": 38.6})
+    client.post("/api/v1/iv-records", json={"admission_id": adm["id"], "infusion_rate": 45})
+
+    row = client.get("/api/v1/admissions").json()[0]
+    assert row["latest_temp"] == 38.6 and row["had_fever_in_6h"] is True
+    assert row["latest_iv"]["infusion_rate"] == 45
+    assert db.call_counts["view_station_dashboard"] == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_transfer_discharge_and_reconcile(anyio_backend, monkeypatch):
+    async def noop(*args, **kwargs):
+        return None
+    monkeypatch.setattr("services.admission_service.broadcast_to_station_and_patient", noop)
+    db = FakeAsyncClient()
+    a, b = db.seed("admissions", [{"patient_name_masked": "이*희", "room_number": "302"},
+                                  {"patient_name_masked": "박*민", "room_number": "303"}])
+    fetch = lambda: admission_service.fetch_station_view(db)  # noqa: E731
+
+    await admission_service.list_active_admissions_enriched(db)
+    await admission_service.transfer_patient(db, a["id"], TransferRequest(target_room="305"))
+    await admission_service.discharge_patient(db, b["id"])
+    rows = await admission_service.list_active_admissions_enriched(db)
+    assert [(r["id"], r["room_number"]) for r in rows] == [(a["id"], "305")]
+    assert db.call_counts["view_station_dashboard"] == 1
+    assert await station_board.reconcile(fetch) == 0
+
+    # 이벤트 없이 DB 만 바뀐 경우 (다른 인스턴스 등) -> reconcile 이 드리프트로 감지 후 교체
+    seven_hours_ago = (datetime.now(timezone.utc) - timedelta(hours=7)).isoformat()
+    db.seed("vital_signs", [{"admission_id": a["id"], "temperature": 39.0, "recorded_at": seven_hours_ago}])
+    assert await station_board.reconcile(fetch) == 1
+    row = (await admission_service.list_active_admissions_enriched(db))[0]
+    assert row["latest_temp"] == 39.0 and row["had_fever_in_6h"] is False
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_events_during_load_are_replayed(anyio_backend):
+    board = StationBoard()
+    old = {"id": "a1", "latest_temp": 36.5, "last_vital_at": "2026-10-01T09:00:00+00:00", "had_fever_in_6h": False}
+
+    async def slow_fetch():
+        # 조회 도중 도착한 이벤트 (적재 결과는 이벤트 이전 상태)
+        board.apply_change("a1", "vitals", {"temperature": 37.9, "recorded_at": "2026-10-01T10:00:00+00:00"})
+        return [dict(old)]
+
+    rows = await board.rows(slow_fetch)
+    assert rows[0]["latest_temp"] == 37.9
+
+    board.invalidate()
+    assert board.stats()["loaded"] is False
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_reconcile_skips_rows_touched_during_fetch(anyio_backend):
+    board = StationBoard()
+    rows = [
+        {"id": "a1", "room_number": "301", "latest_temp": 36.5, "last_vital_at": "2026-10-01T09:00:00+00:00"},
+        {"id": "a2", "room_number": "302", "latest_temp": 36.8, "last_vital_at": "2026-10-01T09:00:00+00:00"},
+        {"id": "a3", "room_number": "303", "latest_temp": 37.0, "last_vital_at": "2026-10-01T09:00:00+00:00"},
+    ]
+
+    async def fetch():
+        return [dict(r) for r in rows]
+    await board.load(fetch)
+
+    async def fetch_with_writes():
+        # 조회 시점 스냅샷 이후 a1 활력징후 기록, a2 퇴원. a3 은 이벤트 없이 DB 만 바뀜 (진짜 드리프트)
+        snapshot = [dict(r) for r in rows]
+        snapshot[2]["latest_temp"] = 38.2
+        board.apply_change("a1", "vitals", {"temperature": 37.9, "recorded_at": "2026-10-01T10:00:00+00:00"})
+        board.remove("a2")
+        return snapshot
+
+    assert await board.reconcile(fetch_with_writes) == 1
+    current = {r["id"]: r for r in await board.rows(fetch)}
+    assert sorted(current) == ["a1", "a3"]
+    assert current["a1"]["latest_temp"] == 37.9 and current["a3"]["latest_temp"] == 38.2
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_board_table_source_falls_back_when_not_deployed(anyio_backend, monkeypatch):
+    monkeypatch.setattr(admission_service, "STATION_BOARD_TABLE", True)
+    monkeypatch.setattr(admission_service, "_board_table_missing", False)
+    db = FakeAsyncClient()
+    db.seed("admissions", [{"patient_name_masked": "김*수", "room_number": "301"}])
+
+    from_table = await admission_service.fetch_station_view(db)
+    assert db.call_counts == {"view_station_board": 1}
+
+    # 마이그레이션 미적용(PGRST205): 한 번만 확인하고 이후 view_station_dashboard
+    monkeypatch.delattr(FakeAsyncClient, "_view_station_board")
+    for _ in range(2):
+        assert await admission_service.fetch_station_view(db) == from_table
+    assert db.call_counts == {"view_station_board": 2, "view_station_dashboard": 2}
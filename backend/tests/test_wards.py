@@ -0,0 +1,90 @@
+"""
+병동 채널: 병실 번호 → 병동 매핑, 구독 채널(연결당 하나), 브로드캐스트·스테이션 PATCH 가
+해당 병동을 담당하는 채널과 전체 채널로만 가고 채널별 버전이 이어지는지 검증합니다.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+import dashboard_patches
+import wards
+from change_journal import ChangeJournal
+from dashboard_patches import PatchPublisher
+from station_board import station_board
+from utils import broadcast_to_station_and_patient
+
+ADM = "3f0c2a1e-8a55-4c0a-9d53-2f7a9b1c0d11"
+
+
+def test_ward_for_room_uses_longest_prefix_then_floor(monkeypatch):
+    monkeypatch.setattr(wards, "WARD_MAP", wards.parse_ward_map("31=3B, 310=3A,bad,4=4W"))
+    assert wards.ward_for_room("310-1") == "3A"
+    assert wards.ward_for_room("312-2") == "3B"
+    assert wards.ward_for_room("401") == "4W"
+    assert wards.ward_for_room("501") == "5"
+    assert wards.ward_for_room(None) is None
+    # 순서·중복과 무관하게 같은 채널 하나
+    assert wards.subscription_channel(" 4W,3A,3A ") == wards.subscription_channel("3A,4W") == "STATION:3A,4W"
+    assert wards.subscription_channel(None) == "STATION"
+    assert wards.channel_wards("STATION:3A,4W") == {"3A", "4W"} and wards.channel_wards("STATION") is None
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_broadcast_reaches_each_station_connection_once(anyio_backend):
+    sent = []
+
+    class Manager:
+        active_connections = {"STATION": set(), "STATION:3": set(), "STATION:3,4": set(), "STATION:5": set(),
+                              "tok": set()}
+
+        async def broadcast(self, message, token):
+            sent.append(token)
+
+    await broadcast_to_station_and_patient(Manager(), {"type": "ADMISSION_TRANSFERRED",
+                                                       "data": {"old_room": "301", "new_room": "402"}}, "tok")
+    assert sent == ["STATION", "STATION:3", "STATION:3,4", "tok"]
+
+    # 병실을 알 수 없는 메시지는 연결된 모든 스테이션 채널로 (채널당 한 번)
+    sent.clear()
+    await broadcast_to_station_and_patient(Manager(), {"type": "NEW_DOC_REQUEST", "data": {}})
+    assert sent == ["STATION", "STATION:3", "STATION:3,4", "STATION:5"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_station_patches_are_versioned_per_channel(anyio_backend, monkeypatch):
+    connections = {"STATION": set(), "STATION:3": set(), "STATION:4": set(), "STATION:3,4": set()}
+    monkeypatch.setattr(dashboard_patches, "manager", SimpleNamespace(active_connections=connections))
+    journal = ChangeJournal()
+    batch = []
+    journal.subscribe(lambda *args: batch.append((journal.epoch, *args)))
+    row = {
+        "id": ADM, "room_number": "301", "display_name": "김*수", "access_token": "tok", "dob": None, "gender": "M",
+        "check_in_at": None, "latest_temp": None, "last_vital_at": None, "had_fever_in_6h": False, "iv_rate": None,
+        "iv_photo": None, "meal_type": None, "pediatric_meal_type": None, "guardian_meal_type": None,
+        "meal_requested_at": None,
+    }
+
+    async def fetch():
+        return [row]
+    await station_board.load(fetch)
+    publisher = PatchPublisher()
+
+    journal.record_upsert(ADM, "iv_records", {"id": 1, "admission_id": ADM, "infusion_rate": 40, "photo_url": None})
+    sent = {channel: message["data"] for channel, message in publisher.messages_for(batch)}
+    assert sorted(sent) == ["STATION", "STATION:3", "STATION:3,4"]
+    assert all(data["channel"] == channel for channel, data in sent.items())
+    assert sent["STATION:3"]["rows"] == [{"op": "upsert", "id": ADM, "latest_iv": {"infusion_rate": 40, "photo_url": None}}]
+
+    # 전동(301 → 402): 새 병동 담당 채널에 행 전체, 담당 밖 채널에는 삭제. 두 병동을 맡은 연결은 행 전체만 받음
+    batch.clear()
+    station_board.move(ADM, "402")
+    journal.record_reset(ADM)
+    sent = {channel: message["data"] for channel, message in publisher.messages_for(batch)}
+    assert {channel: (data["prev"], data["version"]) for channel, data in sent.items()} == {
+        "STATION": (1, 2), "STATION:3": (1, 2), "STATION:4": (0, 1), "STATION:3,4": (1, 2),
+    }
+    assert sent["STATION:3"]["rows"] == [{"op": "delete", "id": ADM}]
+    assert sent["STATION:4"]["rows"][0]["room_number"] == "402"
+    assert sent["STATION"]["rows"] == sent["STATION:4"]["rows"] == sent["STATION:3,4"]["rows"]
@@ -1,10 +1,18 @@
 from supabase import AsyncClient
 import asyncio
-import json
+import fastjson
+import wards
 import random
+import time
 from postgrest.exceptions import APIError
 from httpx import HTTPStatusError
 from logger import logger
+from single_flight import single_flight, query_key, SINGLE_FLIGHT_ENABLED
+from circuit_breaker import db_breaker, retry_budget
+import metrics
+import deadline
+from deadline import DeadlineExceeded
+from hedging import hedger, HEDGING_ENABLED
 
 def mask_name(name: str) -> str:
     if len(name) <= 1:
@@ -24,6 +32,11 @@ def normalize_rpc_result(res):
     return data[0] if isinstance(data, list) and len(data) > 0 else data
 
 async def create_audit_log(db: AsyncClient, actor_type: str, action: str, target_id: str, ip_address: str = "0.0.0.0"):
+    # 서버 실행 중에는 write-behind 큐에 적재만 하고 즉시 반환 (audit_queue.py, 일괄 RPC 로 기록)
+    from audit_queue import audit_queue
+    if audit_queue.running:
+        audit_queue.enqueue(actor_type, action, target_id, ip_address)
+        return
     if db:
         try:
             await db.rpc("log_audit_activity", {
@@ -36,10 +49,15 @@ async def create_audit_log(db: AsyncClient, actor_type: str, action: str, target
             logger.warning(f"Audit log failed: {str(e)}")
             pass # Audit logs should not crash the main flow
 
-async def execute_with_retry_async(query_builder):
+async def execute_with_retry_async(query_builder, coalesce: bool = False, hedge: bool = False):
     """
     Executes a Supabase (Postgrest) async query with a standardized retry policy.
 
+    coalesce=True: 동시에 실행 중인 동일한 읽기 쿼리(테이블·필터·컬럼)가 있으면
+    새 호출 없이 그 결과를 공유합니다 (single_flight.py 참조). 쓰기 쿼리는 항상 개별 실행.
+    hedge=True: 멱등 읽기(GET)에서 첫 시도가 최근 p95 안에 응답하지 않으면 동일 요청을
+    한 번 더 보내 먼저 온 응답을 사용합니다 (hedging.py, DB_HEDGING=true 일 때만).
+
     Retry Policy:
     - Max Retries: 3
     - Retryable Errors:
@@ -48,10 +66,94 @@ async def execute_with_retry_async(query_builder):
     - Fail-fast Errors:
         - 4xx Client Errors (except 429)
     - Backoff: Exponential with jitter (base 0.5s, cap 3s)
+    - Circuit Breaker / Retry Budget (circuit_breaker.py): 모든 호출자가 공유.
+      Circuit 이 열려 있으면 DB 호출 없이 CircuitOpenError 로 즉시 실패하고,
+      공용 재시도 토큰이 소진되면 재시도하지 않습니다.
+    - Request Deadline (deadline.py): 각 시도와 백오프는 남은 요청 예산 안에서만 실행되며,
+      예산이 소진되면 DeadlineExceeded (504) 로 포기합니다.
+    """
+    if coalesce and SINGLE_FLIGHT_ENABLED:
+        key = query_key(query_builder)
+        if key is not None:
+            return await single_flight.do(key, lambda: _execute_with_retry(query_builder, hedge))
+    return await _execute_with_retry(query_builder, hedge)
+
+async def _execute_with_retry(query_builder, hedge: bool = False):
+    # 재시도를 포함한 논리 호출 1회 단위로 지연/행 수를 기록 (metrics.py, /metrics)
+    target, method = metrics.query_labels(query_builder)
+    started = time.perf_counter()
+    try:
+        res = await _retry_loop(query_builder, target, hedge and HEDGING_ENABLED and method == "GET")
+    except Exception:
+        metrics.observe_query(target, method, time.perf_counter() - started, "error")
+        raise
+    metrics.observe_query(target, method, time.perf_counter() - started, "ok", metrics.payload_rows(res))
+    return res
+
+async def execute_instrumented_async(query_builder):
+    """
+    재시도 없이 1회 실행하되 execute_with_retry_async 와 같은 메트릭을 기록합니다.
+    중복 실행되면 안 되는 트랜잭션 RPC(입원/전동/퇴원 등)용.
     """
+    target, method = metrics.query_labels(query_builder)
+    deadline.check(target)
+    started = time.perf_counter()
+    try:
+        res = await query_builder.execute()
+    except Exception as e:
+        metrics.db_query_errors.inc(target=target, error_class=metrics.error_class(e))
+        metrics.observe_query(target, method, time.perf_counter() - started, "error")
+        raise
+    metrics.observe_query(target, method, time.perf_counter() - started, "ok", metrics.payload_rows(res))
+    return res
+
+# 서버 장애로 볼 SQLSTATE 클래스: 연결 예외(08), 자원 부족(53), 운영자 개입/종료(57P)
+_ENGINE_OUTAGE_SQLSTATES = ("08", "53", "57P")
+
+def _is_engine_outage(e: Exception) -> bool:
+    sqlstate = getattr(e, "sqlstate", None)
+    if isinstance(sqlstate, str):
+        return sqlstate.startswith(_ENGINE_OUTAGE_SQLSTATES)
+    return isinstance(e, (OSError, asyncio.TimeoutError)) or "connection" in type(e).__name__.lower()
+
+async def execute_engine_async(target: str, call, breaker=None):
+    """
+    직접 연결 엔진(read_engine.py) 호출 1회를 PostgREST 경로와 같은 요청 deadline · circuit breaker · 메트릭 아래에서 실행.
+    재시도는 하지 않습니다 (실패 시 호출자가 PostgREST 로 폴백). call: 인자 없는 코루틴 함수 -> 행 목록.
+    연결 끊김·타임아웃 등 장애만 breaker 실패로 기록하고, SQL 오류는 서버가 응답한 것으로 봅니다.
+    """
+    breaker = breaker or db_breaker
+    deadline.check(target)
+    probe = breaker.check()
+    budget_left = deadline.remaining()
+    started = time.perf_counter()
+    try:
+        rows = await (call() if budget_left is None else asyncio.wait_for(call(), timeout=budget_left))
+        breaker.record_success(probe)
+    except Exception as e:
+        metrics.db_query_errors.inc(target=target, error_class=metrics.error_class(e))
+        metrics.observe_query(target, "GET", time.perf_counter() - started, "error")
+        if isinstance(e, asyncio.TimeoutError) and budget_left is not None and deadline.remaining() <= 0:
+            raise DeadlineExceeded(deadline.route_class() or "unknown", target) from e
+        if _is_engine_outage(e):
+            breaker.record_failure()
+        else:
+            breaker.record_success(probe)
+        raise
+    finally:
+        breaker.release(probe)
+    metrics.observe_query(target, "GET", time.perf_counter() - started, "ok", len(rows))
+    return rows
+
+async def _retry_loop(query_builder, target: str, hedge: bool = False):
     max_retries = 5
     
     for attempt in range(max_retries):
+        # 요청 예산(deadline.py)이 이미 소진되었으면 시도하지 않음
+        deadline.check(f"{target} attempt {attempt+1}")
+        # Fail-fast: Circuit OPEN 시 DB 호출 없이 즉시 실패
+        probe = db_breaker.check()
+        budget_left = deadline.remaining()
         try:
             # [Architect Note] Validate if the executor is awaitable to prevent MagicMock pitfalls in tests
             executor = query_builder.execute
@@ -59,9 +161,19 @@ async def execute_with_retry_async(query_builder):
                  logger.critical("Test Setup Error: Supabase execute() must be an AsyncMock, not MagicMock.")
                  raise TypeError(f"Mock object {type(executor)} is not awaitable. Check your test provider.")
 
-            res = await query_builder.execute()
+            call = hedger.run(target, query_builder.execute) if hedge else query_builder.execute()
+            if budget_left is None:
+                res = await call
+            else:
+                res = await asyncio.wait_for(call, timeout=budget_left)
+            db_breaker.record_success(probe)
             return res
         except Exception as e:
+            metrics.db_query_errors.inc(target=target, error_class=metrics.error_class(e))
+            if isinstance(e, asyncio.TimeoutError) and budget_left is not None and deadline.remaining() <= 0:
+                # DB 장애가 아니라 요청 예산 소진 → breaker 에 기록하지 않고 포기
+                logger.error(f"DB call abandoned at request deadline ({target}, attempt {attempt+1}/{max_retries})")
+                raise DeadlineExceeded(deadline.route_class() or "unknown", target) from e
             # Categorize the error
             is_retryable = False
             error_status = None
@@ -90,9 +202,15 @@ async def execute_with_retry_async(query_builder):
                     is_retryable = True
                 elif 400 <= error_status < 500:
                     # Fail-fast on 4xx (Auth, Not Found, etc.)
+                    db_breaker.record_success(probe)  # 서버는 응답함 (장애 아님)
                     logger.error(f"DB Client Error (Non-retryable {error_status}): {str(e)}")
                     raise e
 
+            if is_retryable:
+                db_breaker.record_failure()
+            else:
+                db_breaker.record_success(probe)
+
             # Final check and backoff
             if attempt == max_retries - 1 or not is_retryable:
                 if not is_retryable:
@@ -101,26 +219,50 @@ async def execute_with_retry_async(query_builder):
                     logger.critical(f"DB failed after {max_retries} attempts: {str(e)}")
                 raise e
 
+            # 공용 재시도 예산 소진 시 재시도 중단 (장애 시 부하 증폭 방지)
+            if not retry_budget.try_acquire():
+                logger.error(f"DB retry budget exhausted. Giving up after attempt {attempt+1}: {str(e)}")
+                raise e
+
+            metrics.db_query_retries.inc(target=target)
+
             # DNS 에러(11001)의 경우 네트워크 안정화를 위해 더 긴 대기 시간 적용
             is_dns_error = "getaddrinfo" in error_msg or "11001" in error_msg
             base_wait = 1.0 if is_dns_error else 0.5
             wait_time = min(5.0, (base_wait * (2 ** attempt)) + (random.uniform(0, 0.2)))
             
+            # 백오프 후 재시도할 예산이 없으면 지금 포기 (클라이언트는 이미 포기한 요청)
+            budget_left = deadline.remaining()
+            if budget_left is not None and budget_left <= wait_time:
+                logger.error(
+                    f"DB retry abandoned: backoff {wait_time:.1f}s exceeds request budget "
+                    f"({deadline.describe()}). Attempt {attempt+1}/{max_retries}: {str(e)}"
+                )
+                raise DeadlineExceeded(deadline.route_class() or "unknown", f"{target} backoff") from e
+
             logger.warning(
                 f"DB retryable error ({'DNS/11001' if is_dns_error else error_status if error_status else 'Network'}). "
-                f"Attempt {attempt+1}/{max_retries} failed. Retrying in {wait_time:.1f}s..."
+                f"Attempt {attempt+1}/{max_retries} failed. Retrying in {wait_time:.1f}s... ({deadline.describe()})"
             )
             await asyncio.sleep(wait_time)
+        finally:
+            # 결과 기록 없이 끝난 HALF_OPEN probe(deadline 초과·취소)가 슬롯을 계속 점유하지 않도록
+            db_breaker.release(probe)
 
-async def broadcast_to_station_and_patient(manager, message_dict: dict, token: str | None = None):
+async def broadcast_to_station_and_patient(manager, message_dict: dict, token: str | None = None, rooms=None):
     """
-    Helper to broadcast a message to both the STATION and a specific patient token.
+    Helper to broadcast a message to the patient's ward STATION channel(s) and a specific patient token.
     Ensures consistent string casting for tokens and JSON serialization.
+    rooms 를 생략하면 메시지 data 의 room / room_number / old_room / new_room 으로 병동을 정합니다 (wards.py).
     """
     try:
-        msg_str = json.dumps(message_dict)
-        # Parallel: Broadcast to STATION and Patient
-        tasks = [manager.broadcast(msg_str, "STATION")]
+        msg_str = fastjson.dumps(message_dict)  # 1회 직렬화 후 모든 채널이 공유
+        if rooms is None:
+            data = message_dict.get("data") or {}
+            rooms = [data.get(key) for key in ("room", "room_number", "old_room", "new_room") if data.get(key)]
+        # Parallel: Broadcast to ward STATION channels and Patient
+        tasks = [manager.broadcast(msg_str, channel)
+                 for channel in wards.station_channels(rooms, list(getattr(manager, "active_connections", ())))]
         if token:
             tasks.append(manager.broadcast(msg_str, str(token)))
         
@@ -0,0 +1,84 @@
+"""
+병동(ward) 단위 스테이션 채널.
+
+병실 번호 → 병동은 STATION_WARD_MAP(접두사=병동, 쉼표 구분, 가장 긴 접두사 우선)으로 정하고,
+맞는 접두사가 없으면 층(병실 번호에서 끝 두 자리를 뺀 앞자리, 예: 310-1 → 3)을 병동으로 씁니다.
+    STATION_WARD_MAP=310=3A,311=3A,31=3B,4=4W
+스테이션은 /ws/<STATION_WS_TOKEN>?wards=3,4 로 담당 병동 묶음 채널(STATION:3,4) 하나만 구독하고,
+wards 없이 연결하면 전체 채널(STATION, 수간호사·감독용)을 구독합니다.
+연결마다 스테이션 채널이 정확히 하나이므로 여러 병동을 맡아도 같은 메시지를 두 번 받지 않고,
+채널별 패치 버전이 곧 그 연결이 받는 버전입니다.
+브로드캐스트는 병실의 병동을 담당하는 연결된 채널과 전체 채널에만 보내므로 팬아웃이 관련 스테이션 수에 비례합니다.
+"""
+import os
+import re
+
+STATION_ALL = "STATION"
+_WARD_PREFIX = f"{STATION_ALL}:"
+
+
+def parse_ward_map(value: str) -> dict[str, str]:
+    mapping = {}
+    for item in (value or "").split(","):
+        prefix, sep, ward = item.partition("=")
+        if sep and prefix.strip() and ward.strip():
+            mapping[prefix.strip()] = ward.strip()
+    return mapping
+
+
+WARD_MAP = parse_ward_map(os.getenv("STATION_WARD_MAP", ""))
+
+
+def ward_for_room(room: str | None) -> str | None:
+    if room is None or not str(room).strip():
+        return None
+    room = str(room).strip()
+    for prefix in sorted(WARD_MAP, key=len, reverse=True):
+        if room.startswith(prefix):
+            return WARD_MAP[prefix]
+    digits = re.match(r"\d+", room)
+    if digits is None:
+        return room.split("-")[0]
+    number = digits.group()
+    return number[:-2] if len(number) > 2 else number
+
+
+def ward_channel(*wards: str) -> str:
+    """담당 병동 묶음 채널 (순서·중복 무관하게 같은 이름)."""
+    return f"{_WARD_PREFIX}{','.join(sorted(set(wards)))}"
+
+
+def is_ward_channel(channel: str) -> bool:
+    return channel.startswith(_WARD_PREFIX)
+
+
+def is_station_channel(channel: str) -> bool:
+    return channel == STATION_ALL or is_ward_channel(channel)
+
+
+def channel_wards(channel: str) -> frozenset[str] | None:
+    """채널이 담당하는 병동 집합 (전체 채널은 None)."""
+    if not is_ward_channel(channel):
+        return None
+    return frozenset(channel[len(_WARD_PREFIX):].split(","))
+
+
+def covers(channel: str, ward: str | None) -> bool:
+    """channel 구독자가 ward 병실을 보는지 (전체 채널은 모든 병실)."""
+    wards = channel_wards(channel)
+    return wards is None or ward in wards
+
+
+def station_channels(rooms, connected) -> list[str]:
+    """rooms 의 병동을 담당하는 연결된 병동 채널 + 전체 채널. 병실을 알 수 없으면 연결된 모든 스테이션 채널."""
+    wards = {ward_for_room(room) for room in rooms or ()} - {None}
+    ward_channels = [channel for channel in connected if is_ward_channel(channel)]
+    if wards:
+        ward_channels = [channel for channel in ward_channels if channel_wards(channel) & wards]
+    return [STATION_ALL, *sorted(ward_channels)]
+
+
+def subscription_channel(wards: str | None) -> str:
+    """?wards=3,4 → 구독 채널 (비어 있으면 전체 채널)."""
+    names = [w.strip() for w in (wards or "").split(",") if w.strip()]
+    return ward_channel(*names) if names else STATION_ALL
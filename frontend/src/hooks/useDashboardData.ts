@@ -20,6 +20,8 @@ export interface DashboardResponse {
     document_requests: DocumentRequest[];
     iv_records: IVRecord[];
     exam_schedules: ExamScheduleItem[];
+    /** 저널 버전 "<epoch>-<seq>" (WS PATCH 연속성 확인용) */
+    cursor?: string;
 }
 
 /** React Query queryKey 생성 헬퍼 */
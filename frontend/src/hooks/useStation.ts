@@ -1,9 +1,9 @@
-import { useCallback } from 'react';
+import { useCallback, useRef } from 'react';
 import { useQuery, useQueryClient } from '@tanstack/react-query';
 import { useWebSocket, WsConnectionStatus } from './useWebSocket';
 import { useStationDashboard } from './useStationDashboard';
 import { api } from '@/lib/api';
-import { Bed, Notification, LastUploadedIv, AdmissionSummary, WsMessage, MealRequest } from '@/types/domain';
+import { Bed, Notification, LastUploadedIv, AdmissionSummary, WsMessage, MealRequest, StationPatchRow, WsPatch } from '@/types/domain';
 import { ROOM_NUMBERS, MEAL_MAP, DOC_MAP, MEAL_TIME_MAP } from '@/constants/mappings';
 
 interface UseStationReturn {
@@ -19,53 +19,87 @@ interface UseStationReturn {
     fetchAdmissions: (force?: boolean) => void;
 }
 
+/** 빈 슬롯 */
+const emptySlot = (room: string, i: number): Bed => ({
+    id: '',
+    room,
+    name: `환자${i + 1}`,
+    temp: null,
+    drops: null,
+    status: 'normal' as const,
+    token: ''
+});
+
 /** 빈 슬롯 상태 초기값 생성 */
-const emptySlotsInitial = (): Bed[] =>
-    ROOM_NUMBERS.map((room, i) => ({
-        id: '',
-        room,
-        name: `환자${i + 1}`,
-        temp: null,
-        drops: null,
-        status: 'normal' as const,
-        token: ''
-    }));
+const emptySlotsInitial = (): Bed[] => ROOM_NUMBERS.map(emptySlot);
+
+const bedStatus = (temp: number | null, hadFever?: boolean): Bed['status'] =>
+    ((temp != null && temp >= 38.0) || hadFever) ? 'fever' : 'normal';
+
+/** AdmissionSummary → Bed */
+function admissionToBed(adm: AdmissionSummary, room: string): Bed {
+    return {
+        id: adm.id,
+        room: room,
+        name: adm.display_name,
+        token: adm.access_token,
+        drops: adm.latest_iv ? adm.latest_iv.infusion_rate : null,
+        temp: adm.latest_temp ?? null,
+        had_fever_in_6h: adm.had_fever_in_6h,
+        status: bedStatus(adm.latest_temp ?? null, adm.had_fever_in_6h),
+        latest_meal: adm.latest_meal ?? undefined,
+        last_vital_at: adm.last_vital_at ?? undefined,
+        dob: adm.dob,
+        gender: adm.gender,
+        attending_physician: adm.attending_physician ?? undefined
+    } as Bed;
+}
 
 /** AdmissionSummary 배열 → Bed 배열로 변환 */
 function admissionsToBeds(admissions: AdmissionSummary[]): Bed[] {
     return ROOM_NUMBERS.map((room, i) => {
         const adm = admissions.find((a) => String(a.room_number).trim() === String(room).trim());
-        if (adm) {
-            return {
-                id: adm.id,
-                room: room,
-                name: adm.display_name,
-                token: adm.access_token,
-                drops: adm.latest_iv ? adm.latest_iv.infusion_rate : null,
-                temp: adm.latest_temp ?? null,
-                had_fever_in_6h: adm.had_fever_in_6h,
-                status: ((adm.latest_temp != null && adm.latest_temp >= 38.0) || adm.had_fever_in_6h) ? 'fever' : 'normal',
-                latest_meal: adm.latest_meal ?? undefined,
-                last_vital_at: adm.last_vital_at ?? undefined,
-                dob: adm.dob,
-                gender: adm.gender,
-                attending_physician: adm.attending_physician ?? undefined
-            } as Bed;
-        }
-        return {
-            id: '',
-            room: room,
-            name: `환자${i + 1}`,
-            temp: null,
-            drops: null,
-            status: 'normal' as const,
-            token: ''
-        } as Bed;
+        return adm ? admissionToBed(adm, room) : emptySlot(room, i);
     });
 }
 
+/**
+ * 스테이션 PATCH 행 반영 (네트워크 요청 없음).
+ * room_number 가 있으면 목록 행 전체(전동·신규·시딩)이므로 해당 병실 슬롯에 다시 배치하고, 없으면 바뀐 필드만 덮어씀.
+ */
+function applyStationPatch(beds: Bed[], rows: StationPatchRow[]): Bed[] {
+    return rows.reduce((acc, row) => {
+        if (row.op === 'delete' || row.room_number !== undefined) {
+            acc = acc.map((bed, i) => bed.id === row.id ? emptySlot(bed.room, i) : bed);
+            if (row.op === 'delete') return acc;
+            return acc.map(bed =>
+                String(bed.room).trim() === String(row.room_number).trim() ? admissionToBed(row as AdmissionSummary, bed.room) : bed
+            );
+        }
+        return acc.map(bed => {
+            if (bed.id !== row.id) return bed;
+            const next: Bed = { ...bed };
+            if ('latest_temp' in row) {
+                next.temp = row.latest_temp ?? null;
+                next.latest_temp = row.latest_temp ?? undefined;
+            }
+            if ('had_fever_in_6h' in row) next.had_fever_in_6h = row.had_fever_in_6h;
+            if ('last_vital_at' in row) next.last_vital_at = row.last_vital_at ?? undefined;
+            if ('latest_iv' in row) next.drops = row.latest_iv ? row.latest_iv.infusion_rate : null;
+            // 신청 알림(NEW_MEAL_REQUEST)이 채운 requested_* 필드는 유지
+            if ('latest_meal' in row) next.latest_meal = row.latest_meal ? { ...bed.latest_meal, ...row.latest_meal } as MealRequest : undefined;
+            next.status = bedStatus(next.temp, next.had_fever_in_6h);
+            return next;
+        });
+    }, beds);
+}
+
 export const STATION_QUERY_KEY = ['station', 'admissions'] as const;
 
+/** 담당 병동 (비어 있으면 전체 병동). 목록 조회와 WS 구독에 같은 값을 사용 */
+const STATION_WARDS = (process.env.NEXT_PUBLIC_STATION_WARDS || '').trim();
+const wardsQuery = STATION_WARDS ? `wards=${encodeURIComponent(STATION_WARDS)}` : '';
+
 export function useStation(): UseStationReturn {
     const queryClient = useQueryClient();
     const {
@@ -83,13 +117,22 @@ export function useStation(): UseStationReturn {
     const { data: queriedBeds, refetch } = useQuery({
         queryKey: STATION_QUERY_KEY,
         queryFn: async () => {
-            const admissions = await api.get<AdmissionSummary[]>(`/api/v1/admissions?_t=${Date.now()}`);
+            const admissions = await api.get<AdmissionSummary[]>(`/api/v1/admissions?${wardsQuery ? `${wardsQuery}&` : ''}_t=${Date.now()}`);
             if (!Array.isArray(admissions)) return emptySlotsInitial();
             return admissionsToBeds(admissions);
         },
         placeholderData: emptySlotsInitial(),
     });
 
+    // 마지막으로 반영한 스테이션 PATCH 버전. null 이면 재조회 직후라 다음 패치를 기준으로 삼음
+    // 채널별 마지막 적용 버전 (연결은 스테이션 채널 하나만 구독하지만 재연결로 채널이 바뀔 수 있음)
+    const stationVersionRef = useRef<Record<string, { epoch: string; version: number }>>({});
+
+    const resyncStation = useCallback(() => {
+        stationVersionRef.current = {};
+        void queryClient.invalidateQueries({ queryKey: STATION_QUERY_KEY });
+    }, [queryClient]);
+
     // beds는 queryClient.setQueryData()로 WS 이벤트가 직접 패치하므로
     // 외부 컴포넌트가 setBeds를 직접 호출할 수 있도록 래퍼 제공
     const beds: Bed[] = queriedBeds ?? emptySlotsInitial();
@@ -220,62 +263,46 @@ export function useStation(): UseStationReturn {
                     });
                     break;
 
-                case 'NEW_IV':
-                    queryClient.setQueryData<Bed[]>(STATION_QUERY_KEY, prev =>
-                        (prev ?? emptySlotsInitial()).map(bed =>
-                            String(bed.room) === String(message.data.room)
-                                ? { ...bed, drops: message.data.infusion_rate }
-                                : bed
-                        )
-                    );
-                    break;
-
-                case 'NEW_VITAL':
+                case 'PATCH': {
+                    // 목록 행은 PATCH 로만 갱신 (NEW_VITAL / NEW_IV / 전동 / 퇴원 이벤트는 알림 전용)
+                    const patch = message.data as WsPatch<StationPatchRow>;
+                    const channel = patch.channel ?? 'STATION';
+                    const last = stationVersionRef.current[channel];
+                    if (patch.reset || (last !== undefined && (last.epoch !== patch.epoch || (patch.prev ?? 0) > last.version))) {
+                        resyncStation();  // 버전 공백: 놓친 패치가 있으므로 전체 재조회
+                        break;
+                    }
+                    if (last !== undefined && (patch.version ?? 0) <= last.version) break;  // 이미 반영
+                    stationVersionRef.current[channel] = { epoch: patch.epoch, version: patch.version ?? 0 };
                     queryClient.setQueryData<Bed[]>(STATION_QUERY_KEY, prev =>
-                        (prev ?? emptySlotsInitial()).map(bed => {
-                            if (bed.id === message.data.admission_id) {
-                                const isFever = message.data.temperature >= 38.0;
-                                return {
-                                    ...bed,
-                                    temp: message.data.temperature,
-                                    last_vital_at: message.data.recorded_at,
-                                    had_fever_in_6h: bed.had_fever_in_6h || isFever,
-                                    status: (isFever || bed.had_fever_in_6h) ? 'fever' : 'normal'
-                                };
-                            }
-                            return bed;
-                        })
+                        applyStationPatch(prev ?? emptySlotsInitial(), patch.rows ?? [])
                     );
                     break;
+                }
 
                 case 'NEW_EXAM_SCHEDULE':
                 case 'DELETE_EXAM_SCHEDULE':
                     setLastUpdated(Date.now());
                     break;
 
-                case 'ADMISSION_TRANSFERRED':
-                case 'ADMISSION_DISCHARGED':
-                    // 구조 변경이 생기는 경우 → 서버에서 재fetch
-                    void queryClient.invalidateQueries({ queryKey: STATION_QUERY_KEY });
-                    break;
-
                 case 'REFRESH_DASHBOARD':
-                    void queryClient.invalidateQueries({ queryKey: STATION_QUERY_KEY });
+                    // 이전 서버 호환용 전체 재조회 신호
+                    resyncStation();
                     break;
             }
         } catch (e) {
             console.error('WS Parse Error', e);
         }
-    }, [queryClient, setNotifications, setLastUploadedIv, setLastUpdated]);
+    }, [queryClient, setNotifications, setLastUploadedIv, setLastUpdated, resyncStation]);
 
     const wsToken = process.env.NEXT_PUBLIC_STATION_WS_TOKEN || 'STATION';
 
     const { isConnected, connectionStatus } = useWebSocket({
-        url: `${api.getBaseUrl().replace(/^http/, 'ws')}/ws/${wsToken}`,
+        url: `${api.getBaseUrl().replace(/^http/, 'ws')}/ws/${wsToken}${wardsQuery ? `?${wardsQuery}` : ''}`,
         enabled: true,
         onOpen: () => {
             // WS 재연결 시 서버 상태 재동기화
-            void queryClient.invalidateQueries({ queryKey: STATION_QUERY_KEY });
+            resyncStation();
             void fetchPendingRequests();
         },
         onMessage: handleMessage
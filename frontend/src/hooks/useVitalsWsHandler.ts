@@ -1,8 +1,8 @@
 import { useCallback } from 'react';
 import type { MutableRefObject } from 'react';
 import type { QueryClient } from '@tanstack/react-query';
-import type { WsMessage, VitalData, IVRecord, MealRequest, ExamScheduleItem, VitalDataResponse } from '@/types/domain';
-import { dashboardQueryKey, formatVitals, type DashboardResponse } from './useDashboardData';
+import type { WsMessage, VitalDataResponse, IVRecord, MealRequest, DocumentRequest, ExamScheduleItem, DashboardPatchRow, WsPatch } from '@/types/domain';
+import { dashboardQueryKey, type DashboardResponse } from './useDashboardData';
 
 interface UseVitalsWsHandlerParams {
     queryClient: QueryClient;
@@ -12,6 +12,73 @@ interface UseVitalsWsHandlerParams {
     onDischarge?: () => void;
 }
 
+/** cursor "<epoch>-<seq>" 분해 (없거나 형식이 다르면 null) */
+function parseCursor(cursor: string | undefined): { epoch: string; seq: number } | null {
+    if (!cursor) return null;
+    const idx = cursor.lastIndexOf('-');
+    const seq = Number(cursor.slice(idx + 1));
+    return idx > 0 && Number.isFinite(seq) ? { epoch: cursor.slice(0, idx), seq } : null;
+}
+
+/** 같은 id 의 행 교체, 없으면 추가 */
+function upsertById<T extends { id?: string | number }>(rows: T[], row: T, prepend: boolean): T[] {
+    const idx = rows.findIndex(r => r.id === row.id);
+    if (idx !== -1) return rows.map((r, i) => i === idx ? row : r);
+    return prepend ? [row, ...rows] : [...rows, row];
+}
+
+/** Optimistic reconciliation: 2초 내 일치하는 임시 활력징후 교체 */
+function mergeVital(prev: VitalDataResponse[], v: VitalDataResponse): VitalDataResponse[] {
+    const optimisticIndex = prev.findIndex(existing =>
+        existing.isOptimistic &&
+        Math.abs(new Date(existing.recorded_at).getTime() - new Date(v.recorded_at).getTime()) < 2000
+    );
+    if (optimisticIndex !== -1) return prev.map((e, i) => i === optimisticIndex ? v : e);
+    const sameTime = prev.findIndex(e => e.id === undefined && e.recorded_at === v.recorded_at);
+    if (sameTime !== -1) return prev.map((e, i) => i === sameTime ? v : e);
+    return upsertById(prev, v, true);
+}
+
+/** Optimistic reconciliation: 같은 이름·날짜의 임시 검사 일정 교체 */
+function mergeExam(prev: ExamScheduleItem[], exam: ExamScheduleItem): ExamScheduleItem[] {
+    const optimisticIndex = prev.findIndex(ex =>
+        ex.isOptimistic &&
+        ex.name === exam.name &&
+        ex.scheduled_at.split('T')[0] === exam.scheduled_at.split('T')[0]
+    );
+    const next = optimisticIndex !== -1
+        ? prev.map((ex, i) => i === optimisticIndex ? exam : ex)
+        : upsertById(prev, exam, false);
+    return next.sort((a, b) => new Date(a.scheduled_at).getTime() - new Date(b.scheduled_at).getTime());
+}
+
+/** 보호자 PATCH 행을 대시보드 캐시에 반영 (네트워크 요청 없음) */
+function applyDashboardPatch(prev: DashboardResponse, rows: DashboardPatchRow[]): DashboardResponse {
+    return rows.reduce((acc, { section, op, row, id }) => {
+        if (section === 'admission') {
+            return row ? { ...acc, admission: { ...acc.admission, ...(row as Partial<DashboardResponse['admission']>) } } : acc;
+        }
+        const current = (acc[section] ?? []) as Array<{ id?: string | number }>;
+        if (op === 'delete') {
+            return { ...acc, [section]: current.filter(r => r.id !== id) };
+        }
+        const item = { ...row, isOptimistic: false };
+        switch (section) {
+            case 'vitals':
+                return { ...acc, vitals: mergeVital(acc.vitals ?? [], item as unknown as VitalDataResponse) };
+            case 'exam_schedules':
+                return { ...acc, exam_schedules: mergeExam(acc.exam_schedules ?? [], item as unknown as ExamScheduleItem) };
+            case 'meals':
+                return { ...acc, meals: upsertById(acc.meals ?? [], item as unknown as MealRequest, false) };
+            case 'iv_records':
+                return { ...acc, iv_records: upsertById(acc.iv_records ?? [], item as unknown as IVRecord, true) };
+            case 'document_requests':
+                return { ...acc, document_requests: upsertById(acc.document_requests ?? [], item as unknown as DocumentRequest, true) };
+        }
+        return acc;
+    }, prev);
+}
+
 export function useVitalsWsHandler({
     queryClient,
     token,
@@ -26,98 +93,26 @@ export function useVitalsWsHandler({
             const key = dashboardQueryKey(token);
 
             switch (message.type) {
-                case 'NEW_VITAL': {
-                    const v = message.data;
-                    const formattedV: VitalData = {
-                        time: new Date(v.recorded_at).toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' }),
-                        temperature: v.temperature,
-                        has_medication: v.has_medication,
-                        medication_type: v.medication_type,
-                        recorded_at: v.recorded_at
-                    };
-                    queryClient.setQueryData<DashboardResponse>(key, prev => {
-                        if (!prev) return prev;
-                        const prevVitals = formatVitals(prev.vitals ?? []);
-
-                        // Optimistic reconciliation: 2초 내 일치하는 임시 항목 교체
-                        const optimisticIndex = prevVitals.findIndex(existing =>
-                            existing.isOptimistic &&
-                            Math.abs(new Date(existing.recorded_at).getTime() - new Date(v.recorded_at).getTime()) < 2000
-                        );
-
-                        let nextVitalsFormatted: VitalData[];
-                        if (optimisticIndex !== -1) {
-                            nextVitalsFormatted = [...prevVitals];
-                            nextVitalsFormatted[optimisticIndex] = { ...formattedV, isOptimistic: false };
-                        } else if (prevVitals.some(e => e.recorded_at === v.recorded_at)) {
-                            nextVitalsFormatted = prevVitals;
-                        } else {
-                            nextVitalsFormatted = [formattedV, ...prevVitals];
-                        }
-
-                        // VitalData → VitalDataResponse 역변환 (캐시 타입 유지)
-                        return {
-                            ...prev,
-                            vitals: nextVitalsFormatted.map(vd => ({
-                                recorded_at: vd.recorded_at,
-                                temperature: vd.temperature,
-                                has_medication: vd.has_medication ?? false,
-                                medication_type: vd.medication_type,
-                                isOptimistic: vd.isOptimistic,
-                                tempId: vd.tempId,
-                            } as VitalDataResponse))
-                        };
-                    });
-                    break;
-                }
-                case 'NEW_IV':
-                    queryClient.setQueryData<DashboardResponse>(key, prev =>
-                        prev ? { ...prev, iv_records: [message.data as IVRecord, ...(prev.iv_records ?? [])] } : prev
-                    );
-                    break;
-                case 'IV_PHOTO_UPLOADED':
-                    debouncedRefetch();
-                    break;
-                case 'NEW_DOC_REQUEST':
-                case 'DOC_REQUEST_UPDATED':
-                    debouncedRefetch();
-                    break;
-                case 'NEW_EXAM_SCHEDULE': {
-                    const newExam = message.data as ExamScheduleItem;
-                    queryClient.setQueryData<DashboardResponse>(key, prev => {
-                        if (!prev) return prev;
-                        const prevExams = prev.exam_schedules ?? [];
-                        const optimisticIndex = prevExams.findIndex(ex =>
-                            ex.isOptimistic &&
-                            ex.name === newExam.name &&
-                            ex.scheduled_at.split('T')[0] === newExam.scheduled_at.split('T')[0]
-                        );
-                        let next: ExamScheduleItem[];
-                        if (optimisticIndex !== -1) {
-                            next = [...prevExams];
-                            next[optimisticIndex] = { ...newExam, isOptimistic: false };
-                        } else {
-                            next = [...prevExams, newExam];
-                        }
-                        return {
-                            ...prev,
-                            exam_schedules: next.sort((a, b) =>
-                                new Date(a.scheduled_at).getTime() - new Date(b.scheduled_at).getTime()
-                            )
-                        };
+                // 대시보드 캐시는 PATCH 로만 갱신 (NEW_VITAL / NEW_IV / MEAL_UPDATED 등은 같은 변경의 알림)
+                case 'PATCH': {
+                    const patch = message.data as WsPatch<DashboardPatchRow>;
+                    if (patch.admission_id === undefined && !patch.reset) break;  // 스테이션용 패치
+                    if (patch.admission_id !== undefined && admissionIdRef.current && patch.admission_id !== admissionIdRef.current) break;
+                    const prev = queryClient.getQueryData<DashboardResponse>(key);
+                    if (!prev) break;
+                    const cursor = parseCursor(prev.cursor);
+                    // 버전 공백(놓친 패치)·epoch 변경·reset 이면 전체 재조회
+                    if (patch.reset || !cursor || cursor.epoch !== patch.epoch || (patch.prev ?? 0) > cursor.seq) {
+                        debouncedRefetch();
+                        break;
+                    }
+                    if ((patch.version ?? 0) <= cursor.seq) break;  // 이미 반영된 변경
+                    queryClient.setQueryData<DashboardResponse>(key, {
+                        ...applyDashboardPatch(prev, patch.rows ?? []),
+                        cursor: `${patch.epoch}-${patch.version}`,
                     });
                     break;
                 }
-                case 'DELETE_EXAM_SCHEDULE':
-                    queryClient.setQueryData<DashboardResponse>(key, prev =>
-                        prev
-                            ? { ...prev, exam_schedules: (prev.exam_schedules ?? []).filter(ex => ex.id !== (message.data as unknown as ExamScheduleItem).id) }
-                            : prev
-                    );
-                    break;
-                case 'ADMISSION_TRANSFERRED':
-                    debouncedRefetch();
-                    break;
                 case 'ADMISSION_DISCHARGED':
                     if (onDischarge) {
                         onDischarge();
@@ -129,25 +124,8 @@ export function useVitalsWsHandler({
                         }
                     }
                     break;
-                case 'NEW_MEAL_REQUEST':
-                case 'MEAL_UPDATED': {
-                    const handleMealUpdate = (rawData: unknown) => {
-                        if (!admissionIdRef.current) return;
-                        const data = { ...(rawData as MealRequest), isOptimistic: false };
-                        if (data.admission_id !== admissionIdRef.current) return;
-                        queryClient.setQueryData<DashboardResponse>(key, prev => {
-                            if (!prev) return prev;
-                            const idx = (prev.meals ?? []).findIndex(m => m.id === data.id);
-                            const nextMeals = idx !== -1
-                                ? prev.meals.map(m => m.id === data.id ? data : m)
-                                : [...(prev.meals ?? []), data];
-                            return { ...prev, meals: nextMeals };
-                        });
-                    };
-                    handleMealUpdate(message.data);
-                    break;
-                }
                 case 'REFRESH_DASHBOARD':
+                    // 이전 서버 호환용 전체 재조회 신호
                     debouncedRefetch();
                     break;
             }
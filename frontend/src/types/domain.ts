@@ -92,7 +92,35 @@ export interface AdmissionSummary {
     attending_physician?: string;
 }
 
-export type WsMessageType = 'NEW_MEAL_REQUEST' | 'NEW_DOC_REQUEST' | 'DOC_REQUEST_UPDATED' | 'IV_PHOTO_UPLOADED' | 'NEW_IV' | 'NEW_VITAL' | 'NEW_EXAM_SCHEDULE' | 'DELETE_EXAM_SCHEDULE' | 'ADMISSION_TRANSFERRED' | 'ADMISSION_DISCHARGED' | 'MEAL_UPDATED' | 'REFRESH_DASHBOARD';
+export type WsMessageType = 'NEW_MEAL_REQUEST' | 'NEW_DOC_REQUEST' | 'DOC_REQUEST_UPDATED' | 'IV_PHOTO_UPLOADED' | 'NEW_IV' | 'NEW_VITAL' | 'NEW_EXAM_SCHEDULE' | 'DELETE_EXAM_SCHEDULE' | 'ADMISSION_TRANSFERRED' | 'ADMISSION_DISCHARGED' | 'MEAL_UPDATED' | 'REFRESH_DASHBOARD' | 'PATCH';
+
+export type PatchOp = 'upsert' | 'delete';
+
+/** PATCH (보호자 채널): 대시보드 섹션 행 단위 변경. op=upsert 는 row, op=delete 는 id */
+export interface DashboardPatchRow {
+    section: 'admission' | 'vitals' | 'iv_records' | 'meals' | 'exam_schedules' | 'document_requests';
+    op: PatchOp;
+    row?: Record<string, unknown>;
+    id?: number;
+}
+
+/** PATCH (스테이션 채널): 목록 행의 바뀐 필드만. op=delete 는 목록에서 제거 */
+export type StationPatchRow = Partial<AdmissionSummary> & { op: PatchOp; id: string };
+
+/**
+ * 버전이 매겨진 행 단위 패치. prev → version 이 이어지지 않거나 reset 이면 전체 재조회.
+ * 보호자 채널의 version 은 대시보드 응답 cursor("<epoch>-<seq>")의 seq 와 같은 축입니다.
+ */
+export interface WsPatch<Row> {
+    /** 스테이션 패치의 채널 (버전은 채널별로 매겨짐) */
+    channel?: string;
+    epoch: string;
+    admission_id?: string;
+    prev?: number;
+    version?: number;
+    rows?: Row[];
+    reset: boolean;
+}
 
 /**
  * WebSocket 서버에서 수신되는 이벤트 유니온 타입.
@@ -110,7 +138,8 @@ export type WsMessage =
     | { type: 'ADMISSION_TRANSFERRED'; data: { admission_id: string; old_room: string; new_room: string } }
     | { type: 'ADMISSION_DISCHARGED'; data: { admission_id: string; room: string } }
     | { type: 'MEAL_UPDATED'; data: MealRequest }
-    | { type: 'REFRESH_DASHBOARD'; data: { admission_id: string } };
+    | { type: 'REFRESH_DASHBOARD'; data: { admission_id: string } }
+    | { type: 'PATCH'; data: WsPatch<DashboardPatchRow | StationPatchRow> };
 
 export interface IVRecord {
     id: number;
@@ -0,0 +1,28 @@
+-- 감사 로그 일괄 기록 RPC (backend/audit_queue.py write-behind 큐에서 사용)
+-- 요청마다 log_audit_activity 를 1회씩 호출하던 것을 주기/건수 단위 1회 호출로 묶습니다.
+-- p_entries: [{"actor_type", "action", "target_id", "ip_address", "created_at"}, ...]
+-- created_at 은 큐 적재 시각입니다 (디스크 spill 후 재전송해도 원래 시각 유지). 없으면 NOW().
+-- SECURITY DEFINER 로 RLS 를 우회하고 기록 시각을 호출자가 정하므로 실행 권한은 service_role 에만 부여합니다.
+-- 백엔드 SUPABASE_KEY 는 service_role 키여야 합니다 (backend/.env.example).
+
+CREATE OR REPLACE FUNCTION public.log_audit_activity_batch(p_entries JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    INSERT INTO public.audit_logs (actor_type, action, target_id, ip_address, created_at)
+    SELECT
+        e->>'actor_type',
+        e->>'action',
+        e->>'target_id',
+        COALESCE(e->>'ip_address', '0.0.0.0'),
+        COALESCE((e->>'created_at')::timestamptz, NOW())
+    FROM jsonb_array_elements(p_entries) AS e;
+
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION public.log_audit_activity_batch(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.log_audit_activity_batch(JSONB) TO service_role;
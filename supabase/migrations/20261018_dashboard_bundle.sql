@@ -0,0 +1,63 @@
+-- 보호자 대시보드 단일 조회 RPC (backend/services/dashboard.py, DASHBOARD_BUNDLE_RPC=true 일 때 사용)
+-- 기존 6개 PostgREST 쿼리(+토큰 조회)를 1회 왕복으로 합칩니다. 컬럼·정렬·limit 은 6개 쿼리 경로와 동일합니다.
+-- p_token 이 주어지면 활성 입원(IN_PROGRESS, OBSERVATION)만 조회하고, 아니면 p_admission_id 로 조회합니다.
+-- 대상 입원이 없으면 NULL 을 반환합니다. SECURITY INVOKER: 개별 테이블 조회와 동일하게 RLS 적용.
+
+CREATE OR REPLACE FUNCTION get_dashboard_bundle(p_admission_id UUID DEFAULT NULL, p_token UUID DEFAULT NULL)
+RETURNS JSONB AS $$
+    WITH target AS (
+        SELECT a.id, a.patient_name_masked, a.room_number, a.status, a.discharged_at, a.access_token,
+               a.dob, a.gender, a.check_in_at, a.attending_physician
+        FROM admissions a
+        WHERE (p_token IS NOT NULL AND a.access_token = p_token AND a.status IN ('IN_PROGRESS', 'OBSERVATION'))
+           OR (p_token IS NULL AND a.id = p_admission_id)
+        LIMIT 1
+    )
+    SELECT jsonb_build_object(
+        'admission', to_jsonb(t),
+        'vitals', COALESCE((
+            SELECT jsonb_agg(to_jsonb(v) ORDER BY v.recorded_at DESC)
+            FROM (
+                SELECT id, admission_id, temperature, has_medication, medication_type, recorded_at
+                FROM vital_signs WHERE admission_id = t.id
+                ORDER BY recorded_at DESC LIMIT 100
+            ) v
+        ), '[]'::jsonb),
+        'iv_records', COALESCE((
+            SELECT jsonb_agg(to_jsonb(i) ORDER BY i.created_at DESC)
+            FROM (
+                SELECT id, admission_id, photo_url, infusion_rate, created_at
+                FROM iv_records WHERE admission_id = t.id
+                ORDER BY created_at DESC LIMIT 50
+            ) i
+        ), '[]'::jsonb),
+        'meals', COALESCE((
+            SELECT jsonb_agg(to_jsonb(m) ORDER BY m.meal_date DESC)
+            FROM (
+                SELECT id, admission_id, request_type, pediatric_meal_type, guardian_meal_type,
+                       requested_pediatric_meal_type, requested_guardian_meal_type, room_note,
+                       meal_date, meal_time, status, created_at
+                FROM meal_requests WHERE admission_id = t.id
+                ORDER BY meal_date DESC LIMIT 50
+            ) m
+        ), '[]'::jsonb),
+        'exam_schedules', COALESCE((
+            SELECT jsonb_agg(to_jsonb(e) ORDER BY e.scheduled_at)
+            FROM (
+                SELECT id, admission_id, scheduled_at, name, note
+                FROM exam_schedules WHERE admission_id = t.id
+            ) e
+        ), '[]'::jsonb),
+        'document_requests', COALESCE((
+            SELECT jsonb_agg(to_jsonb(d) ORDER BY d.created_at DESC)
+            FROM (
+                SELECT id, admission_id, request_items, status, created_at
+                FROM document_requests WHERE admission_id = t.id
+                ORDER BY created_at DESC LIMIT 10
+            ) d
+        ), '[]'::jsonb)
+    )
+    FROM target t;
+$$ LANGUAGE sql STABLE SECURITY INVOKER SET search_path = public;
+
+GRANT EXECUTE ON FUNCTION get_dashboard_bundle(UUID, UUID) TO anon, authenticated;
@@ -0,0 +1,10 @@
+-- 활력징후/수액 이력 keyset 페이지 조회용 인덱스
+-- GET /api/v1/admissions/{id}/vitals/history, /iv-records/history 는
+-- (admission_id = ?) AND (ts, id) < (커서) ORDER BY ts DESC, id DESC LIMIT n 형태라
+-- 아래 복합 인덱스로 재원 기간과 무관하게 범위 스캔 n+1 건만 읽습니다.
+
+CREATE INDEX IF NOT EXISTS idx_vital_signs_admission_recorded_id
+    ON public.vital_signs (admission_id, recorded_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_iv_records_admission_created_id
+    ON public.iv_records (admission_id, created_at DESC, id DESC);
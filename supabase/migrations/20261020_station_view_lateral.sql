@@ -0,0 +1,73 @@
+-- view_station_dashboard: 활성 입원마다 최신 활력징후/수액/식사를 LATERAL top-1 로 조회
+-- 기존 latest_vitals/latest_iv/latest_meal CTE(DISTINCT ON)는 퇴원 환자를 포함한 전체 이력을 정렬한 뒤 조인하므로
+-- 이력이 쌓일수록 비용이 계속 커집니다. 새 정의는 (admission_id, 시각 DESC, id DESC) 인덱스에서
+-- 활성 입원 1건당 1행만 읽어 비용이 활성 환자 수에만 비례합니다.
+-- 컬럼 이름·순서·정렬은 기존과 동일 (서비스/프론트엔드 계약 유지). 같은 시각이면 id 가 큰(나중) 행을 선택합니다.
+-- 비교 벤치마크: backend/scripts/bench_station_view.py
+
+-- 1. 보조 인덱스 (vital_signs / iv_records 는 20261019_history_keyset_indexes.sql 과 동일, 미적용 환경 대비 재선언)
+CREATE INDEX IF NOT EXISTS idx_vital_signs_admission_recorded_id
+    ON public.vital_signs (admission_id, recorded_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_iv_records_admission_created_id
+    ON public.iv_records (admission_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_meal_requests_admission_created_id
+    ON public.meal_requests (admission_id, created_at DESC, id DESC);
+
+-- 활성 입원만 check_in_at 순으로 스캔 (퇴원 이력이 늘어도 외부 루프 크기 고정)
+CREATE INDEX IF NOT EXISTS idx_admissions_active_check_in
+    ON public.admissions (check_in_at DESC)
+    WHERE status IN ('IN_PROGRESS', 'OBSERVATION');
+
+-- 2. 뷰 재정의 (CREATE OR REPLACE: 컬럼 동일, 권한·의존 객체 유지)
+CREATE OR REPLACE VIEW view_station_dashboard WITH (security_invoker = true) AS
+SELECT
+    a.id AS id,
+    a.room_number,
+    a.patient_name_masked AS display_name,
+    a.access_token,
+    a.dob,
+    a.gender,
+    a.check_in_at,
+    a.attending_physician,
+    v.temperature AS latest_temp,
+    v.recorded_at AS last_vital_at,
+    CASE
+        WHEN v.temperature >= 38.0
+             AND v.recorded_at >= (NOW() - INTERVAL '6 hours') THEN true
+        ELSE false
+    END AS had_fever_in_6h,
+    i.infusion_rate AS iv_rate,
+    i.photo_url AS iv_photo,
+    m.request_type AS meal_type,
+    m.pediatric_meal_type,
+    m.guardian_meal_type,
+    m.created_at AS meal_requested_at
+FROM admissions a
+LEFT JOIN LATERAL (
+    SELECT vs.temperature, vs.recorded_at
+    FROM vital_signs vs
+    WHERE vs.admission_id = a.id
+    ORDER BY vs.recorded_at DESC, vs.id DESC
+    LIMIT 1
+) v ON true
+LEFT JOIN LATERAL (
+    SELECT ir.infusion_rate, ir.photo_url
+    FROM iv_records ir
+    WHERE ir.admission_id = a.id
+    ORDER BY ir.created_at DESC, ir.id DESC
+    LIMIT 1
+) i ON true
+LEFT JOIN LATERAL (
+    SELECT mr.request_type, mr.pediatric_meal_type, mr.guardian_meal_type, mr.created_at
+    FROM meal_requests mr
+    WHERE mr.admission_id = a.id
+    ORDER BY mr.created_at DESC, mr.id DESC
+    LIMIT 1
+) m ON true
+WHERE a.status IN ('IN_PROGRESS', 'OBSERVATION')
+ORDER BY a.check_in_at DESC;
+
+GRANT SELECT ON view_station_dashboard TO authenticated;
+GRANT SELECT ON view_station_dashboard TO anon;
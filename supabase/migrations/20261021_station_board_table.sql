@@ -0,0 +1,240 @@
+-- station_board: 스테이션 목록을 트리거로 증분 갱신하는 테이블 (view_station_dashboard 의 DB 측 대안)
+-- 활성 입원 1건당 1행에 입원 정보와 최신 활력징후·수액·식사를 보관합니다.
+-- vital_signs / iv_records / meal_requests 의 행 트리거는 해당 입원의 해당 섹션만
+-- (admission_id, 시각 DESC, id DESC) 인덱스 top-1 조회로 다시 계산하므로 수정·삭제·같은 시각도 뷰와 같은 결과가 됩니다.
+-- admissions 트리거는 활성 입원이면 행을 유지(헤더 컬럼만 갱신), 퇴원 등으로 비활성이 되면 행을 삭제합니다.
+-- had_fever_in_6h 는 시간에 따라 바뀌므로 저장하지 않고 view_station_board 가 조회 시점에 계산합니다.
+-- 백엔드는 STATION_BOARD_TABLE=true 일 때 view_station_board 를 읽습니다 (미적용 환경은 view_station_dashboard 폴백).
+-- 비교 벤치마크: backend/scripts/bench_station_board.py
+
+-- 1. 테이블
+CREATE TABLE IF NOT EXISTS public.station_board (
+    admission_id UUID PRIMARY KEY REFERENCES public.admissions(id) ON DELETE CASCADE,
+    room_number TEXT,
+    display_name TEXT,
+    access_token UUID,
+    dob DATE,
+    gender TEXT,
+    check_in_at TIMESTAMP WITH TIME ZONE,
+    attending_physician TEXT,
+    latest_temp NUMERIC(3, 1),
+    last_vital_at TIMESTAMP WITH TIME ZONE,
+    iv_rate NUMERIC,  -- iv_records.infusion_rate 와 같은 타입 (20260222_iv_records_infusion_rate_numeric.sql)
+    iv_photo TEXT,
+    meal_type TEXT,
+    pediatric_meal_type TEXT,
+    guardian_meal_type TEXT,
+    meal_requested_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- 목록 정렬(check_in_at DESC) 그대로 인덱스 순서 스캔
+CREATE INDEX IF NOT EXISTS idx_station_board_check_in
+    ON public.station_board (check_in_at DESC);
+
+-- top-1 조회용 (20261020_station_view_lateral.sql 과 동일, 미적용 환경 대비 재선언)
+CREATE INDEX IF NOT EXISTS idx_vital_signs_admission_recorded_id
+    ON public.vital_signs (admission_id, recorded_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_iv_records_admission_created_id
+    ON public.iv_records (admission_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_meal_requests_admission_created_id
+    ON public.meal_requests (admission_id, created_at DESC, id DESC);
+
+-- 쓰기는 아래 SECURITY DEFINER 트리거 함수만, 읽기는 뷰와 같은 범위(활성 입원만 보관)
+ALTER TABLE public.station_board ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Enable read for station board" ON public.station_board;
+CREATE POLICY "Enable read for station board" ON public.station_board FOR SELECT USING (true);
+
+-- 2. 갱신 함수
+-- 한 입원의 행 전체 (활성이면 upsert, 아니면 삭제)
+CREATE OR REPLACE FUNCTION public.station_board_refresh(p_admission_id UUID)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO public.station_board AS sb (
+        admission_id, room_number, display_name, access_token, dob, gender, check_in_at, attending_physician,
+        latest_temp, last_vital_at, iv_rate, iv_photo,
+        meal_type, pediatric_meal_type, guardian_meal_type, meal_requested_at, updated_at
+    )
+    SELECT
+        a.id, a.room_number, a.patient_name_masked, a.access_token, a.dob, a.gender, a.check_in_at,
+        a.attending_physician,
+        v.temperature, v.recorded_at, i.infusion_rate, i.photo_url,
+        m.request_type, m.pediatric_meal_type, m.guardian_meal_type, m.created_at, NOW()
+    FROM admissions a
+    LEFT JOIN LATERAL (
+        SELECT vs.temperature, vs.recorded_at FROM vital_signs vs
+        WHERE vs.admission_id = a.id ORDER BY vs.recorded_at DESC, vs.id DESC LIMIT 1
+    ) v ON true
+    LEFT JOIN LATERAL (
+        SELECT ir.infusion_rate, ir.photo_url FROM iv_records ir
+        WHERE ir.admission_id = a.id ORDER BY ir.created_at DESC, ir.id DESC LIMIT 1
+    ) i ON true
+    LEFT JOIN LATERAL (
+        SELECT mr.request_type, mr.pediatric_meal_type, mr.guardian_meal_type, mr.created_at FROM meal_requests mr
+        WHERE mr.admission_id = a.id ORDER BY mr.created_at DESC, mr.id DESC LIMIT 1
+    ) m ON true
+    WHERE a.id = p_admission_id AND a.status IN ('IN_PROGRESS', 'OBSERVATION')
+    ON CONFLICT (admission_id) DO UPDATE SET
+        room_number = EXCLUDED.room_number, display_name = EXCLUDED.display_name,
+        access_token = EXCLUDED.access_token, dob = EXCLUDED.dob, gender = EXCLUDED.gender,
+        check_in_at = EXCLUDED.check_in_at, attending_physician = EXCLUDED.attending_physician,
+        latest_temp = EXCLUDED.latest_temp, last_vital_at = EXCLUDED.last_vital_at,
+        iv_rate = EXCLUDED.iv_rate, iv_photo = EXCLUDED.iv_photo,
+        meal_type = EXCLUDED.meal_type, pediatric_meal_type = EXCLUDED.pediatric_meal_type,
+        guardian_meal_type = EXCLUDED.guardian_meal_type, meal_requested_at = EXCLUDED.meal_requested_at,
+        updated_at = EXCLUDED.updated_at;
+
+    IF NOT FOUND THEN
+        DELETE FROM public.station_board WHERE admission_id = p_admission_id;
+    END IF;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- 한 입원의 한 섹션만 (행이 없으면 비활성 입원이므로 무시)
+CREATE OR REPLACE FUNCTION public.station_board_refresh_section(p_admission_id UUID, p_table TEXT)
+RETURNS VOID AS $$
+BEGIN
+    IF p_admission_id IS NULL THEN
+        RETURN;
+    END IF;
+    IF p_table = 'vital_signs' THEN
+        UPDATE public.station_board SET
+            (latest_temp, last_vital_at) = (
+                SELECT vs.temperature, vs.recorded_at FROM vital_signs vs
+                WHERE vs.admission_id = p_admission_id ORDER BY vs.recorded_at DESC, vs.id DESC LIMIT 1
+            ),
+            updated_at = NOW()
+        WHERE admission_id = p_admission_id;
+    ELSIF p_table = 'iv_records' THEN
+        UPDATE public.station_board SET
+            (iv_rate, iv_photo) = (
+                SELECT ir.infusion_rate, ir.photo_url FROM iv_records ir
+                WHERE ir.admission_id = p_admission_id ORDER BY ir.created_at DESC, ir.id DESC LIMIT 1
+            ),
+            updated_at = NOW()
+        WHERE admission_id = p_admission_id;
+    ELSIF p_table = 'meal_requests' THEN
+        UPDATE public.station_board SET
+            (meal_type, pediatric_meal_type, guardian_meal_type, meal_requested_at) = (
+                SELECT mr.request_type, mr.pediatric_meal_type, mr.guardian_meal_type, mr.created_at
+                FROM meal_requests mr
+                WHERE mr.admission_id = p_admission_id ORDER BY mr.created_at DESC, mr.id DESC LIMIT 1
+            ),
+            updated_at = NOW()
+        WHERE admission_id = p_admission_id;
+    END IF;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- 전체 재구성 (백필·드리프트 복구용). 재구성 중 쓰기는 잠금으로 대기
+CREATE OR REPLACE FUNCTION public.station_board_rebuild()
+RETURNS INTEGER AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    LOCK TABLE admissions, vital_signs, iv_records, meal_requests IN SHARE MODE;
+    DELETE FROM public.station_board;
+    PERFORM public.station_board_refresh(a.id)
+    FROM admissions a
+    WHERE a.status IN ('IN_PROGRESS', 'OBSERVATION');
+    SELECT count(*) INTO v_count FROM public.station_board;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- 3. 트리거
+CREATE OR REPLACE FUNCTION public.station_board_on_history()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM public.station_board_refresh_section(OLD.admission_id, TG_TABLE_NAME);
+    END IF;
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.admission_id IS DISTINCT FROM OLD.admission_id) THEN
+        PERFORM public.station_board_refresh_section(NEW.admission_id, TG_TABLE_NAME);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION public.station_board_on_admission()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- 활성 상태가 유지되는 갱신(전동·정보 수정)은 헤더 컬럼만
+    IF TG_OP = 'UPDATE' AND NEW.status IN ('IN_PROGRESS', 'OBSERVATION') THEN
+        UPDATE public.station_board SET
+            room_number = NEW.room_number, display_name = NEW.patient_name_masked,
+            access_token = NEW.access_token, dob = NEW.dob, gender = NEW.gender,
+            check_in_at = NEW.check_in_at, attending_physician = NEW.attending_physician, updated_at = NOW()
+        WHERE admission_id = NEW.id;
+        IF FOUND THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+    PERFORM public.station_board_refresh(NEW.id);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS trg_station_board_vital_signs ON public.vital_signs;
+CREATE TRIGGER trg_station_board_vital_signs
+    AFTER INSERT OR DELETE OR UPDATE OF admission_id, temperature, recorded_at ON public.vital_signs
+    FOR EACH ROW EXECUTE FUNCTION public.station_board_on_history();
+
+DROP TRIGGER IF EXISTS trg_station_board_iv_records ON public.iv_records;
+CREATE TRIGGER trg_station_board_iv_records
+    AFTER INSERT OR DELETE OR UPDATE OF admission_id, infusion_rate, photo_url, created_at ON public.iv_records
+    FOR EACH ROW EXECUTE FUNCTION public.station_board_on_history();
+
+DROP TRIGGER IF EXISTS trg_station_board_meal_requests ON public.meal_requests;
+CREATE TRIGGER trg_station_board_meal_requests
+    AFTER INSERT OR DELETE
+    OR UPDATE OF admission_id, request_type, pediatric_meal_type, guardian_meal_type, created_at
+    ON public.meal_requests
+    FOR EACH ROW EXECUTE FUNCTION public.station_board_on_history();
+
+-- 삭제는 FK ON DELETE CASCADE 로 처리
+DROP TRIGGER IF EXISTS trg_station_board_admissions ON public.admissions;
+CREATE TRIGGER trg_station_board_admissions
+    AFTER INSERT OR UPDATE OF status, room_number, patient_name_masked, access_token, dob, gender, check_in_at,
+        attending_physician
+    ON public.admissions
+    FOR EACH ROW EXECUTE FUNCTION public.station_board_on_admission();
+
+-- 4. 백필 (트리거 생성 후 잠금 아래에서 재구성하므로 그 사이 쓰기도 누락되지 않음)
+SELECT public.station_board_rebuild();
+
+-- 5. 조회 뷰: view_station_dashboard 와 같은 컬럼·정렬
+CREATE OR REPLACE VIEW view_station_board WITH (security_invoker = true) AS
+SELECT
+    sb.admission_id AS id,
+    sb.room_number,
+    sb.display_name,
+    sb.access_token,
+    sb.dob,
+    sb.gender,
+    sb.check_in_at,
+    sb.attending_physician,
+    sb.latest_temp,
+    sb.last_vital_at,
+    CASE
+        WHEN sb.latest_temp >= 38.0
+             AND sb.last_vital_at >= (NOW() - INTERVAL '6 hours') THEN true
+        ELSE false
+    END AS had_fever_in_6h,
+    sb.iv_rate,
+    sb.iv_photo,
+    sb.meal_type,
+    sb.pediatric_meal_type,
+    sb.guardian_meal_type,
+    sb.meal_requested_at
+FROM station_board sb
+ORDER BY sb.check_in_at DESC;
+
+GRANT SELECT ON public.station_board TO authenticated;
+GRANT SELECT ON public.station_board TO anon;
+GRANT SELECT ON view_station_board TO authenticated;
+GRANT SELECT ON view_station_board TO anon;
+-- 갱신 함수는 트리거(소유자 권한)와 관리자만 호출 (rebuild 는 쓰기 잠금을 잡음)
+REVOKE EXECUTE ON FUNCTION public.station_board_refresh(UUID) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.station_board_refresh_section(UUID, TEXT) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.station_board_rebuild() FROM PUBLIC, anon, authenticated;